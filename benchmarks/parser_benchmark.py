@@ -0,0 +1,126 @@
+"""
+Benchmark parserů HTML pro scrapery článků.
+
+Pro každý uložený vzorek stránky (benchmarks/fixtures/<portál>.html) změří
+dobu extrakce článku jednotlivými parsery a ověří, že výstup je stejný jako
+u referenčního html.parser. Každý portál z PORTAL_RULES musí mít vzorek,
+jinak benchmark skončí chybou; chybou skončí i rozdílný výstup parserů.
+
+Benchmark importuje jen parser a pravidla portálů, nepotřebuje tedy
+konfiguraci databáze ani síť.
+
+Uložení vzorků:
+    python benchmarks/parser_benchmark.py --save idnes=https://www.idnes.cz/zpravy/...
+
+Spuštění benchmarku:
+    python benchmarks/parser_benchmark.py [--engines lxml html.parser] [--repeat 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Přidání kořenového adresáře projektu do sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from source.modules.article_parser_module import FALLBACK_PARSER, ArticleParser
+from source.modules.portal_rules_module import PORTAL_RULES
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def save_fixtures(specs, fixtures_dir):
+    """Stáhne stránky zadané jako portál=URL a uloží je jako vzorky"""
+    import httpx
+    from source.modules.http_client_module import DEFAULT_HEADERS
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    for spec in specs:
+        portal, _, url = spec.partition("=")
+        if portal not in PORTAL_RULES or not url:
+            print(f"Neplatný vzorek '{spec}', očekává se portál=URL (portály: {', '.join(PORTAL_RULES)})")
+            continue
+        response = httpx.get(url, headers=DEFAULT_HEADERS, follow_redirects=True, timeout=20)
+        response.raise_for_status()
+        path = os.path.join(fixtures_dir, f"{portal}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"<!-- {url} -->\n{response.text}")
+        print(f"Uloženo: {path} ({len(response.text) // 1024} kB)")
+
+
+def load_fixtures(fixtures_dir):
+    """Načte uložené vzorky jako slovník portál -> HTML"""
+    fixtures = {}
+    if not os.path.isdir(fixtures_dir):
+        return fixtures
+    for name in sorted(os.listdir(fixtures_dir)):
+        portal, ext = os.path.splitext(name)
+        if ext == ".html" and portal in PORTAL_RULES:
+            with open(os.path.join(fixtures_dir, name), encoding="utf-8") as f:
+                fixtures[portal] = f.read()
+    return fixtures
+
+
+def measure(parser, html, engine, repeat):
+    """Vrátí (medián doby parsování v ms, výsledek extrakce) pro daný parser"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parser.parse(html, engine)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def compare(reference, result):
+    """Vrátí seznam polí, ve kterých se výsledek liší od referenčního"""
+    return [key for key in reference if reference.get(key) != result.get(key)]
+
+
+def run_benchmark(fixtures, engines, repeat):
+    """Vypíše tabulku dob parsování, vrací True pokud se výstupy všech parserů shodují"""
+    all_equal = True
+    print(f"{'portál':<10} {'velikost':>9} " + " ".join(f"{engine:>14}" for engine in engines) + "  shoda výstupu")
+    for portal, html in fixtures.items():
+        parser = ArticleParser(f"https://example.com/{portal}", PORTAL_RULES[portal])
+        _, reference = measure(parser, html, FALLBACK_PARSER, 1)
+        timings = []
+        differences = []
+        for engine in engines:
+            median_ms, result = measure(parser, html, engine, repeat)
+            timings.append(f"{median_ms:11.2f} ms")
+            diff = compare(reference, result)
+            if diff:
+                differences.append(f"{engine}: {', '.join(diff)}")
+        verdict = "ano" if not differences else "ne (" + "; ".join(differences) + ")"
+        print(f"{portal:<10} {len(html) // 1024:>6} kB " + " ".join(timings) + f"  {verdict}")
+        all_equal = all_equal and not differences
+    return all_equal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Porovnání parserů HTML pro scrapery článků")
+    parser.add_argument("--save", nargs="+", metavar="PORTÁL=URL", help="stáhne a uloží vzorky stránek")
+    parser.add_argument("--engines", nargs="+", default=["lxml", FALLBACK_PARSER], help="porovnávané parsery")
+    parser.add_argument("--repeat", type=int, default=20, help="počet opakování parsování každého vzorku")
+    parser.add_argument("--fixtures-dir", default=FIXTURES_DIR, help="adresář se vzorky stránek")
+    args = parser.parse_args()
+
+    if args.save:
+        save_fixtures(args.save, args.fixtures_dir)
+        return
+
+    fixtures = load_fixtures(args.fixtures_dir)
+    missing = [portal for portal in PORTAL_RULES if portal not in fixtures]
+    if missing:
+        print(f"Chybí vzorky portálů: {', '.join(missing)} (adresář {args.fixtures_dir}). "
+              f"Uložte je pomocí --save portál=URL.")
+        sys.exit(1)
+    if not run_benchmark(fixtures, args.engines, args.repeat):
+        print("Výstupy parserů se liší od referenčního html.parser.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,21 @@ GET  /api/v2/fake_news_check?prompt=... - Checks if the given prompt is fake new
                                           Query parameter: prompt (string) - News text to verify
                                           Response: {"result": analysis, "is_fake": boolean, "confidence": float}
 
+GET  /api/v2/fake_news_check_stream?prompt=... - Same check streamed as Server-Sent Events.
+                                          Events: search_query, search_results, article, result (or error)
+
+POST /api/v2/fake_news_check_batch - Checks a list of claims, streams NDJSON results in completion order.
+                                          Body: {"claims": [string, ...]}
+
+Verification Jobs:
+------------------
+POST   /api/v2/jobs                - Queues a claim for verification, returns immediately.
+                                     Request body: {"prompt": string}
+                                     Response (202): {"job_id": string, "status": "queued", ...}
+GET    /api/v2/jobs/{job_id}       - Returns job status, partial progress and the final result.
+                                     Response: {"job_id", "status", "progress", "result", ...}
+DELETE /api/v2/jobs/{job_id}       - Cancels a queued or running job.
+
 User Authentication & Management:
 ---------------------------------
 POST /api/register                 - Registers a new user with email, password, and registration key.
@@ -99,12 +114,17 @@ from source.routes.token_routes import router as token_router
 from source.routes.auth_routes import router as auth_router
 from source.routes.form_routes import router as form_router
 from source.routes.feedback_routes import router as feedback_router
+from source.routes.job_routes import router as job_router
 from source.modules.database import engine, Base, AsyncSessionLocal as SessionLocal 
 from source.modules.config import config
 from sqlalchemy.future import select
 from source.modules.models import User 
 from source.modules.auth import hash_password
 from source.middleware.user_activity_middleware import UserActivityMiddleware
+from source.modules.http_client_module import close_http_client
+from source.modules.llm_gateway_module import close_llm_clients
+from source.modules.scraping_module import shutdown_parse_executor
+from source.services.job_service import job_manager
 
 logging.basicConfig(
     stream=sys.stdout,
@@ -146,6 +166,10 @@ description = """
 
     * **Check News (GET `/api/v2/fake_news_check/{prompt}`)** - Analyze text for fake news
     * **Query Check (GET `/api/v2/fake_news_check?prompt=...`)** - Same analysis via query parameter
+    * **Streamed Check (GET `/api/v2/fake_news_check_stream?prompt=...`)** - Same analysis streamed step by step (SSE)
+    * **Batch Check (POST `/api/v2/fake_news_check_batch`)** - Analyze up to 200 claims at once, results streamed as NDJSON
+    * **Queue Check (POST `/api/v2/jobs`)** - Queue a claim and poll **GET `/api/v2/jobs/{job_id}`** for the result
+    * **Cancel Check (DELETE `/api/v2/jobs/{job_id}`)** - Cancel a queued or running check
 
     ## 👤 User Management
 
@@ -257,6 +281,19 @@ async def on_startup():
         else:
             print(f"ℹ️ Admin user '{admin_email}' already exists (checked at app startup).")
 
+    # spuštění workerů asynchronních úloh ověření
+    await job_manager.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await job_manager.stop()
+    # uzavření sdíleného HTTP klienta a jeho keep-alive spojení
+    await close_http_client()
+    # uzavření sdílených klientů LLM
+    await close_llm_clients()
+    # ukončení procesů pro parsování HTML
+    shutdown_parse_executor()
+
 # Middleware setup
 app.add_middleware(
     SessionMiddleware,
@@ -284,6 +321,7 @@ app.include_router(token_router,     prefix="/api",    tags=["Token"])
 app.include_router(auth_router, prefix="/auth", tags=["Auth"])
 app.include_router(form_router, prefix="/api/forms", tags=["Forms"])
 app.include_router(feedback_router, prefix="/api/feedback", tags=["Feedback"])
+app.include_router(job_router, prefix="/api/v2/jobs", tags=["Jobs"])
 
 @app.get("/")
 def read_root():
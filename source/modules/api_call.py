@@ -1,13 +1,8 @@
-from openai import OpenAI
-from source.modules.config import config  # Import the config instance, not the module
+from source.modules.llm_gateway_module import OPENAI, llm_call
 
-api_key = config.OPENAI_API_KEY  # Use the API key from the config
-
-# Initialize with api_key as a named parameter
-client = OpenAI(api_key=api_key)
-
-def get_response(prompt):
-    response = client.responses.create(
+async def get_response(prompt):
+    # Shared async client from the LLM gateway (connection pooling, concurrency limit, retries)
+    return await llm_call(OPENAI, lambda client: client.responses.create(
         model="gpt-4o-mini",
         tools=[{"type": "web_search_preview"}],
         input=[
@@ -25,7 +20,6 @@ def get_response(prompt):
         "content": f"{prompt}"
         }
     ]
-    )
-    return response
+    ))
 
 # print(response.output_text)
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Extrakce dat článku z HTML podle pravidel portálů.
+
+Modul obsahuje jen čisté parsování (BeautifulSoup a pravidla z portal_rules_module)
+bez HTTP klienta, konfigurace a databáze. Importuje ho proto levně i worker
+procesního poolu pro parsování a benchmark parserů. Parser HTML se předává
+parametrem (ve službě config.PARSER_ENGINE).
+"""
+import logging
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+from source.modules.portal_rules_module import GENERIC_RULE, PORTAL_RULES, rule_for_url
+
+# Nastavení loggeru
+logger = logging.getLogger(__name__)
+
+# Parser použitý, pokud zvolený parser není k dispozici nebo si se stránkou neporadí
+FALLBACK_PARSER = 'html.parser'
+# Výchozí parser, pokud volající žádný nezvolí
+DEFAULT_PARSER = 'lxml'
+
+_missing_parsers = set()
+
+
+def make_soup(html, engine=DEFAULT_PARSER, from_encoding=None):
+    """
+    Vytvoří BeautifulSoup strom zvoleným parserem.
+    
+    Výchozí parser lxml je výrazně rychlejší než čistě pythonový html.parser.
+    Pokud zvolený parser není nainstalovaný, selže nebo ze stránky nevytvoří
+    tělo dokumentu (poškozené HTML), použije se html.parser.
+    
+    Parametry:
+        html (str | bytes): HTML obsah stránky
+        engine (str, optional): Parser pro BeautifulSoup, výchozí je lxml
+        from_encoding (str, optional): Kódování bajtů; bez něj ho BeautifulSoup
+            zjistí z BOM, <meta charset> nebo odhadem
+        
+    Vrací:
+        BeautifulSoup: Zpracovaný HTML strom
+    """
+    if engine != FALLBACK_PARSER and engine not in _missing_parsers:
+        try:
+            soup = BeautifulSoup(html, engine, from_encoding=from_encoding)
+            if soup.body is not None or not html.strip():
+                return soup
+            logger.debug(f"Parser {engine} nevytvořil tělo dokumentu, použije se {FALLBACK_PARSER}")
+        except FeatureNotFound:
+            _missing_parsers.add(engine)
+            logger.warning(f"Parser {engine} není nainstalovaný, používá se {FALLBACK_PARSER}")
+        except Exception as e:
+            logger.debug(f"Parser {engine} selhal ({e}), použije se {FALLBACK_PARSER}")
+    return BeautifulSoup(html, FALLBACK_PARSER, from_encoding=from_encoding)
+
+
+class ArticleParser:
+    """Extrakce článku řízená deklarativními pravidly portálů (viz portal_rules_module)"""
+    
+    # Slova, podle kterých se v obecném scraperu poznají reklamní odstavce
+    AD_MARKERS = ('reklama', 'sponzor', 'advertisement')
+    
+    def __init__(self, article_url, rule=None):
+        self.rule = rule or rule_for_url(article_url)
+        if not article_url.startswith('http') and self.rule.base_url:
+            article_url = urljoin(self.rule.base_url, article_url)
+        self.url = article_url
+    
+    @property
+    def portal(self):
+        """Identifikátor portálu, podle kterého worker parsovacího poolu vybere pravidla"""
+        return self.rule.portal
+    
+    def parse(self, html, engine=DEFAULT_PARSER, from_encoding=None):
+        """Zpracuje HTML (text nebo bajty) a podle pravidel portálu extrahuje data článku"""
+        soup = make_soup(html, engine, from_encoding)
+        rule = self.rule
+        
+        return {
+            'url': self.url,
+            'title': self._first_value(soup, rule.title),
+            'published_date': self._first_value(soup, rule.date, use_datetime=True),
+            'author': self._first_value(soup, rule.author),
+            'content': self._content(soup),
+            'summary': self._first_value(soup, rule.summary),
+            'source': rule.source or urlparse(self.url).netloc
+        }
+    
+    @staticmethod
+    def _first_value(soup, selectors, use_datetime=False):
+        """Vrátí hodnotu prvního elementu nalezeného některým ze selektorů"""
+        for selector in selectors:
+            elem = selector.select_one(soup)
+            if elem is None:
+                continue
+            if elem.name == 'meta':
+                return elem.get('content', '').strip()
+            if use_datetime and elem.get('datetime'):
+                return elem.get('datetime')
+            return elem.get_text(strip=True)
+        return None
+    
+    def _is_content_paragraph(self, text):
+        if not text or len(text) < self.rule.min_paragraph_length:
+            return False
+        if self.rule.skip_ad_paragraphs and any(ad in text.lower() for ad in self.AD_MARKERS):
+            return False
+        return True
+    
+    def _content(self, soup):
+        """Vrátí obsah článku z odstavců, případně z celého kontejneru článku"""
+        for selector in self.rule.content:
+            paragraphs = [p.get_text(strip=True) for p in selector.select(soup)]
+            paragraphs = [text for text in paragraphs if self._is_content_paragraph(text)]
+            if paragraphs:
+                return '\n\n'.join(paragraphs)
+        
+        # Odstavce nic nenašly, zkusíme veškerý text kontejneru článku
+        for selector in self.rule.content_containers:
+            content_elem = selector.select_one(soup)
+            if content_elem is None:
+                continue
+            # Odstraníme skripty, styly a navigaci
+            for script in content_elem(['script', 'style', 'nav', 'header', 'footer']):
+                script.decompose()
+            text = content_elem.get_text('\n', strip=True)
+            paragraphs = [line.strip() for line in text.split('\n') if line.strip() and len(line.strip()) >= self.rule.min_paragraph_length]
+            if paragraphs:
+                return '\n\n'.join(paragraphs)
+        return None
+
+
+def parse_html(html_bytes, portal, url, encoding=None, engine=DEFAULT_PARSER):
+    """
+    Vyextrahuje data článku ze surového HTML.
+    
+    Funkce je na úrovni modulu, aby ji šlo spustit v procesu parsovacího poolu.
+    
+    Parametry:
+        html_bytes (bytes): Surový obsah stránky
+        portal (str): Identifikátor portálu (klíč PORTAL_RULES)
+        url (str): URL článku
+        encoding (str, optional): Kódování z hlavičky Content-Type; bez něj se
+            kódování zjistí z <meta charset> stránky
+        engine (str, optional): Parser pro BeautifulSoup
+        
+    Vrací:
+        dict: Data článku
+    """
+    return ArticleParser(url, PORTAL_RULES.get(portal, GENERIC_RULE)).parse(html_bytes, engine, encoding)
@@ -0,0 +1,226 @@
+"""
+Obecné cache pro mezivýsledky zpracování (výsledky ověření, články, odpovědi API).
+
+Modul poskytuje:
+- TTLCache: paměťovou LRU cache s expirací záznamů a limitem počtu i velikosti
+- TieredCache: paměťovou cache s volitelnou perzistentní vrstvou v databázi
+
+Hodnoty se ukládají serializované do JSON. Díky tomu je známá jejich přesná
+velikost (limit paměti) a volající dostává vždy vlastní kopii, kterou může
+bez obav upravovat.
+"""
+import json
+import time
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from .database import AsyncSessionLocal
+
+# Nastavení loggeru
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Paměťová LRU cache s expirací záznamů a limitem počtu i velikosti"""
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: Optional[int] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()  # klíč -> (expires_at, JSON hodnota)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Vrátí kopii uložené hodnoty, nebo None pokud chybí nebo expirovala"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        # Posun na konec = naposledy použitý záznam
+        self._data.move_to_end(key)
+        self.hits += 1
+        return json.loads(payload)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Uloží hodnotu a případně vyřadí nejdéle nepoužité záznamy"""
+        payload = json.dumps(value, ensure_ascii=False, default=str)
+        size = len(payload.encode("utf-8"))
+        if self.max_bytes is not None and size > self.max_bytes:
+            logger.debug(f"Hodnota pro klíč {key} je větší než limit cache ({size} B), neukládá se")
+            return
+        if key in self._data:
+            self._remove(key)
+        self._data[key] = (time.monotonic() + (ttl if ttl is not None else self.ttl), payload)
+        self._bytes += size
+        self._evict()
+
+    def delete(self, key: str) -> None:
+        """Odstraní záznam z cache, pokud existuje"""
+        if key in self._data:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Vyprázdní celou cache"""
+        self._data.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Vrátí statistiky využití cache"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _remove(self, key: str) -> None:
+        _, payload = self._data.pop(key)
+        self._bytes -= len(payload.encode("utf-8"))
+
+    def _evict(self) -> None:
+        while self._data and (
+            len(self._data) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            oldest_key = next(iter(self._data))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+
+class TieredCache:
+    """
+    Cache s paměťovou vrstvou a volitelnou perzistentní vrstvou v databázi.
+
+    Perzistentní vrstva používá ORM model se sloupci cache_key, value,
+    created_at a expires_at. Chyby databáze se pouze zalogují, cache
+    v takovém případě funguje dál jen v paměti.
+    """
+
+    # Po kolika zápisech se z tabulky mažou expirované a přebytečné záznamy
+    PRUNE_EVERY = 100
+
+    def __init__(self, name: str, ttl: float, max_entries: int, max_bytes: Optional[int] = None,
+                 model=None, persistent_max_entries: Optional[int] = None):
+        self.name = name
+        self.ttl = ttl
+        self.memory = TTLCache(ttl, max_entries, max_bytes)
+        self.model = model
+        self.persistent_max_entries = persistent_max_entries
+        self.persistent_hits = 0
+        self._writes_since_prune = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Vyhledá hodnotu nejprve v paměti, poté v databázi"""
+        value = self.memory.get(key)
+        if value is not None or self.model is None:
+            return value
+
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(self.model).filter(
+                        self.model.cache_key == key,
+                        self.model.expires_at > datetime.utcnow(),
+                    )
+                )
+                record = result.scalar_one_or_none()
+                if record is None:
+                    return None
+                value = json.loads(record.value)
+                remaining = (record.expires_at - datetime.utcnow()).total_seconds()
+        except Exception as e:
+            logger.error(f"Chyba při čtení z perzistentní cache {self.name}: {e}")
+            return None
+
+        # Zahřátí paměťové vrstvy
+        self.persistent_hits += 1
+        self.memory.set(key, value, ttl=remaining)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Uloží hodnotu do paměti a případně i do databáze"""
+        ttl = ttl if ttl is not None else self.ttl
+        self.memory.set(key, value, ttl=ttl)
+        if self.model is None:
+            return
+
+        payload = json.dumps(value, ensure_ascii=False, default=str)
+        expires_at = datetime.utcnow() + timedelta(seconds=ttl)
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(select(self.model).filter(self.model.cache_key == key))
+                record = result.scalar_one_or_none()
+                if record:
+                    record.value = payload
+                    record.created_at = datetime.utcnow()
+                    record.expires_at = expires_at
+                else:
+                    db.add(self.model(cache_key=key, value=payload, expires_at=expires_at))
+                await db.commit()
+        except IntegrityError:
+            # Stejný klíč mezitím uložil jiný požadavek
+            logger.debug(f"Záznam {key} v perzistentní cache {self.name} již existuje")
+        except Exception as e:
+            logger.error(f"Chyba při zápisu do perzistentní cache {self.name}: {e}")
+            return
+
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= self.PRUNE_EVERY:
+            self._writes_since_prune = 0
+            await self.prune()
+
+    async def delete(self, key: str) -> None:
+        """Odstraní záznam z obou vrstev"""
+        self.memory.delete(key)
+        if self.model is None:
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(self.model).where(self.model.cache_key == key))
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Chyba při mazání z perzistentní cache {self.name}: {e}")
+
+    async def prune(self) -> None:
+        """Smaže z databáze expirované záznamy a nejstarší záznamy nad limit"""
+        if self.model is None:
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(self.model).where(self.model.expires_at <= datetime.utcnow()))
+                if self.persistent_max_entries:
+                    count = (await db.execute(select(func.count()).select_from(self.model))).scalar_one()
+                    overflow = count - self.persistent_max_entries
+                    if overflow > 0:
+                        oldest_ids = select(self.model.id).order_by(self.model.created_at).limit(overflow)
+                        await db.execute(delete(self.model).where(self.model.id.in_(oldest_ids.scalar_subquery())))
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Chyba při čištění perzistentní cache {self.name}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Vrátí statistiky využití cache včetně zásahů v databázi"""
+        stats = self.memory.stats()
+        lookups = stats["hits"] + stats["misses"]
+        stats["persistent_hits"] = self.persistent_hits
+        stats["hit_rate"] = (stats["hits"] + self.persistent_hits) / lookups if lookups else 0.0
+        stats["persistent"] = self.model is not None
+        return stats
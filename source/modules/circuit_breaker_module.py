@@ -0,0 +1,83 @@
+"""
+Jistič (circuit breaker) pro volání nespolehlivých externích služeb.
+
+Pro každý klíč (typicky doménu) se počítají po sobě jdoucí selhání. Po dosažení
+limitu se jistič rozpojí a volání se po dobu reset_timeout vůbec neprovádí -
+nedostupná služba tak nestojí žádný čas. Po uplynutí této doby se jistič
+přepne do polootevřeného stavu a propustí jediné zkušební volání: při úspěchu
+se jistič sepne, při selhání se znovu rozpojí.
+"""
+import logging
+import time
+from typing import Any, Dict
+
+# Nastavení loggeru
+logger = logging.getLogger(__name__)
+
+# Stavy jističe
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Jistič se samostatným stavem pro každý klíč"""
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._probing: Dict[str, float] = {}  # klíč -> začátek zkušebního volání
+        self.rejected = 0
+
+    def state(self, key: str) -> str:
+        """Vrátí aktuální stav jističe pro klíč"""
+        opened_at = self._opened_at.get(key)
+        if opened_at is None:
+            return CLOSED
+        if time.monotonic() - opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self, key: str) -> bool:
+        """Vrátí True, pokud se volání pro klíč smí provést"""
+        state = self.state(key)
+        if state == CLOSED:
+            return True
+        probe_started = self._probing.get(key)
+        # Zkušební volání, které nedoběhlo (např. bylo zrušeno), se po reset_timeout opakuje
+        if state == HALF_OPEN and (probe_started is None or time.monotonic() - probe_started >= self.reset_timeout):
+            # Jediné zkušební volání, ostatní čekají na jeho výsledek
+            self._probing[key] = time.monotonic()
+            logger.info(f"Jistič {self.name}: zkušební volání pro {key}")
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self, key: str) -> None:
+        """Zaznamená úspěšné volání - jistič se sepne"""
+        if key in self._opened_at:
+            logger.info(f"Jistič {self.name}: {key} je opět dostupný")
+        self._failures.pop(key, None)
+        self._opened_at.pop(key, None)
+        self._probing.pop(key, None)
+
+    def record_failure(self, key: str) -> None:
+        """Zaznamená selhání - po dosažení limitu se jistič rozpojí"""
+        failures = self._failures.get(key, 0) + 1
+        self._failures[key] = failures
+        probing = self._probing.pop(key, None) is not None
+        if probing or failures >= self.failure_threshold:
+            if probing or key not in self._opened_at:
+                logger.warning(f"Jistič {self.name}: {key} vyřazen na {self.reset_timeout:.0f}s po {failures} selháních")
+            self._opened_at[key] = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Vrátí rozpojené klíče a počet odmítnutých volání"""
+        return {
+            "open": sorted(key for key in self._opened_at if self.state(key) == OPEN),
+            "half_open": sorted(key for key in self._opened_at if self.state(key) == HALF_OPEN),
+            "rejected": self.rejected,
+        }
@@ -36,6 +36,111 @@ class Config:
     GOOGLE_CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID", "")
     GOOGLE_CLIENT_SECRET = os.environ.get("GOOGLE_CLIENT_SECRET", "")
 
+    # Sdílený HTTP klient
+    HTTP_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", 10))  # Výchozí časový limit požadavku v sekundách
+    HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", 100))  # Max. počet spojení celkem
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", 40))  # Max. počet udržovaných keep-alive spojení
+    HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", 60))  # Doba v sekundách, po kterou se drží nečinné spojení
+    HTTP_MAX_CONNECTIONS_PER_HOST = int(os.environ.get("HTTP_MAX_CONNECTIONS_PER_HOST", 6))  # Max. počet souběžných požadavků na jednoho hostitele
+    HTTP_HOST_RATE_LIMIT = float(os.environ.get("HTTP_HOST_RATE_LIMIT", 4))  # Max. počet nových požadavků na hostitele za sekundu (0 = bez omezení)
+    HTTP_HOST_BURST = int(os.environ.get("HTTP_HOST_BURST", 8))  # Počet požadavků, které lze na hostitele poslat najednou nad rámec průměrné rychlosti
+
+    # Volání jazykových modelů (LLM brána)
+    LLM_TIMEOUT = float(os.environ.get("LLM_TIMEOUT", 30))  # Časový limit jednoho volání v sekundách
+    LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", 2))  # Počet opakování při dočasné chybě (timeout, 429, 5xx)
+    LLM_RETRY_BASE_DELAY = float(os.environ.get("LLM_RETRY_BASE_DELAY", 0.5))  # Základ exponenciální prodlevy mezi pokusy v sekundách
+    LLM_RETRY_MAX_DELAY = float(os.environ.get("LLM_RETRY_MAX_DELAY", 8))  # Max. prodleva mezi pokusy v sekundách
+    LLM_OPENAI_MAX_CONCURRENCY = int(os.environ.get("LLM_OPENAI_MAX_CONCURRENCY", 10))  # Max. počet souběžných volání OpenAI
+    LLM_OPENROUTER_MAX_CONCURRENCY = int(os.environ.get("LLM_OPENROUTER_MAX_CONCURRENCY", 5))  # Max. počet souběžných volání OpenRouter
+    LLM_MISTRAL_MAX_CONCURRENCY = int(os.environ.get("LLM_MISTRAL_MAX_CONCURRENCY", 5))  # Max. počet souběžných volání Mistral
+
+    # Cache odpovědí LLM (klíčem je hash modelu, zpráv a parametrů volání)
+    LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_MAX_TEMPERATURE = float(os.environ.get("LLM_CACHE_MAX_TEMPERATURE", 0.3))  # Volání s vyšší teplotou se necachují
+    LLM_CACHE_TTL = float(os.environ.get("LLM_CACHE_TTL", 24 * 3600))  # Doba platnosti odpovědi v sekundách
+    LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 5000))  # Max. počet odpovědí v paměti
+    LLM_CACHE_MAX_BYTES = int(os.environ.get("LLM_CACHE_MAX_BYTES", 32 * 1024 * 1024))  # Max. velikost cache v paměti
+    LLM_CACHE_PERSISTENT = os.environ.get("LLM_CACHE_PERSISTENT", "true").lower() == "true"  # Ukládat i do databáze
+    LLM_CACHE_PERSISTENT_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_PERSISTENT_MAX_ENTRIES", 100000))
+    # Teplota generování vyhledávací fráze; bez nastavení výchozí teplota modelu (a tedy bez cache)
+    SEARCH_PHRASE_TEMPERATURE = (
+        float(os.environ["SEARCH_PHRASE_TEMPERATURE"]) if os.environ.get("SEARCH_PHRASE_TEMPERATURE") else None
+    )
+
+    # Scraping článků
+    SCRAPE_MAX_CONCURRENCY = int(os.environ.get("SCRAPE_MAX_CONCURRENCY", 5))  # Max. počet současně stahovaných článků
+    SCRAPE_URL_TIMEOUT = float(os.environ.get("SCRAPE_URL_TIMEOUT", 8))  # Limit v sekundách pro stažení jednoho článku (od získání slotu hostitele)
+    SCRAPE_STAGE_DEADLINE = float(os.environ.get("SCRAPE_STAGE_DEADLINE", 15))  # Limit v sekundách pro celou etapu scrapingu
+    SCRAPE_MAX_ARTICLES = int(os.environ.get("SCRAPE_MAX_ARTICLES", 10))  # Po dosažení tohoto počtu článků se zbytek ruší
+    SCRAPE_MAX_BYTES = int(os.environ.get("SCRAPE_MAX_BYTES", 2 * 1024 * 1024))  # Max. stažená velikost jedné stránky v bajtech
+    PARSER_ENGINE = os.environ.get("PARSER_ENGINE", "lxml")  # Parser HTML pro BeautifulSoup (lxml, html.parser)
+    PARSE_PROCESS_WORKERS = int(os.environ.get("PARSE_PROCESS_WORKERS", os.cpu_count() or 1))  # Počet procesů pro parsování HTML (0 = parsování ve vlákně)
+    SCRAPE_BREAKER_FAILURE_THRESHOLD = int(os.environ.get("SCRAPE_BREAKER_FAILURE_THRESHOLD", 5))  # Po tolika selháních za sebou se doména vyřadí
+    SCRAPE_BREAKER_RESET_TIMEOUT = float(os.environ.get("SCRAPE_BREAKER_RESET_TIMEOUT", 60))  # Doba v sekundách, po které se vyřazená doména znovu zkusí
+    SCRAPE_NEGATIVE_CACHE_TTL = float(os.environ.get("SCRAPE_NEGATIVE_CACHE_TTL", 300))  # Doba v sekundách, po kterou se neúspěšná URL znovu nestahuje
+    SCRAPE_NEGATIVE_CACHE_MAX_ENTRIES = int(os.environ.get("SCRAPE_NEGATIVE_CACHE_MAX_ENTRIES", 5000))  # Max. počet pamatovaných neúspěšných URL
+
+    # Výběr pasáží článků pro vyhodnocení tvrzení
+    EVIDENCE_PACKING_ENABLED = os.environ.get("EVIDENCE_PACKING_ENABLED", "true").lower() == "true"
+    EVIDENCE_TOKEN_BUDGET = int(os.environ.get("EVIDENCE_TOKEN_BUDGET", 3000))  # Max. počet tokenů důkazů v promptu vyhodnocení
+    EVIDENCE_PASSAGE_WORDS = int(os.environ.get("EVIDENCE_PASSAGE_WORDS", 120))  # Max. délka jedné pasáže ve slovech
+    EVIDENCE_MAX_PASSAGES_PER_ARTICLE = int(os.environ.get("EVIDENCE_MAX_PASSAGES_PER_ARTICLE", 4))  # Max. počet pasáží z jednoho článku
+
+    # Souběžná sumarizace článků LLM před vyhodnocením (nahrazuje výběr pasáží)
+    SUMMARY_STAGE_ENABLED = os.environ.get("SUMMARY_STAGE_ENABLED", "false").lower() == "true"
+    SUMMARY_MAX_CONCURRENCY = int(os.environ.get("SUMMARY_MAX_CONCURRENCY", 5))  # Max. počet souběžně sumarizovaných článků
+    SUMMARY_LLM_INPUT_SENTENCES = int(os.environ.get("SUMMARY_LLM_INPUT_SENTENCES", 25))  # Delší články se před odesláním LLM lokálně zkrátí na tento počet vět
+    SUMMARY_FALLBACK_SENTENCES = int(os.environ.get("SUMMARY_FALLBACK_SENTENCES", 5))  # Počet vět extraktivního souhrnu při vypršení limitu
+    SUMMARY_CACHE_TTL = float(os.environ.get("SUMMARY_CACHE_TTL", 24 * 3600))  # Doba platnosti souhrnu článku pro tvrzení v sekundách
+    SUMMARY_CACHE_MAX_ENTRIES = int(os.environ.get("SUMMARY_CACHE_MAX_ENTRIES", 5000))  # Max. počet souhrnů v paměti
+
+    # Úložiště stažených článků (klíčem je kanonická URL)
+    ARTICLE_STORE_ENABLED = os.environ.get("ARTICLE_STORE_ENABLED", "true").lower() == "true"
+    ARTICLE_STORE_TTL = float(os.environ.get("ARTICLE_STORE_TTL", 7 * 24 * 3600))  # Doba uchování článku v sekundách
+    ARTICLE_REVALIDATE_AFTER = float(os.environ.get("ARTICLE_REVALIDATE_AFTER", 1800))  # Po této době se článek ověří podmíněným požadavkem (ETag/Last-Modified)
+    ARTICLE_STORE_MAX_ENTRIES = int(os.environ.get("ARTICLE_STORE_MAX_ENTRIES", 2000))  # Max. počet článků v paměti
+    ARTICLE_STORE_MAX_BYTES = int(os.environ.get("ARTICLE_STORE_MAX_BYTES", 128 * 1024 * 1024))  # Max. velikost úložiště v paměti
+    ARTICLE_STORE_PERSISTENT = os.environ.get("ARTICLE_STORE_PERSISTENT", "true").lower() == "true"  # Ukládat i do databáze
+    ARTICLE_STORE_PERSISTENT_MAX_ENTRIES = int(os.environ.get("ARTICLE_STORE_PERSISTENT_MAX_ENTRIES", 100000))
+
+    # Vyhledávání
+    SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "google")  # google, local (index stažených článků) nebo fanout
+    SEARCH_FANOUT_PROVIDERS = os.environ.get("SEARCH_FANOUT_PROVIDERS", "local,google")  # Poskytovatelé pro fanout v pořadí priority
+    SEARCH_MAX_RESULTS = int(os.environ.get("SEARCH_MAX_RESULTS", 10))  # Max. počet výsledků lokálního a sloučeného vyhledávání
+    SEARCH_LOCAL_INDEX_MAX_ENTRIES = int(os.environ.get("SEARCH_LOCAL_INDEX_MAX_ENTRIES", 20000))  # Max. počet článků v lokálním indexu
+
+    # Cache výsledků vyhledávání (klíčem je normalizovaný dotaz a parametry lr/gl)
+    SEARCH_CACHE_ENABLED = os.environ.get("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+    SEARCH_CACHE_TTL = float(os.environ.get("SEARCH_CACHE_TTL", 12 * 3600))  # Doba platnosti výsledků v sekundách
+    SEARCH_CACHE_MAX_ENTRIES = int(os.environ.get("SEARCH_CACHE_MAX_ENTRIES", 5000))  # Max. počet dotazů v paměti
+    SEARCH_CACHE_MAX_BYTES = int(os.environ.get("SEARCH_CACHE_MAX_BYTES", 32 * 1024 * 1024))  # Max. velikost cache v paměti
+    SEARCH_CACHE_PERSISTENT = os.environ.get("SEARCH_CACHE_PERSISTENT", "true").lower() == "true"  # Ukládat i do databáze
+    SEARCH_CACHE_PERSISTENT_MAX_ENTRIES = int(os.environ.get("SEARCH_CACHE_PERSISTENT_MAX_ENTRIES", 50000))
+
+    # Časové rozpočty etap ověření (v sekundách)
+    PIPELINE_DEADLINE = float(os.environ.get("PIPELINE_DEADLINE", 45))  # Celkový rozpočet jednoho ověření
+    STAGE_DEADLINE_SEARCH_PHRASE = float(os.environ.get("STAGE_DEADLINE_SEARCH_PHRASE", 8))  # Generování vyhledávací fráze
+    STAGE_DEADLINE_SEARCH = float(os.environ.get("STAGE_DEADLINE_SEARCH", 10))  # Vyhledávání Googlem
+    STAGE_DEADLINE_SUMMARY = float(os.environ.get("STAGE_DEADLINE_SUMMARY", 12))  # Sumarizace článků (je-li zapnutá)
+    STAGE_DEADLINE_EVALUATION = float(os.environ.get("STAGE_DEADLINE_EVALUATION", 25))  # Vyhodnocení tvrzení
+    # Scraping používá SCRAPE_STAGE_DEADLINE
+
+    # Cache výsledků ověření
+    VERDICT_CACHE_ENABLED = os.environ.get("VERDICT_CACHE_ENABLED", "true").lower() == "true"
+    VERDICT_CACHE_TTL = float(os.environ.get("VERDICT_CACHE_TTL", 6 * 3600))  # Doba platnosti výsledku v sekundách
+    VERDICT_CACHE_MAX_ENTRIES = int(os.environ.get("VERDICT_CACHE_MAX_ENTRIES", 1000))  # Max. počet výsledků v paměti
+    VERDICT_CACHE_MAX_BYTES = int(os.environ.get("VERDICT_CACHE_MAX_BYTES", 64 * 1024 * 1024))  # Max. velikost cache v paměti
+    VERDICT_CACHE_PERSISTENT = os.environ.get("VERDICT_CACHE_PERSISTENT", "true").lower() == "true"  # Ukládat i do databáze
+    VERDICT_CACHE_PERSISTENT_MAX_ENTRIES = int(os.environ.get("VERDICT_CACHE_PERSISTENT_MAX_ENTRIES", 50000))
+
+    # Asynchronní úlohy ověření
+    JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))  # Počet souběžně zpracovávaných úloh
+    JOB_QUEUE_MAX_SIZE = int(os.environ.get("JOB_QUEUE_MAX_SIZE", 1000))  # Max. počet čekajících úloh
+
+    # Dávkové ověření
+    BATCH_MAX_CLAIMS = int(os.environ.get("BATCH_MAX_CLAIMS", 10))  # Max. počet tvrzení v jedné dávce (každé se počítá do globálního limitu 20/min)
+    BATCH_MAX_CONCURRENCY = int(os.environ.get("BATCH_MAX_CONCURRENCY", 5))  # Max. počet souběžně ověřovaných tvrzení dávky
+
     # Telemetrie
     TELEMETRY_ENABLED = os.environ.get("TELEMETRY_ENABLED", "true").lower() == "true"
     TELEMETRY_LOG_LEVEL = os.environ.get("TELEMETRY_LOG_LEVEL", "INFO")
@@ -0,0 +1,72 @@
+"""
+Časové rozpočty (deadliny) pro jednotlivé etapy ověření tvrzení.
+
+Každý požadavek dostane celkový rozpočet a každá etapa svůj vlastní díl.
+Etapa smí běžet nejvýše po dobu svého dílu a zároveň nesmí překročit zbytek
+celkového rozpočtu. Když etapa limit překročí, zpracování místo selhání
+pokračuje v omezené podobě (např. bez stažených článků jen s úryvky
+z vyhledávání) - doba odpovědi je tak shora omezená a předvídatelná.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Optional
+
+# Nastavení loggeru
+logger = logging.getLogger(__name__)
+
+
+class StageTimeout(Exception):
+    """Etapa nestihla doběhnout ve svém časovém limitu"""
+
+    def __init__(self, stage: str, budget: float):
+        super().__init__(f"Etapa {stage} překročila časový limit {budget:.1f}s")
+        self.stage = stage
+        self.budget = budget
+
+
+class Deadline:
+    """Celkový časový rozpočet požadavku rozdělovaný mezi etapy"""
+
+    def __init__(self, total: float):
+        self.total = total
+        self._expires_at = time.monotonic() + total
+        self.degraded_stages = []
+
+    def remaining(self) -> float:
+        """Vrátí zbývající čas celkového rozpočtu v sekundách (nejméně 0)"""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Vrátí True, pokud celkový rozpočet vypršel"""
+        return self.remaining() <= 0
+
+    def budget(self, stage_budget: Optional[float] = None) -> float:
+        """Vrátí čas pro etapu - její díl, nejvýše však zbytek celkového rozpočtu"""
+        if stage_budget is None:
+            return self.remaining()
+        return min(stage_budget, self.remaining())
+
+    async def run(self, stage: str, awaitable: Awaitable[Any], stage_budget: Optional[float] = None) -> Any:
+        """
+        Spustí etapu s časovým limitem.
+
+        Parametry:
+            stage: Název etapy (pro logování a telemetrii)
+            awaitable: Korutina etapy
+            stage_budget: Díl rozpočtu pro etapu v sekundách
+
+        Vrací:
+            Výsledek etapy; při překročení limitu vyvolá StageTimeout
+        """
+        budget = self.budget(stage_budget)
+        try:
+            return await asyncio.wait_for(awaitable, timeout=budget)
+        except asyncio.TimeoutError:
+            logger.warning(f"Etapa {stage} překročila časový limit {budget:.1f}s")
+            raise StageTimeout(stage, budget)
+
+    def degrade(self, stage: str) -> None:
+        """Zaznamená, že etapa běžela v omezeném režimu"""
+        if stage not in self.degraded_stages:
+            self.degraded_stages.append(stage)
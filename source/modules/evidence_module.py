@@ -0,0 +1,160 @@
+"""
+Výběr úryvků článků jako důkazů pro vyhodnocení tvrzení.
+
+Místo celých článků dostane vyhodnocovací model jen pasáže, které s tvrzením
+nejvíce souvisejí. Články se rozdělí na pasáže o několika odstavcích či větách,
+pasáže se ohodnotí podle shody se slovy tvrzení a klíčovými slovy (vážené IDF
+napříč všemi pasážemi) a nejlepší z nich se vyberou až do rozpočtu tokenů.
+Každá pasáž nese zdroj a URL článku, ze kterého pochází. Délka promptu
+a tedy i doba a cena vyhodnocení tak nezávisí na délce článků.
+"""
+import logging
+import math
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from source.modules.config import config
+from source.modules.utils import tokenize
+
+# Nastavení loggeru
+logger = logging.getLogger(__name__)
+
+# Odhad bez tiktoken - česká slova vycházejí průměrně na tři znaky na token
+CHARS_PER_TOKEN = 3
+# Váha shody s klíčovými slovy oproti shodě se slovy tvrzení
+KEYWORD_WEIGHT = 1.5
+# Bonus pro pasáže ze začátku článku (perex a úvod obvykle shrnují podstatu)
+LEAD_BONUS = 0.1
+
+_SENTENCE_END = re.compile(r'(?<=[.!?…])\s+')
+
+
+@lru_cache(maxsize=None)
+def _get_encoding():
+    """
+    Načte kódování tokenizéru při prvním použití.
+
+    Přesný počet tokenů vyžaduje volitelný balíček tiktoken, který si soubor
+    kódování při prvním použití stahuje - načítá se proto až při prvním
+    počítání, ne při startu aplikace. Bez něj se počet tokenů odhaduje.
+    """
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.info(f"Kódování tiktoken není dostupné, počet tokenů se odhaduje podle délky textu: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Vrátí počet tokenů textu (přesně s tiktoken, jinak odhadem)"""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def split_passages(text: str, max_words: int) -> List[str]:
+    """
+    Rozdělí text článku na pasáže o nejvýše max_words slovech.
+
+    Krátké odstavce se spojují, dlouhé odstavce se dělí po větách.
+    """
+    passages = []
+    current: List[str] = []
+    current_words = 0
+
+    def flush():
+        nonlocal current, current_words
+        if current:
+            passages.append(' '.join(current))
+        current, current_words = [], 0
+
+    for paragraph in re.split(r'\n\s*\n|\n', text or ''):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        words = len(paragraph.split())
+        if words > max_words:
+            flush()
+            for sentence in _SENTENCE_END.split(paragraph):
+                sentence_words = len(sentence.split())
+                if current_words and current_words + sentence_words > max_words:
+                    flush()
+                current.append(sentence)
+                current_words += sentence_words
+            flush()
+            continue
+        if current_words and current_words + words > max_words:
+            flush()
+        current.append(paragraph)
+        current_words += words
+    flush()
+    return passages
+
+
+def _format_passage(article: Dict[str, Any], passage: str) -> str:
+    source = article.get("source") or article.get("display_link") or ""
+    return f"[{source} | {article.get('link', '')}] {passage}"
+
+
+def pack_evidence(claim: str, keywords: Optional[Sequence[str]], articles: Sequence[Dict[str, Any]],
+                  token_budget: Optional[int] = None) -> List[str]:
+    """
+    Vybere z článků pasáže nejvíce související s tvrzením až do rozpočtu tokenů.
+
+    Parametry:
+        claim: Ověřované tvrzení
+        keywords: Klíčová slova z generování vyhledávací fráze
+        articles: Články s textem v "full_content" (a volitelně "source", "link")
+        token_budget: Max. počet tokenů všech pasáží, výchozí config.EVIDENCE_TOKEN_BUDGET
+
+    Vrací:
+        list: Pasáže s uvedeným zdrojem, seskupené podle článků v původním pořadí
+    """
+    token_budget = token_budget or config.EVIDENCE_TOKEN_BUDGET
+    claim_tokens = set(tokenize(claim))
+    keyword_tokens = set(tokenize(' '.join(keywords or []))) - claim_tokens
+
+    candidates = []  # (článek, pořadí pasáže, text, slova pasáže)
+    for article_index, article in enumerate(articles):
+        for passage_index, passage in enumerate(split_passages(article.get("full_content", ""), config.EVIDENCE_PASSAGE_WORDS)):
+            candidates.append((article_index, passage_index, passage, set(tokenize(passage))))
+    if not candidates:
+        return []
+
+    # IDF slov tvrzení napříč pasážemi - slova, která jsou všude, nerozlišují
+    document_frequency: Dict[str, int] = {}
+    for _, _, _, tokens in candidates:
+        for token in tokens & (claim_tokens | keyword_tokens):
+            document_frequency[token] = document_frequency.get(token, 0) + 1
+    total = len(candidates)
+
+    def score(candidate) -> float:
+        _, passage_index, _, tokens = candidate
+        value = 0.0
+        for token in tokens & claim_tokens:
+            value += math.log(1 + total / document_frequency[token])
+        for token in tokens & keyword_tokens:
+            value += KEYWORD_WEIGHT * math.log(1 + total / document_frequency[token])
+        return value + LEAD_BONUS / (1 + passage_index)
+
+    selected = []
+    used_tokens = 0
+    per_article: Dict[int, int] = {}
+    for candidate in sorted(candidates, key=score, reverse=True):
+        article_index, _, passage, _ = candidate
+        if per_article.get(article_index, 0) >= config.EVIDENCE_MAX_PASSAGES_PER_ARTICLE:
+            continue
+        text = _format_passage(articles[article_index], passage)
+        tokens = count_tokens(text)
+        if used_tokens + tokens > token_budget:
+            continue
+        selected.append((candidate, text))
+        used_tokens += tokens
+        per_article[article_index] = per_article.get(article_index, 0) + 1
+
+    selected.sort(key=lambda item: (item[0][0], item[0][1]))
+    logger.debug(f"Vybráno {len(selected)} z {total} pasáží ({used_tokens} tokenů z rozpočtu {token_budget})")
+    return [text for _, text in selected]
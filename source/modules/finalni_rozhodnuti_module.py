@@ -1,12 +1,6 @@
-from openai import OpenAI
-from source.modules.config import config  # Import instance konfigurace, ne modul
+from source.modules.llm_gateway_module import OPENAI, chat_completion
 
-api_key = config.OPENAI_API_KEY  # Použití API klíče z konfigurace
-
-# Inicializace klienta s API klíčem jako pojmenovaným parametrem
-client = OpenAI(api_key=api_key)
-
-def evaluate_claim(prompt, found_claims):
+async def evaluate_claim(prompt, found_claims):
     """
     Vyhodnocení pravdivosti tvrzení na základě seznamu nalezených tvrzení.
     
@@ -19,7 +13,8 @@ def evaluate_claim(prompt, found_claims):
     """
     claims_text = "\n".join([f"- {claim}" for claim in found_claims])
     
-    response = client.chat.completions.create(
+    raw_analysis = await chat_completion(
+        OPENAI,
         model="gpt-4.1-nano-2025-04-14",
         messages=[
     {
@@ -55,7 +50,6 @@ def evaluate_claim(prompt, found_claims):
     )
 
     # Parsování odpovědi do strukturovaného formátu
-    raw_analysis = response.choices[0].message.content
     lines = raw_analysis.strip().split('\n')
     structured_result = {}
     
@@ -1,14 +1,43 @@
 import re
+import asyncio
 from datetime import datetime
-from mistralai import Mistral
-from source.modules.config import config  # Import instance konfigurace, ne modul
+from source.modules.config import config
+from source.modules.llm_gateway_module import MISTRAL, chat_completion
 
-api_key = config.MISTRAL_API_KEY  # Použití API klíče z konfigurace
 model = "mistral-small-latest"  # Změněno na platný název modelu
 
-client = Mistral(api_key=api_key)
+# Povinná pole odpovědi a jejich typy (kontrolují se jen před uložením do cache)
+RESPONSE_FIELDS = {
+    "search_query": str,
+    "valid": bool,
+    "is_conversational": bool,
+    "keywords": list,
+}
 
-def check_and_generate_search_phrase(user_input: str):
+
+def parse_response(content: str) -> dict:
+    """Vytáhne z odpovědi LLM JSON s výsledkem; pokud JSON chybí, vyvolá ValueError"""
+    # Extrakce části s JSON pomocí regulárního výrazu pro řešení případných problémů s formátováním
+    json_match = re.search(r'\{.*\}', content, re.DOTALL)
+    if not json_match:
+        raise ValueError("V odpovědi nebyl nalezen žádný JSON")
+    json_str = json_match.group(0)
+    # Nahrazení JavaScript boolean hodnot Python boolean hodnotami
+    json_str = json_str.replace('true', 'True').replace('false', 'False')
+    # Použití eval pro zpracování Python boolean hodnot
+    return eval(f"dict({json_str})")
+
+
+def is_valid_response(content: str) -> bool:
+    """Vrátí True, pokud odpověď obsahuje všechna pole ve správném typu (jen takové odpovědi se cachují)"""
+    try:
+        result = parse_response(content)
+    except Exception:
+        return False
+    return all(isinstance(result.get(field), field_type) for field, field_type in RESPONSE_FIELDS.items())
+
+
+async def check_and_generate_search_phrase(user_input: str):
     # Získání aktuálního data v čitelném formátu
     current_date = datetime.now().strftime("%d. %m. %Y")
     
@@ -49,31 +78,27 @@ def check_and_generate_search_phrase(user_input: str):
         }}
 """
 
-    chat_response = client.chat.complete(
+    # Volání přes sdílenou LLM bránu (sdílený klient, limit souběžnosti, opakování).
+    # Při nastavené nízké teplotě se odpověď cachuje, neúplná odpověď ale ne.
+    params = {}
+    if config.SEARCH_PHRASE_TEMPERATURE is not None:
+        params["temperature"] = config.SEARCH_PHRASE_TEMPERATURE
+    content = await chat_completion(
+        MISTRAL,
         model=model,
+        validate=is_valid_response,
         messages=[
             {
                 "role": "user",
                 "content": prompt.strip(),
             },
-        ]
+        ],
+        **params
     )
-
-    content = chat_response.choices[0].message.content.strip()
     print("LLM odpověď:", content)
 
     try:
-        # Extrakce části s JSON pomocí regulárního výrazu pro řešení případných problémů s formátováním
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(0)
-            # Nahrazení JavaScript boolean hodnot Python boolean hodnotami
-            json_str = json_str.replace('true', 'True').replace('false', 'False')
-            # Použití eval pro zpracování Python boolean hodnot
-            result = eval(f"dict({json_str})")
-        else:
-            raise ValueError("V odpovědi nebyl nalezen žádný JSON")
-            
+        result = parse_response(content)
     except Exception as e:
         print("Chyba při parsování odpovědi:", e)
         result = {
@@ -102,6 +127,6 @@ if __name__ == "__main__":
     
     for test_input in test_cases:
         print(f"\nTest vstupu: '{test_input}'")
-        result = check_and_generate_search_phrase(test_input)
+        result = asyncio.run(check_and_generate_search_phrase(test_input))
         print("Výsledek:", result)
         print("-" * 50)
\ No newline at end of file
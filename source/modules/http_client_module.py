@@ -0,0 +1,172 @@
+"""
+Sdílený HTTP klient pro všechny odchozí požadavky aplikace.
+
+Scrapery článků i vyhledávání Googlem používají jeden dlouho žijící
+httpx.AsyncClient, který drží otevřená keep-alive spojení. Opakované
+požadavky na stejné portály tak nemusí znovu navazovat TCP a TLS spojení.
+Klient používá HTTP/2 tam, kde to server podporuje, a automaticky
+dekóduje gzip i brotli odpovědi (brotli při nainstalovaném balíčku brotli).
+
+Odchozí požadavky na portály procházejí plánovačem (OutboundScheduler), který
+pro každého hostitele omezuje počet souběžných požadavků i jejich rychlost
+(token bucket). Požadavky nad limit čekají ve frontě, takže ani nával ověření
+nezahltí jeden portál a nevyvolá jeho omezení rychlosti.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+from source.modules.config import config
+
+# Nastavení loggeru
+logger = logging.getLogger(__name__)
+
+# HTTP/2 vyžaduje volitelný balíček h2, bez něj se použije HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Vrátí sdílenou instanci HTTP klienta, při prvním volání ji vytvoří"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            timeout=httpx.Timeout(config.HTTP_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=config.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        logger.info(f"Vytvořen sdílený HTTP klient (http2={HTTP2_AVAILABLE})")
+    return _client
+
+
+class HostLimiter:
+    """Limit souběžnosti a token bucket pro jednoho hostitele"""
+
+    def __init__(self, max_concurrency: int, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._token_lock = asyncio.Lock()  # Čekající na token se obsluhují v pořadí příchodu
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self.in_flight = 0
+        self.queued = 0
+        self.requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def _take_token(self) -> None:
+        async with self._token_lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+                self._refilled_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Počká na volný slot a token, po dobu bloku je požadavek veden jako probíhající"""
+        queued_at = time.monotonic()
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+            try:
+                if self.rate > 0:
+                    await self._take_token()
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self.queued -= 1
+        wait = time.monotonic() - queued_at
+        self.requests += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Vrátí počet probíhajících a čekajících požadavků a dobu čekání ve frontě"""
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "requests": self.requests,
+            "avg_wait": round(self.total_wait / self.requests, 4) if self.requests else 0.0,
+            "max_wait": round(self.max_wait, 4),
+        }
+
+
+class OutboundScheduler:
+    """Plánovač odchozích požadavků se samostatným limitem pro každého hostitele"""
+
+    def __init__(self, max_concurrency: int, rate: float, burst: int):
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst
+        self._hosts: Dict[str, HostLimiter] = {}
+
+    def limiter(self, url: str) -> HostLimiter:
+        """Vrátí limiter hostitele daného URL, při prvním použití ho vytvoří"""
+        host = (urlparse(url).hostname or "").lower()
+        limiter = self._hosts.get(host)
+        if limiter is None:
+            limiter = HostLimiter(self.max_concurrency, self.rate, self.burst)
+            self._hosts[host] = limiter
+        return limiter
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Vrátí statistiky všech hostitelů, kterým byl odeslán požadavek"""
+        return {host: limiter.stats() for host, limiter in sorted(self._hosts.items())}
+
+
+outbound_scheduler = OutboundScheduler(
+    max_concurrency=config.HTTP_MAX_CONNECTIONS_PER_HOST,
+    rate=config.HTTP_HOST_RATE_LIMIT,
+    burst=config.HTTP_HOST_BURST,
+)
+
+
+def host_slot(url: str):
+    """
+    Vrátí kontext, který počká, až plánovač povolí požadavek na hostitele daného URL.
+
+    Použití:
+        async with host_slot(url):
+            response = await get_http_client().get(url)
+    """
+    return outbound_scheduler.limiter(url).slot()
+
+
+async def close_http_client() -> None:
+    """Uzavře sdíleného klienta a všechna jeho spojení (volá se při vypnutí aplikace)"""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        logger.info("Sdílený HTTP klient uzavřen")
+    _client = None
@@ -0,0 +1,217 @@
+"""
+Sdílená asynchronní vrstva pro volání jazykových modelů.
+
+Všechny moduly volají LLM přes tuto bránu místo vlastních klientů SDK:
+- klient každého poskytovatele (openai, openrouter, mistral) se vytvoří jednou
+  při prvním použití a drží otevřená spojení pro další volání,
+- počet souběžných volání je omezen zvlášť pro každého poskytovatele,
+- dočasné chyby (výpadek spojení, timeout, 429, 5xx) se opakují s exponenciálně
+  rostoucí prodlevou s náhodným rozptylem (jitter), aby souběžné požadavky
+  neopakovaly volání ve stejný okamžik.
+
+Automatické opakování v SDK je vypnuté, opakování řídí výhradně brána.
+
+Odpovědi deterministických volání (teplota nejvýše LLM_CACHE_MAX_TEMPERATURE)
+se ukládají do cache podle hashe poskytovatele, modelu, zpráv a parametrů,
+takže stejný prompt se poskytovateli neposílá opakovaně.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import random
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import openai
+from mistralai import Mistral, models as mistral_models
+from openai import AsyncOpenAI
+
+from source.modules.cache_module import TieredCache
+from source.modules.config import config
+from source.modules.models import LLMResponseCacheEntry
+
+# Nastavení loggeru
+logger = logging.getLogger(__name__)
+
+OPENAI = "openai"
+OPENROUTER = "openrouter"
+MISTRAL = "mistral"
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+OPENROUTER_HEADERS = {
+    "HTTP-Referer": "https://bezfejku.cz",  # Site URL pro rankings
+    "X-Title": "Bezfejku.cz - fake news detection for Czech republic",  # Site title pro rankings
+}
+
+_clients: Dict[str, Any] = {}
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+# Cache odpovědí - hodnotou je {"content": text odpovědi, "tokens": počet tokenů volání}
+response_cache = TieredCache(
+    "llm",
+    ttl=config.LLM_CACHE_TTL,
+    max_entries=config.LLM_CACHE_MAX_ENTRIES,
+    max_bytes=config.LLM_CACHE_MAX_BYTES,
+    model=LLMResponseCacheEntry if config.LLM_CACHE_PERSISTENT else None,
+    persistent_max_entries=config.LLM_CACHE_PERSISTENT_MAX_ENTRIES,
+)
+tokens_saved = 0  # Tokeny, které se díky cache nemusely zaplatit
+
+
+def _max_concurrency(provider: str) -> int:
+    return {
+        OPENAI: config.LLM_OPENAI_MAX_CONCURRENCY,
+        OPENROUTER: config.LLM_OPENROUTER_MAX_CONCURRENCY,
+        MISTRAL: config.LLM_MISTRAL_MAX_CONCURRENCY,
+    }[provider]
+
+
+def get_llm_client(provider: str) -> Any:
+    """Vrátí sdílený asynchronní klient poskytovatele, při prvním volání ho vytvoří"""
+    client = _clients.get(provider)
+    if client is not None:
+        return client
+    if provider == OPENAI:
+        client = AsyncOpenAI(api_key=config.OPENAI_API_KEY, timeout=config.LLM_TIMEOUT, max_retries=0)
+    elif provider == OPENROUTER:
+        if not config.OPENROUTER_API_KEY:
+            raise ValueError("OPENROUTER_API_KEY není nastavený v environment proměnných")
+        client = AsyncOpenAI(
+            base_url=OPENROUTER_BASE_URL,
+            api_key=config.OPENROUTER_API_KEY,
+            default_headers=OPENROUTER_HEADERS,
+            timeout=config.LLM_TIMEOUT,
+            max_retries=0,
+        )
+    elif provider == MISTRAL:
+        client = Mistral(api_key=config.MISTRAL_API_KEY, timeout_ms=int(config.LLM_TIMEOUT * 1000))
+    else:
+        raise ValueError(f"Neznámý poskytovatel LLM: {provider}")
+    _clients[provider] = client
+    logger.info(f"Vytvořen sdílený klient LLM {provider}")
+    return client
+
+
+def _semaphore(provider: str) -> asyncio.Semaphore:
+    semaphore = _semaphores.get(provider)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_max_concurrency(provider))
+        _semaphores[provider] = semaphore
+    return semaphore
+
+
+def is_retryable(error: Exception) -> bool:
+    """Vrátí True pro dočasné chyby, u kterých má smysl volání zopakovat"""
+    if isinstance(error, (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)):
+        return True
+    if isinstance(error, mistral_models.SDKError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, (httpx.TransportError, asyncio.TimeoutError))
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Prodleva před dalším pokusem - exponenciální růst s plným náhodným rozptylem"""
+    return random.uniform(0, min(config.LLM_RETRY_MAX_DELAY, config.LLM_RETRY_BASE_DELAY * 2 ** attempt))
+
+
+async def llm_call(provider: str, request: Callable[[Any], Awaitable[Any]]) -> Any:
+    """
+    Provede volání LLM s omezením souběžnosti a opakováním dočasných chyb.
+
+    Parametry:
+        provider: Poskytovatel (openai, openrouter, mistral)
+        request: Funkce, která dostane klienta poskytovatele a vrátí korutinu volání
+
+    Vrací:
+        Odpověď SDK; po vyčerpání pokusů vyvolá poslední chybu
+    """
+    client = get_llm_client(provider)
+    attempt = 0
+    while True:
+        try:
+            async with _semaphore(provider):
+                return await request(client)
+        except Exception as e:
+            if attempt >= config.LLM_MAX_RETRIES or not is_retryable(e):
+                raise
+            delay = _backoff_delay(attempt)
+            attempt += 1
+            logger.warning(f"Volání LLM {provider} selhalo ({type(e).__name__}: {e}), pokus {attempt + 1} za {delay:.2f}s")
+            # Čekání mimo semafor, slot mezitím může využít jiné volání
+            await asyncio.sleep(delay)
+
+
+def response_cache_key(provider: str, model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+    """Vrátí SHA-256 poskytovatele, modelu, zpráv a parametrů volání"""
+    payload = json.dumps(
+        {"provider": provider, "model": model, "messages": messages, "params": params},
+        ensure_ascii=False, sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _is_cacheable(params: Dict[str, Any], cache: Optional[bool]) -> bool:
+    if not config.LLM_CACHE_ENABLED:
+        return False
+    if cache is not None:
+        return cache
+    temperature = params.get("temperature")
+    return temperature is not None and temperature <= config.LLM_CACHE_MAX_TEMPERATURE
+
+
+async def chat_completion(provider: str, model: str, messages: List[Dict[str, str]], cache: Optional[bool] = None,
+                          validate: Optional[Callable[[str], bool]] = None, **params: Any) -> str:
+    """
+    Zavolá chat model a vrátí text odpovědi.
+
+    Parametry:
+        provider: Poskytovatel (openai, openrouter, mistral)
+        model: Název modelu
+        messages: Zprávy konverzace ve formátu {"role": ..., "content": ...}
+        cache: Použít cache odpovědí; výchozí None = jen pro volání s nízkou teplotou
+        validate: Kontrola textu odpovědi; do cache se uloží jen odpověď, pro kterou vrátí True
+        **params: Další parametry volání (temperature, max_tokens, ...)
+    """
+    global tokens_saved
+    cache_key = None
+    if _is_cacheable(params, cache):
+        cache_key = response_cache_key(provider, model, messages, params)
+        cached = await response_cache.get(cache_key)
+        if cached is not None:
+            tokens_saved += cached.get("tokens") or 0
+            logger.debug(f"Odpověď LLM {provider}/{model} nalezena v cache")
+            return cached["content"]
+
+    if provider == MISTRAL:
+        response = await llm_call(provider, lambda client: client.chat.complete_async(model=model, messages=messages, **params))
+    else:
+        response = await llm_call(provider, lambda client: client.chat.completions.create(model=model, messages=messages, **params))
+    content = response.choices[0].message.content.strip()
+
+    if cache_key is not None and content and (validate is None or validate(content)):
+        usage = getattr(response, "usage", None)
+        await response_cache.set(cache_key, {"content": content, "tokens": getattr(usage, "total_tokens", None) or 0})
+    return content
+
+
+def response_cache_stats() -> Dict[str, Any]:
+    """Vrátí statistiky cache odpovědí včetně ušetřených tokenů"""
+    stats = response_cache.stats()
+    stats["tokens_saved"] = tokens_saved
+    return stats
+
+
+async def close_llm_clients() -> None:
+    """Uzavře sdílené klienty a jejich spojení (volá se při vypnutí aplikace)"""
+    for provider, client in list(_clients.items()):
+        try:
+            if provider == MISTRAL:
+                if client.sdk_configuration.async_client is not None:
+                    await client.sdk_configuration.async_client.aclose()
+            else:
+                await client.close()
+        except Exception as e:
+            logger.error(f"Chyba při uzavírání klienta LLM {provider}: {e}")
+    _clients.clear()
+    logger.info("Sdílení klienti LLM uzavřeni")
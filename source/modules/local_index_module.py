@@ -0,0 +1,173 @@
+"""
+Lokální fulltextový index dříve stažených článků.
+
+Index zrcadlí úložiště článků (article_store ve scraping_module): každý článek
+uložený do úložiště se zaindexuje podle slov titulku, perexu a obsahu. Při
+prvním hledání se index naplní i články z perzistentní vrstvy úložiště
+v databázi. Tokenizace článků je CPU náročná, proto běží ve vlákně mimo
+event loop; index z databáze se sestaví celý ve vlákně a teprve hotový se
+vymění za aktuální. Vyhledávání nepotřebuje síť a vrací výsledky ve stejném tvaru
+jako vyhledávání Googlem, takže může sloužit jako levný zdroj výsledků
+i jako náhrada Googlu při zátěžových testech.
+"""
+import asyncio
+import json
+import logging
+import math
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from sqlalchemy import select
+
+from source.modules.config import config
+from source.modules.database import AsyncSessionLocal
+from source.modules.models import ScrapedArticleEntry
+from source.modules.utils import tokenize
+
+# Nastavení loggeru
+logger = logging.getLogger(__name__)
+
+SNIPPET_LENGTH = 200
+
+
+def build_entry(url: str, article: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], frozenset, frozenset]]:
+    """
+    Připraví záznam indexu pro článek (výsledek hledání, slova titulku, všechna slova).
+
+    Funkce jen tokenizuje a nemění stav indexu, lze ji proto spustit ve vlákně.
+    Článek bez obsahu vrací None.
+    """
+    content = article.get("content") or ""
+    if not content:
+        return None
+    title = article.get("title") or ""
+    summary = article.get("summary") or ""
+    title_tokens = frozenset(tokenize(title))
+    tokens = title_tokens | frozenset(tokenize(summary)) | frozenset(tokenize(content))
+    result = {
+        "title": title or url,
+        "link": article.get("url") or url,
+        "snippet": (summary or content)[:SNIPPET_LENGTH],
+        "display_link": urlparse(article.get("url") or url).hostname,
+        "source": article.get("source"),
+        "published_date": article.get("published_date"),
+        "author": article.get("author"),
+        "description": summary or None,
+    }
+    return result, title_tokens, tokens
+
+
+class LocalArticleIndex:
+    """Invertovaný index článků s LRU limitem počtu záznamů"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._documents: "OrderedDict[str, tuple]" = OrderedDict()  # URL -> (výsledek, slova titulku, všechna slova)
+        self._postings: Dict[str, set] = {}  # slovo -> URL článků
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    async def add(self, url: str, article: Dict[str, Any]) -> None:
+        """Zaindexuje článek (případně nahradí jeho dřívější verzi), tokenizace běží ve vlákně"""
+        entry = await asyncio.to_thread(build_entry, url, article)
+        if entry is not None:
+            self._insert(url, entry)
+
+    def _insert(self, url: str, entry: Tuple[Dict[str, Any], frozenset, frozenset]) -> None:
+        if url in self._documents:
+            self._remove(url)
+        self._documents[url] = entry
+        for token in entry[2]:
+            self._postings.setdefault(token, set()).add(url)
+        while len(self._documents) > self.max_entries:
+            self._remove(next(iter(self._documents)))
+
+    def _remove(self, url: str) -> None:
+        _, _, tokens = self._documents.pop(url)
+        for token in tokens:
+            urls = self._postings.get(token)
+            if urls is not None:
+                urls.discard(url)
+                if not urls:
+                    del self._postings[token]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Vyhledá články obsahující slova dotazu.
+
+        Článek musí obsahovat alespoň polovinu slov dotazu. Skóre je součet
+        IDF nalezených slov, slova v titulku se počítají dvakrát.
+        """
+        query_tokens = set(tokenize(query))
+        if not query_tokens or not self._documents:
+            return []
+        required = math.ceil(len(query_tokens) / 2)
+        total = len(self._documents)
+        scores: Dict[str, float] = {}
+        matches: Dict[str, int] = {}
+        for token in query_tokens:
+            urls = self._postings.get(token)
+            if not urls:
+                continue
+            idf = math.log(1 + total / len(urls))
+            for url in urls:
+                weight = 2 if token in self._documents[url][1] else 1
+                scores[url] = scores.get(url, 0.0) + idf * weight
+                matches[url] = matches.get(url, 0) + 1
+        ranked = sorted((url for url in scores if matches[url] >= required), key=scores.get, reverse=True)
+        return [dict(self._documents[url][0]) for url in ranked[:limit]]
+
+    async def ensure_loaded(self) -> None:
+        """Při prvním volání zaindexuje neexpirované články z databáze"""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                if config.ARTICLE_STORE_PERSISTENT:
+                    await self._load_from_database()
+            finally:
+                # Hotovo je až po výměně indexu, souběžná hledání do té doby čekají na zámku.
+                # Ani po chybě se načítání neopakuje, index se dál plní průběžně.
+                self._loaded = True
+
+    async def _load_from_database(self) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(
+                    select(ScrapedArticleEntry.cache_key, ScrapedArticleEntry.value)
+                    .where(ScrapedArticleEntry.expires_at > datetime.utcnow())
+                    .order_by(ScrapedArticleEntry.created_at.desc())
+                    .limit(self.max_entries)
+                )).all()
+        except Exception as e:
+            logger.error(f"Chyba při načítání lokálního indexu článků: {e}")
+            return
+        # Dekódování a tokenizace až tisíců článků by blokovaly event loop,
+        # index se proto sestaví ve vlákně jako samostatná instance
+        loaded = await asyncio.to_thread(self._build_from_rows, rows)
+        # Články uložené za běhu mají přednost před verzí z databáze a jsou nejnovější
+        for url, entry in self._documents.items():
+            loaded._insert(url, entry)
+        self._documents, self._postings = loaded._documents, loaded._postings
+        logger.info(f"Lokální index článků načten z databáze ({len(rows)} článků)")
+
+    def _build_from_rows(self, rows: Sequence[Tuple[str, str]]) -> "LocalArticleIndex":
+        """Sestaví nový index z řádků úložiště (cache_key, JSON hodnota) seřazených od nejnovějších"""
+        index = LocalArticleIndex(self.max_entries)
+        # Od nejstarších, aby nejnovější články byly v LRU pořadí poslední
+        for cache_key, value in reversed(rows):
+            article = json.loads(value).get("article")
+            entry = build_entry(cache_key, article) if article else None
+            if entry is not None:
+                index._insert(cache_key, entry)
+        return index
+
+
+local_index = LocalArticleIndex(config.SEARCH_LOCAL_INDEX_MAX_ENTRIES)
@@ -68,6 +68,61 @@ class TelemetryRecord(Base):
     # Vztah k hodnocení od uživatele
     user_feedback = relationship("UserFeedback", back_populates="telemetry_record", uselist=False)
 
+class VerdictCacheEntry(Base):
+    """Model pro perzistentní cache výsledků ověření tvrzení"""
+    __tablename__ = "verdict_cache"
+
+    id = Column(Integer, primary_key=True, index=True) # Primární klíč
+    cache_key = Column(String, unique=True, index=True, nullable=False) # Normalizované tvrzení
+    value = Column(Text, nullable=False) # JSON řetězec s výsledkem ověření
+    created_at = Column(DateTime, default=datetime.utcnow) # Čas uložení
+    expires_at = Column(DateTime, index=True, nullable=False) # Čas expirace záznamu
+
+class ScrapedArticleEntry(Base):
+    """Model pro perzistentní úložiště stažených článků"""
+    __tablename__ = "scraped_articles"
+
+    id = Column(Integer, primary_key=True, index=True) # Primární klíč
+    cache_key = Column(String, unique=True, index=True, nullable=False) # Kanonická URL článku
+    value = Column(Text, nullable=False) # JSON řetězec s extrahovanými daty článku
+    created_at = Column(DateTime, default=datetime.utcnow) # Čas uložení
+    expires_at = Column(DateTime, index=True, nullable=False) # Čas expirace záznamu
+
+class SearchCacheEntry(Base):
+    """Model pro perzistentní cache výsledků vyhledávání"""
+    __tablename__ = "search_cache"
+
+    id = Column(Integer, primary_key=True, index=True) # Primární klíč
+    cache_key = Column(String, unique=True, index=True, nullable=False) # Parametry lr/gl a normalizovaný dotaz
+    value = Column(Text, nullable=False) # JSON řetězec s výsledky vyhledávání
+    created_at = Column(DateTime, default=datetime.utcnow) # Čas uložení
+    expires_at = Column(DateTime, index=True, nullable=False) # Čas expirace záznamu
+
+class LLMResponseCacheEntry(Base):
+    """Model pro perzistentní cache odpovědí jazykových modelů"""
+    __tablename__ = "llm_response_cache"
+
+    id = Column(Integer, primary_key=True, index=True) # Primární klíč
+    cache_key = Column(String, unique=True, index=True, nullable=False) # SHA-256 modelu, zpráv a parametrů volání
+    value = Column(Text, nullable=False) # JSON řetězec s textem odpovědi a počtem tokenů
+    created_at = Column(DateTime, default=datetime.utcnow) # Čas uložení
+    expires_at = Column(DateTime, index=True, nullable=False) # Čas expirace záznamu
+
+class VerificationJob(Base):
+    """Model pro asynchronní úlohy ověření tvrzení"""
+    __tablename__ = "verification_jobs"
+
+    id = Column(String, primary_key=True, index=True) # UUID úlohy
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True) # Uživatel, který úlohu zadal
+    prompt = Column(String, nullable=False) # Tvrzení k ověření
+    status = Column(String, default="queued", index=True, nullable=False) # queued, running, completed, failed, cancelled
+    progress = Column(Text, nullable=True) # JSON řetězec s průběžnými výsledky
+    result = Column(Text, nullable=True) # JSON řetězec s finálním výsledkem
+    error_message = Column(String, nullable=True) # Chybová zpráva (pokud úloha selhala)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True) # Čas zadání úlohy
+    started_at = Column(DateTime, nullable=True) # Čas zahájení zpracování
+    finished_at = Column(DateTime, nullable=True) # Čas ukončení zpracování
+
 class UserFeedback(Base):
     """Model pro hodnocení výsledků od uživatelů"""
     __tablename__ = "user_feedback"
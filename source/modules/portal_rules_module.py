@@ -0,0 +1,161 @@
+"""
+Deklarativní pravidla extrakce článků z jednotlivých zpravodajských portálů.
+
+Každé pravidlo přiřazuje doménám portálu seznamy CSS selektorů pro titulek,
+perex, autora, datum a obsah článku. Selektory se zkouší v uvedeném pořadí
+a použije se první, který něco najde. Všechny selektory se zkompilují jednou
+při načtení modulu a portál se podle hostitele URL vyhledá ve slovníku
+postupně podle přípon domény (www.zpravy.idnes.cz -> zpravy.idnes.cz -> idnes.cz).
+
+Přidání nového portálu znamená jen přidat položku do PORTAL_RULES.
+"""
+from urllib.parse import urlparse
+
+import soupsieve
+
+
+class PortalRule:
+    """Pravidla extrakce článku pro jeden portál"""
+
+    def __init__(self, portal, domains, source, title=(), summary=(), author=(), date=(), content=(),
+                 content_containers=(), base_url=None, min_paragraph_length=0, skip_ad_paragraphs=False,
+                 end_markers=()):
+        """
+        Parametry:
+            portal (str): Identifikátor portálu
+            domains (tuple): Domény portálu (včetně subdomén)
+            source (str): Název zdroje do dat článku, None = hostitel z URL
+            title, summary, author, date (tuple): Selektory jednotlivých polí
+            content (tuple): Selektory odstavců obsahu článku
+            content_containers (tuple): Selektory kontejnerů, ze kterých se vezme
+                veškerý text, pokud odstavce nic nenajdou
+            base_url (str): Základ pro doplnění relativních URL
+            min_paragraph_length (int): Kratší odstavce se vynechají
+            skip_ad_paragraphs (bool): Vynechat odstavce s reklamou
+            end_markers (tuple): Řetězce HTML, které se na stránce vyskytují až za
+                obsahem článku - po jejich stažení se stahování stránky ukončí
+        """
+        self.portal = portal
+        self.domains = domains
+        self.source = source
+        self.base_url = base_url
+        self.min_paragraph_length = min_paragraph_length
+        self.skip_ad_paragraphs = skip_ad_paragraphs
+        self.end_markers = tuple(marker.encode('utf-8') for marker in end_markers)
+        self.title = _compile(title)
+        self.summary = _compile(summary)
+        self.author = _compile(author)
+        self.date = _compile(date)
+        self.content = _compile(content)
+        self.content_containers = _compile(content_containers)
+
+
+def _compile(selectors):
+    return tuple(soupsieve.compile(selector) for selector in selectors)
+
+
+# Pravidla obecného scraperu pro portály bez vlastních pravidel
+GENERIC_RULE = PortalRule(
+    portal='generic',
+    domains=(),
+    source=None,
+    title=('h1', 'article h1', '.article-title', '.post-title', '.entry-title',
+           '[itemprop="headline"]', 'meta[property="og:title"]'),
+    summary=('.perex', '.summary', '.article-summary', '.article-lead', '.article-intro',
+             'meta[name="description"]', 'meta[property="og:description"]'),
+    author=('.author', '.article-author', '.post-author', '[itemprop="author"]', 'meta[name="author"]'),
+    date=('time', '.date', '.article-date', '.post-date', '[itemprop="datePublished"]',
+          'meta[property="article:published_time"]'),
+    content=('article p', '.article-content p', '.post-content p', '.entry-content p',
+             '[itemprop="articleBody"] p', '.text p', '.content p'),
+    content_containers=('article', '.article-content', '.post-content', '.entry-content',
+                        '[itemprop="articleBody"]', '.text', '.content'),
+    min_paragraph_length=21,
+    skip_ad_paragraphs=True,
+)
+
+PORTAL_RULES = {
+    rule.portal: rule
+    for rule in (
+        PortalRule(
+            portal='seznam',
+            domains=('seznamzpravy.cz',),
+            source='Seznam Zprávy',
+            base_url='https://www.seznamzpravy.cz',
+            title=('h1',),
+            summary=('.e_Ig',),
+            author=('[data-dot="author"]', '.article__author'),
+            date=('time',),
+            content=('.article__body p', 'article p'),
+        ),
+        PortalRule(
+            portal='novinky',
+            domains=('novinky.cz',),
+            source='Novinky.cz',
+            base_url='https://www.novinky.cz',
+            title=('h1',),
+            summary=('.perex',),
+            author=('.author', '[itemprop="author"]'),
+            date=('time', '.article-date'),
+            content=('.article-content p', 'article p'),
+        ),
+        PortalRule(
+            portal='ct24',
+            domains=('ceskatelevize.cz', 'ct24.cz'),
+            source='ČT24',
+            base_url='https://ct24.ceskatelevize.cz',
+            title=('h1',),
+            summary=('.article-perex', '.article-lead'),
+            author=('.article-author', '[itemprop="author"]'),
+            date=('time', '.article-date'),
+            content=('.article-body p', '.article-content p', 'article p'),
+        ),
+        PortalRule(
+            portal='idnes',
+            domains=('idnes.cz',),
+            source='iDNES.cz',
+            base_url='https://www.idnes.cz',
+            title=('h1',),
+            summary=('.opener',),
+            author=('.authors',),
+            date=('time',),
+            content=('.text p',),
+        ),
+        PortalRule(
+            portal='aktualne',
+            domains=('aktualne.cz',),
+            source='Aktuálně.cz',
+            base_url='https://www.aktualne.cz',
+            title=('h1',),
+            summary=('.perex',),
+            author=('.author',),
+            date=('time',),
+            content=('.article-content p',),
+        ),
+        PortalRule(
+            portal='denik',
+            domains=('denik.cz',),
+            source='Deník.cz',
+            base_url='https://www.denik.cz',
+            title=('h1',),
+            summary=('.perex',),
+            author=('.author',),
+            date=('time',),
+            content=('.article-content p',),
+        ),
+        GENERIC_RULE,
+    )
+}
+
+# Doména -> pravidlo, sestaveno jednou při načtení modulu
+_RULES_BY_DOMAIN = {domain: rule for rule in PORTAL_RULES.values() for domain in rule.domains}
+
+
+def rule_for_url(url):
+    """Vrátí pravidlo portálu podle hostitele URL (obecné pravidlo, pokud portál není známý)"""
+    labels = (urlparse(url).hostname or '').split('.')
+    for i in range(len(labels) - 1):
+        rule = _RULES_BY_DOMAIN.get('.'.join(labels[i:]))
+        if rule is not None:
+            return rule
+    return GENERIC_RULE
@@ -1,9 +1,10 @@
 # Definice schémat pro validaci dat používaných v API aplikace pro detekci fake news
 from pydantic import BaseModel, EmailStr, constr, validator  # Import Pydantic tříd pro validaci dat
-from typing import Optional  # Import pro označení volitelných polí
+from typing import List, Optional  # Import pro označení volitelných polí a seznamů
 import re  # Import pro práci s regulárními výrazy
 from html import escape  # Import pro escapování HTML znaků
 from datetime import datetime  # Import pro práci s časovými údaji
+from source.modules.config import config  # Import konfigurace (limity dávkového ověření)
 
 class RegistrationKeyInfo(BaseModel):
     """Schéma pro výstup registračního klíče a jeho použitelnosti"""
@@ -134,4 +135,33 @@ class UserFeedbackWithPromptOut(BaseModel):
     prompt: str  # Text, který byl ověřován
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class VerificationJobCreate(BaseModel):
+    """Schéma pro zadání asynchronní úlohy ověření"""
+    prompt: constr(min_length=1, max_length=5000)  # Tvrzení k ověření
+
+class VerificationJobOut(BaseModel):
+    """Schéma pro výstup stavu úlohy ověření"""
+    job_id: str
+    status: str  # queued, running, completed, failed, cancelled
+    prompt: str
+    progress: dict = {}  # Průběžné výsledky (search_query, search_results, articles)
+    result: Optional[dict] = None  # Finální výsledek ve stejném tvaru jako /fake_news_check
+    error_message: Optional[str] = None
+    created_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    queue_length: Optional[int] = None  # Počet čekajících úloh (pouze pro úlohy ve frontě)
+
+class FakeNewsBatchRequest(BaseModel):
+    """Schéma pro dávkové ověření více tvrzení"""
+    claims: List[constr(min_length=1, max_length=5000)]  # Tvrzení k ověření
+
+    @validator('claims')
+    def check_claims_count(cls, v):
+        if not v:
+            raise ValueError('Dávka musí obsahovat alespoň jedno tvrzení')
+        if len(v) > config.BATCH_MAX_CLAIMS:
+            raise ValueError(f'Dávka může obsahovat nejvýše {config.BATCH_MAX_CLAIMS} tvrzení')
+        return v
@@ -1,512 +1,206 @@
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import httpx
+from urllib.parse import urlparse
 import re
 import logging
+from source.modules.config import config
+from source.modules.article_parser_module import ArticleParser, parse_html
+from source.modules.http_client_module import get_http_client, host_slot, DEFAULT_HEADERS
+from source.modules.cache_module import TieredCache, TTLCache
+from source.modules.circuit_breaker_module import CircuitBreaker
+from source.modules.models import ScrapedArticleEntry
+from source.modules.utils import canonicalize_url
+from source.modules.local_index_module import local_index
+from source.modules.portal_rules_module import GENERIC_RULE, PORTAL_RULES, rule_for_url
 
 # Nastavení loggeru
 logger = logging.getLogger(__name__)
 
-class BaseScraper:
-    """Základní třída pro scrapery článků s běžnou funkcionalitou"""
-    
-    def __init__(self, article_url):
-        self.url = article_url
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-    
-    def fetch(self):
-        """Načte HTML obsah článku"""
-        response = requests.get(self.url, headers=self.headers)
-        response.raise_for_status()
-        return response.text
-    
-    def scrape(self):
-        """Vyextrahuje data článku"""
-        html = self.fetch()
-        return self.parse(html)
-        
-    def parse(self, html):
-        """Zpracuje HTML a extrahuje data článku - musí být implementováno v podtřídách"""
-        raise NotImplementedError("Podtřídy musí implementovat metodu parse")
+# Úložiště extrahovaných článků podle kanonické URL - stejné články se objevují
+# ve výsledcích hledání pro mnoho různých tvrzení
+article_store = TieredCache(
+    "article",
+    ttl=config.ARTICLE_STORE_TTL,
+    max_entries=config.ARTICLE_STORE_MAX_ENTRIES,
+    max_bytes=config.ARTICLE_STORE_MAX_BYTES,
+    model=ScrapedArticleEntry if config.ARTICLE_STORE_PERSISTENT else None,
+    persistent_max_entries=config.ARTICLE_STORE_PERSISTENT_MAX_ENTRIES,
+)
 
+# Jistič podle domény - nedostupné nebo blokující portály se po několika
+# selháních za sebou vůbec nestahují a po reset_timeout se zkusí znovu
+domain_breaker = CircuitBreaker(
+    "scraping",
+    failure_threshold=config.SCRAPE_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=config.SCRAPE_BREAKER_RESET_TIMEOUT,
+)
 
-class SeznamZpravyArticleScraper(BaseScraper):
-    """Scraper pro články ze Seznam Zprávy"""
-    
-    def __init__(self, article_url):
-        if not article_url.startswith('http'):
-            article_url = urljoin('https://www.seznamzpravy.cz', article_url)
-        super().__init__(article_url)
-        
-    def parse(self, html):
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        article_data = {
-            'url': self.url,
-            'title': None,
-            'published_date': None,
-            'author': None,
-            'content': None,
-            'summary': None,
-            'source': 'Seznam Zprávy'
-        }
-        
-        title_elem = soup.select_one('h1')
-        if title_elem:
-            article_data['title'] = title_elem.get_text(strip=True)
-        
-        summary_elem = soup.select_one('.e_Ig')
-        if summary_elem:
-            article_data['summary'] = summary_elem.get_text(strip=True)
-            
-        author_elem = soup.select_one('[data-dot="author"]') or soup.select_one('.article__author')
-        if author_elem:
-            article_data['author'] = author_elem.get_text(strip=True)
-            
-        date_elem = soup.select_one('time')
-        if date_elem:
-            date_str = date_elem.get('datetime') or date_elem.get_text(strip=True)
-            article_data['published_date'] = date_str
-            
-        content_elems = soup.select('.article__body p') or soup.select('article p')
-        if content_elems:
-            article_data['content'] = '\n\n'.join([p.get_text(strip=True) for p in content_elems if p.get_text(strip=True)])
-            
-        return article_data
+# Negativní cache - kanonická URL -> popis chyby nedávno neúspěšného stažení
+failed_urls = TTLCache(ttl=config.SCRAPE_NEGATIVE_CACHE_TTL, max_entries=config.SCRAPE_NEGATIVE_CACHE_MAX_ENTRIES)
 
 
-class NovinkyArticleScraper(BaseScraper):
-    """Scraper pro články z Novinky.cz"""
-    
-    def __init__(self, article_url):
-        if not article_url.startswith('http'):
-            article_url = urljoin('https://www.novinky.cz', article_url)
-        super().__init__(article_url)
-        
-    def parse(self, html):
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        article_data = {
-            'url': self.url,
-            'title': None,
-            'published_date': None,
-            'author': None,
-            'content': None,
-            'summary': None,
-            'source': 'Novinky.cz'
-        }
-        
-        # Titulek je obvykle v h1
-        title_elem = soup.select_one('h1')
-        if title_elem:
-            article_data['title'] = title_elem.get_text(strip=True)
-        
-        # Novinky často mají perex/souhrn ve specifické třídě
-        summary_elem = soup.select_one('.perex')
-        if summary_elem:
-            article_data['summary'] = summary_elem.get_text(strip=True)
-            
-        # Autor může být na různých místech
-        author_elem = soup.select_one('.author') or soup.select_one('[itemprop="author"]')
-        if author_elem:
-            article_data['author'] = author_elem.get_text(strip=True)
-            
-        # Datum je často v elementu time nebo ve specifické třídě
-        date_elem = soup.select_one('time') or soup.select_one('.article-date')
-        if date_elem:
-            date_str = date_elem.get('datetime') or date_elem.get_text(strip=True)
-            article_data['published_date'] = date_str
-            
-        # Obsah článku je obvykle v elementu article nebo specifickém kontejneru
-        content_elems = soup.select('.article-content p') or soup.select('article p')
-        if content_elems:
-            article_data['content'] = '\n\n'.join([p.get_text(strip=True) for p in content_elems if p.get_text(strip=True)])
-            
-        return article_data
+class ScrapeSkipped(Exception):
+    """Článek se nestahoval - doména je vyřazená jističem nebo URL nedávno selhala"""
 
 
-class CT24ArticleScraper(BaseScraper):
-    """Scraper pro články z ČT24"""
-    
-    def __init__(self, article_url):
-        if not article_url.startswith('http'):
-            article_url = urljoin('https://ct24.ceskatelevize.cz', article_url)
-        super().__init__(article_url)
-        
-    def parse(self, html):
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        article_data = {
-            'url': self.url,
-            'title': None,
-            'published_date': None,
-            'author': None,
-            'content': None,
-            'summary': None,
-            'source': 'ČT24'
-        }
-        
-        # Extrakce titulku
-        title_elem = soup.select_one('h1')
-        if title_elem:
-            article_data['title'] = title_elem.get_text(strip=True)
-        
-        # ČT24 často má lead/souhrn pod jinou třídou
-        summary_elem = soup.select_one('.article-perex') or soup.select_one('.article-lead')
-        if summary_elem:
-            article_data['summary'] = summary_elem.get_text(strip=True)
-            
-        # Autor může být v byline nebo specifickém atributu
-        author_elem = soup.select_one('.article-author') or soup.select_one('[itemprop="author"]')
-        if author_elem:
-            article_data['author'] = author_elem.get_text(strip=True)
-            
-        # Datum publikace
-        date_elem = soup.select_one('time') or soup.select_one('.article-date')
-        if date_elem:
-            date_str = date_elem.get('datetime') or date_elem.get_text(strip=True)
-            article_data['published_date'] = date_str
-            
-        # Obsah - ČT24 může mít odlišnou strukturu obsahu
-        content_elems = soup.select('.article-body p') or soup.select('.article-content p') or soup.select('article p')
-        if content_elems:
-            article_data['content'] = '\n\n'.join([p.get_text(strip=True) for p in content_elems if p.get_text(strip=True)])
-            
-        return article_data
+# Typy obsahu, které se stahují a parsují jako stránka článku
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
 
 
-class IDnesArticleScraper(BaseScraper):
-    """Scraper pro články z iDNES.cz"""
+class ArticleScraper(ArticleParser):
+    """Stažení článku; extrakci dat z HTML zajišťuje ArticleParser"""
     
-    def __init__(self, article_url):
-        if not article_url.startswith('http'):
-            article_url = urljoin('https://www.idnes.cz', article_url)
-        super().__init__(article_url)
-        
-    def parse(self, html):
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        article_data = {
-            'url': self.url,
-            'title': None,
-            'published_date': None,
-            'author': None,
-            'content': None,
-            'summary': None,
-            'source': 'iDNES.cz'
-        }
-        
-        # Titulek
-        title_elem = soup.select_one('h1')
-        if title_elem:
-            article_data['title'] = title_elem.get_text(strip=True)
-        
-        # Perex
-        summary_elem = soup.select_one('.opener')
-        if summary_elem:
-            article_data['summary'] = summary_elem.get_text(strip=True)
-            
-        # Autor
-        author_elem = soup.select_one('.authors')
-        if author_elem:
-            article_data['author'] = author_elem.get_text(strip=True)
-            
-        # Datum
-        date_elem = soup.select_one('time')
-        if date_elem:
-            date_str = date_elem.get('datetime') or date_elem.get_text(strip=True)
-            article_data['published_date'] = date_str
-            
-        # Obsah
-        content_elems = soup.select('.text p')
-        if content_elems:
-            article_data['content'] = '\n\n'.join([p.get_text(strip=True) for p in content_elems if p.get_text(strip=True)])
-            
-        return article_data
+    def __init__(self, article_url, rule=None):
+        super().__init__(article_url, rule)
+        self.headers = dict(DEFAULT_HEADERS)
+        self.validators = {}  # ETag a Last-Modified z poslední odpovědi
+        self.encoding = None  # Kódování z hlavičky poslední odpovědi
+    
+    async def fetch(self, validators=None, timeout=None):
+        """Asynchronně načte HTML obsah článku přes sdílený HTTP klient
+        
+        Odpověď se čte po částech: typ obsahu se ověří hned z hlaviček (PDF,
+        obrázky apod. se nestahují) a stahování skončí po SCRAPE_MAX_BYTES
+        bajtech nebo po nalezení koncové značky článku z pravidel portálu.
+        
+        Vrací surové bajty odpovědi, kódování z hlavičky Content-Type (pokud ho
+        server uvádí) se uloží do self.encoding.
+        Pokud jsou předány validátory dříve stažené verze (etag, last_modified),
+        pošle se podmíněný požadavek. Odpověď 304 Not Modified vrací None.
+        
+        Časový limit stažení (výchozí SCRAPE_URL_TIMEOUT) začíná běžet až po
+        získání slotu u plánovače hostitele - čekání na vlastní omezení
+        souběžnosti a rychlosti se tak nepočítá jako pomalá odpověď serveru.
+        
+        Vyjímky:
+            ValueError: Pokud odpověď není HTML stránka
+            asyncio.TimeoutError: Pokud server nestihl odpovědět v časovém limitu
+        """
+        headers = dict(self.headers)
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        async with host_slot(self.url):
+            return await asyncio.wait_for(self._download(headers), timeout=timeout or config.SCRAPE_URL_TIMEOUT)
+    
+    async def _download(self, headers):
+        async with get_http_client().stream("GET", self.url, headers=headers, timeout=config.SCRAPE_URL_TIMEOUT) as response:
+            if response.status_code == 304:
+                return None
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            if content_type and content_type not in HTML_CONTENT_TYPES:
+                raise ValueError(f"Nepodporovaný typ obsahu {content_type}")
+            self.validators = {
+                key: value for key, value in (
+                    ("etag", response.headers.get("ETag")),
+                    ("last_modified", response.headers.get("Last-Modified")),
+                ) if value
+            }
+            # Bez charsetu v hlavičce se kódování určí až při parsování z <meta charset>
+            self.encoding = response.charset_encoding
+            return await self._read_body(response)
+    
+    async def _read_body(self, response):
+        """Načte tělo odpovědi nejvýše do limitu velikosti nebo do koncové značky článku"""
+        body = bytearray()
+        # Značka může být rozdělená mezi dvě části odpovědi, hledá se i v konci předchozí
+        overlap = max((len(marker) for marker in self.rule.end_markers), default=0)
+        async for chunk in response.aiter_bytes():
+            search_from = max(0, len(body) - overlap)
+            body.extend(chunk)
+            if len(body) >= config.SCRAPE_MAX_BYTES:
+                logger.info(f"Stránka {self.url} překročila limit {config.SCRAPE_MAX_BYTES} B, zbytek se nestahuje")
+                del body[config.SCRAPE_MAX_BYTES:]
+                break
+            if any(body.find(marker, search_from) != -1 for marker in self.rule.end_markers):
+                break
+        return bytes(body)
+    
+    async def scrape(self, validators=None):
+        """Vyextrahuje data článku
+        
+        Parsování HTML je CPU náročné a drží GIL, proto běží v procesním poolu
+        (případně ve vlákně, pokud je pool vypnutý) mimo event loop.
+        Při odpovědi 304 Not Modified vrací None - článek se nezměnil.
+        """
+        html_bytes = await self.fetch(validators)
+        if html_bytes is None:
+            return None
+        return await run_parse(html_bytes, self.portal, self.url, self.encoding)
 
 
-class AktualneArticleScraper(BaseScraper):
-    """Scraper pro články z Aktuálně.cz"""
-    
-    def __init__(self, article_url):
-        if not article_url.startswith('http'):
-            article_url = urljoin('https://www.aktualne.cz', article_url)
-        super().__init__(article_url)
-        
-    def parse(self, html):
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        article_data = {
-            'url': self.url,
-            'title': None,
-            'published_date': None,
-            'author': None,
-            'content': None,
-            'summary': None,
-            'source': 'Aktuálně.cz'
-        }
-        
-        # Titulek
-        title_elem = soup.select_one('h1')
-        if title_elem:
-            article_data['title'] = title_elem.get_text(strip=True)
-        
-        # Perex
-        summary_elem = soup.select_one('.perex')
-        if summary_elem:
-            article_data['summary'] = summary_elem.get_text(strip=True)
-            
-        # Autor
-        author_elem = soup.select_one('.author')
-        if author_elem:
-            article_data['author'] = author_elem.get_text(strip=True)
-            
-        # Datum
-        date_elem = soup.select_one('time')
-        if date_elem:
-            date_str = date_elem.get('datetime') or date_elem.get_text(strip=True)
-            article_data['published_date'] = date_str
-            
-        # Obsah
-        content_elems = soup.select('.article-content p')
-        if content_elems:
-            article_data['content'] = '\n\n'.join([p.get_text(strip=True) for p in content_elems if p.get_text(strip=True)])
-            
-        return article_data
+_parse_executor = None
 
 
-class DenikArticleScraper(BaseScraper):
-    """Scraper pro články z Deník.cz"""
-    
-    def __init__(self, article_url):
-        if not article_url.startswith('http'):
-            article_url = urljoin('https://www.denik.cz', article_url)
-        super().__init__(article_url)
-        
-    def parse(self, html):
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        article_data = {
-            'url': self.url,
-            'title': None,
-            'published_date': None,
-            'author': None,
-            'content': None,
-            'summary': None,
-            'source': 'Deník.cz'
-        }
-        
-        # Titulek
-        title_elem = soup.select_one('h1')
-        if title_elem:
-            article_data['title'] = title_elem.get_text(strip=True)
-        
-        # Perex
-        summary_elem = soup.select_one('.perex')
-        if summary_elem:
-            article_data['summary'] = summary_elem.get_text(strip=True)
-            
-        # Autor
-        author_elem = soup.select_one('.author')
-        if author_elem:
-            article_data['author'] = author_elem.get_text(strip=True)
-            
-        # Datum
-        date_elem = soup.select_one('time')
-        if date_elem:
-            date_str = date_elem.get('datetime') or date_elem.get_text(strip=True)
-            article_data['published_date'] = date_str
-            
-        # Obsah
-        content_elems = soup.select('.article-content p')
-        if content_elems:
-            article_data['content'] = '\n\n'.join([p.get_text(strip=True) for p in content_elems if p.get_text(strip=True)])
-            
-        return article_data
+def get_parse_executor():
+    """Vrátí sdílený procesní pool pro parsování, nebo None pokud je vypnutý"""
+    global _parse_executor
+    if config.PARSE_PROCESS_WORKERS <= 0:
+        return None
+    if _parse_executor is None:
+        # spawn: fork procesu s běžícími vlákny (aiosqlite, to_thread) může ve workeru
+        # zdědit zamčený zámek a worker by se zasekl
+        _parse_executor = ProcessPoolExecutor(
+            max_workers=config.PARSE_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+        logger.info(f"Spuštěn procesní pool pro parsování HTML ({config.PARSE_PROCESS_WORKERS} procesů)")
+    return _parse_executor
 
 
-class GenericArticleScraper(BaseScraper):
-    """Obecný scraper pro nepodporované zpravodajské portály"""
-    
-    def __init__(self, article_url):
-        super().__init__(article_url)
-        
-    def parse(self, html):
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        article_data = {
-            'url': self.url,
-            'title': None,
-            'published_date': None,
-            'author': None,
-            'content': None,
-            'summary': None,
-            'source': urlparse(self.url).netloc
-        }
-        
-        # Pokus o extrakci titulku - zkusíme různé běžné selektory
-        title_selectors = [
-            'h1',  # Nejběžnější
-            'article h1',  # Článek v article tagu
-            '.article-title',  # Běžná třída
-            '.post-title',
-            '.entry-title',
-            '[itemprop="headline"]',  # Schema.org
-            'meta[property="og:title"]'  # Open Graph
-        ]
-        
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
-            if title_elem:
-                if selector.startswith('meta'):
-                    article_data['title'] = title_elem.get('content', '').strip()
-                else:
-                    article_data['title'] = title_elem.get_text(strip=True)
-                break
-        
-        # Pokus o extrakci perexu/souhrnu
-        summary_selectors = [
-            '.perex',
-            '.summary',
-            '.article-summary',
-            '.article-lead',
-            '.article-intro',
-            'meta[name="description"]',
-            'meta[property="og:description"]'
-        ]
-        
-        for selector in summary_selectors:
-            summary_elem = soup.select_one(selector)
-            if summary_elem:
-                if selector.startswith('meta'):
-                    article_data['summary'] = summary_elem.get('content', '').strip()
-                else:
-                    article_data['summary'] = summary_elem.get_text(strip=True)
-                break
-        
-        # Pokus o extrakci autora
-        author_selectors = [
-            '.author',
-            '.article-author',
-            '.post-author',
-            '[itemprop="author"]',
-            'meta[name="author"]'
-        ]
-        
-        for selector in author_selectors:
-            author_elem = soup.select_one(selector)
-            if author_elem:
-                if selector.startswith('meta'):
-                    article_data['author'] = author_elem.get('content', '').strip()
-                else:
-                    article_data['author'] = author_elem.get_text(strip=True)
-                break
-        
-        # Pokus o extrakci data
-        date_selectors = [
-            'time',
-            '.date',
-            '.article-date',
-            '.post-date',
-            '[itemprop="datePublished"]',
-            'meta[property="article:published_time"]'
-        ]
-        
-        for selector in date_selectors:
-            date_elem = soup.select_one(selector)
-            if date_elem:
-                if selector.startswith('meta'):
-                    article_data['published_date'] = date_elem.get('content', '').strip()
-                else:
-                    date_str = date_elem.get('datetime') or date_elem.get_text(strip=True)
-                    article_data['published_date'] = date_str
-                break
-        
-        # Pokus o extrakci obsahu
-        content_selectors = [
-            'article p',  # Nejběžnější
-            '.article-content p',
-            '.post-content p',
-            '.entry-content p',
-            '[itemprop="articleBody"] p',
-            '.text p',
-            '.content p'
-        ]
-        
-        for selector in content_selectors:
-            content_elems = soup.select(selector)
-            if content_elems:
-                # Filtrujeme prázdné odstavce a reklamy
-                filtered_content = []
-                for p in content_elems:
-                    text = p.get_text(strip=True)
-                    if text and len(text) > 20 and not any(ad in text.lower() for ad in ['reklama', 'sponzor', 'advertisement']):
-                        filtered_content.append(text)
-                
-                if filtered_content:
-                    article_data['content'] = '\n\n'.join(filtered_content)
-                    break
-        
-        # Pokud nemáme obsah, zkusíme najít jakýkoliv text v článku
-        if not article_data['content']:
-            main_content_selectors = [
-                'article',
-                '.article-content',
-                '.post-content',
-                '.entry-content',
-                '[itemprop="articleBody"]',
-                '.text',
-                '.content'
-            ]
-            
-            for selector in main_content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    # Odstraníme skripty, styly a komentáře
-                    for script in content_elem(['script', 'style', 'nav', 'header', 'footer']):
-                        script.decompose()
-                    
-                    # Získáme text a rozdělíme na odstavce
-                    text = content_elem.get_text('\n', strip=True)
-                    paragraphs = [p.strip() for p in text.split('\n') if p.strip() and len(p.strip()) > 20]
-                    
-                    if paragraphs:
-                        article_data['content'] = '\n\n'.join(paragraphs)
-                        break
-        
-        return article_data
+def shutdown_parse_executor():
+    """Ukončí procesní pool pro parsování (při vypnutí aplikace)"""
+    global _parse_executor
+    if _parse_executor is not None:
+        _parse_executor.shutdown(wait=False, cancel_futures=True)
+        _parse_executor = None
+
+
+async def run_parse(html_bytes, portal, url, encoding=None):
+    """Spustí parse_html v procesním poolu, případně ve vlákně"""
+    executor = get_parse_executor()
+    engine = config.PARSER_ENGINE
+    if executor is None:
+        return await asyncio.to_thread(parse_html, html_bytes, portal, url, encoding, engine)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, parse_html, html_bytes, portal, url, encoding, engine)
+    except BrokenProcessPool:
+        # Pád workeru (např. nedostatek paměti) - pool se při dalším použití vytvoří znovu
+        global _parse_executor
+        if _parse_executor is executor:
+            _parse_executor = None
+        logger.error(f"Procesní pool pro parsování selhal, {url} se zpracuje ve vlákně")
+        return await asyncio.to_thread(parse_html, html_bytes, portal, url, encoding, engine)
 
 
 def detect_portal(url):
     """Detekuje, kterému zpravodajskému portálu URL patří"""
-    domain = urlparse(url).netloc.lower()
-    
-    if 'seznamzpravy.cz' in domain:
-        return 'seznam'
-    elif 'novinky.cz' in domain:
-        return 'novinky'
-    elif 'ceskatelevize.cz' in domain or 'ct24.cz' in domain:
-        return 'ct24'
-    elif 'idnes.cz' in domain:
-        return 'idnes'
-    elif 'aktualne.cz' in domain:
-        return 'aktualne'
-    elif 'denik.cz' in domain:
-        return 'denik'
-    else:
-        return 'generic'
+    return rule_for_url(url).portal
 
 
-def scrape_article(article_url, portal=None):
+async def scrape_article(article_url, portal=None, timeout=None):
     """
-    Extrahuje obsah článku z URL.
+    Asynchronně extrahuje obsah článku z URL.
+    
+    Článek se nejprve hledá v úložišti stažených článků podle kanonické URL,
+    stahuje a parsuje se jen při jeho absenci. Úspěšně extrahované články
+    se do úložiště ukládají spolu s hlavičkami ETag a Last-Modified. Uložený
+    článek starší než ARTICLE_REVALIDATE_AFTER se ověří podmíněným požadavkem
+    a při odpovědi 304 se použije bez nového stažení a parsování.
+    Pokud stažení selže (např. nedostupný portál), vrátí se uložená verze.
     
     Parametry:
         article_url (str): URL článku ke zpracování
         portal (str, optional): Portál, ze kterého se má extrahovat.
                               Pokud není specifikován, použije se automatická detekce podle URL.
+        timeout (float, optional): Časový limit stažení článku, výchozí SCRAPE_URL_TIMEOUT
         
     Vrací:
         dict: Slovník obsahující data článku (url, title, published_date, 
@@ -515,42 +209,198 @@ def scrape_article(article_url, portal=None):
     Vyjímky:
         ValueError: Pokud portál není podporován
     """
-    # Automatická detekce portálu, pokud není specifikován
-    if not portal:
-        portal = detect_portal(article_url)
-    
+    if not config.ARTICLE_STORE_ENABLED:
+        article_data, _ = await _fetch_and_parse_article(article_url, portal, timeout=timeout)
+        return article_data
+
+    store_key = canonicalize_url(article_url)
+    entry = await article_store.get(store_key)
+    validators = None
+    if entry is not None and "article" in entry:
+        if time.time() - entry["validated_at"] < config.ARTICLE_REVALIDATE_AFTER:
+            logger.debug(f"Článek {article_url} nalezen v úložišti")
+            return entry["article"]
+        validators = entry.get("validators") or None
+        if validators is None:
+            logger.debug(f"Uložený článek {article_url} nemá validátory, stahuje se znovu")
+
     try:
-        # Výběr vhodného scraperu podle portálu
-        if portal.lower() == 'seznam':
-            scraper = SeznamZpravyArticleScraper(article_url)
-        elif portal.lower() == 'novinky':
-            scraper = NovinkyArticleScraper(article_url)
-        elif portal.lower() == 'ct24':
-            scraper = CT24ArticleScraper(article_url)
-        elif portal.lower() == 'idnes':
-            scraper = IDnesArticleScraper(article_url)
-        elif portal.lower() == 'aktualne':
-            scraper = AktualneArticleScraper(article_url)
-        elif portal.lower() == 'denik':
-            scraper = DenikArticleScraper(article_url)
-        elif portal.lower() == 'generic':
-            scraper = GenericArticleScraper(article_url)
-        else:
-            logger.warning(f"Nepodporovaný portál: {portal}, použití obecného scraperu")
-            scraper = GenericArticleScraper(article_url)
-        
-        return scraper.scrape()
+        article_data, response_validators = await _fetch_and_parse_article(article_url, portal, validators, timeout)
+    except Exception as e:
+        if entry is None or "article" not in entry:
+            raise
+        # Nedostupný portál - lepší starší verze článku než žádná
+        logger.info(f"Článek {article_url} nelze ověřit ({e}), použita uložená verze")
+        return entry["article"]
+    if article_data is None and validators:
+        # 304 Not Modified - uložený článek je stále aktuální
+        logger.debug(f"Článek {article_url} se nezměnil (304), použita uložená verze")
+        entry["validated_at"] = time.time()
+        await article_store.set(store_key, entry)
+        return entry["article"]
+
+    if article_data and article_data.get('content'):
+        await article_store.set(store_key, {
+            "article": article_data,
+            "validators": response_validators,
+            "validated_at": time.time(),
+        })
+        await local_index.add(store_key, article_data)
+    return article_data
+
+
+def _is_domain_failure(error):
+    """Vrátí True, pokud chyba znamená nedostupnost nebo blokování celé domény"""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status in (403, 429)
+    return isinstance(error, (httpx.TransportError, asyncio.TimeoutError))
+
+
+def record_scrape_failure(article_url, error):
+    """Zapíše neúspěšné stažení do negativní cache a případně do jističe domény"""
+    failed_urls.set(canonicalize_url(article_url), str(error) or type(error).__name__)
+    if _is_domain_failure(error):
+        domain_breaker.record_failure(urlparse(article_url).hostname or '')
+
+
+async def _fetch_and_parse_article(article_url, portal=None, validators=None, timeout=None):
+    """Stáhne a zpracuje článek vhodným scraperem (bez úložiště článků)
+    
+    URL, která nedávno selhala, a domény vyřazené jističem se vůbec nestahují.
+    Stránka se stahuje jen jednou - pokud si s ní pravidla portálu neporadí,
+    zpracují se tytéž bajty obecnými pravidly.
+    
+    Vrací:
+        tuple: (data článku nebo None při odpovědi 304, validátory odpovědi)
         
+    Vyjímky:
+        ScrapeSkipped: Pokud se stahování kvůli jističi nebo negativní cache neprovedlo
+    """
+    # Pravidla portálu - automatická detekce podle URL, pokud portál není specifikován
+    if portal:
+        rule = PORTAL_RULES.get(portal.lower())
+        if rule is None:
+            logger.warning(f"Nepodporovaný portál: {portal}, použití obecného scraperu")
+            rule = GENERIC_RULE
+    else:
+        rule = rule_for_url(article_url)
+    
+    scraper = ArticleScraper(article_url, rule)
+    failure = failed_urls.get(canonicalize_url(scraper.url))
+    if failure is not None:
+        raise ScrapeSkipped(f"Stažení nedávno selhalo: {failure}")
+    domain = urlparse(scraper.url).hostname or ''
+    if not domain_breaker.allow(domain):
+        raise ScrapeSkipped(f"Doména {domain} je dočasně vyřazená")
+    
+    try:
+        html_bytes = await scraper.fetch(validators, timeout)
+    except Exception as e:
+        logger.error(f"Chyba při stahování článku {scraper.url}: {str(e)}")
+        record_scrape_failure(scraper.url, e)
+        raise
+    # Doména odpověděla (i 404 nebo jiný typ obsahu znamená, že je dostupná)
+    domain_breaker.record_success(domain)
+    if html_bytes is None:
+        return None, scraper.validators
+    
+    try:
+        article_data = await run_parse(html_bytes, rule.portal, scraper.url, scraper.encoding)
     except Exception as e:
-        logger.error(f"Chyba při scrapování článku {article_url}: {str(e)}")
-        # Pokud selže specializovaný scraper, zkusíme obecný
-        if portal.lower() != 'generic':
-            logger.info(f"Zkouším obecný scraper pro {article_url}")
-            try:
-                scraper = GenericArticleScraper(article_url)
-                return scraper.scrape()
-            except Exception as e2:
-                logger.error(f"Selhal i obecný scraper pro {article_url}: {str(e2)}")
-                raise
-        else:
-            raise
\ No newline at end of file
+        if rule is GENERIC_RULE:
+            logger.error(f"Chyba při zpracování článku {scraper.url}: {str(e)}")
+            raise
+        logger.error(f"Chyba při zpracování článku {scraper.url} pravidly {rule.portal}: {str(e)}")
+        article_data = None
+    if rule is not GENERIC_RULE and not (article_data and article_data.get('content')):
+        # Pravidla portálu nic nenašla (např. změněná šablona) - zkusíme obecná pravidla
+        logger.info(f"Zkouším obecný scraper pro {scraper.url}")
+        generic_data = await run_parse(html_bytes, GENERIC_RULE.portal, scraper.url, scraper.encoding)
+        if generic_data and generic_data.get('content'):
+            article_data = generic_data
+    return article_data, scraper.validators
+
+
+async def scrape_articles(article_urls, max_concurrency=None, url_timeout=None, stage_deadline=None, max_articles=None,
+                          on_article=None, stage_memo=None):
+    """
+    Souběžně extrahuje obsah více článků.
+    
+    Články se stahují paralelně (nejvýše max_concurrency najednou), každý má
+    vlastní časový limit a celá etapa má společný deadline. Po vypršení deadlinu
+    nebo po získání max_articles článků se zbývající stahování zruší a vrátí se
+    to, co se stihlo dokončit.
+    
+    Parametry:
+        article_urls (list): URL článků ke zpracování
+        max_concurrency (int, optional): Max. počet souběžných stahování
+        url_timeout (float, optional): Časový limit stažení jednoho článku v sekundách;
+            běží až od získání slotu u plánovače hostitele
+        stage_deadline (float, optional): Časový limit pro celou etapu v sekundách
+        max_articles (int, optional): Počet článků, po jehož dosažení se etapa ukončí
+        on_article (callable, optional): Funkce volaná s (url, data článku) hned po získání každého článku
+        stage_memo (StageMemo, optional): Sdílení stažených článků mezi tvrzeními jedné dávky
+        
+    Vrací:
+        tuple: (dict URL -> data článku, dict URL -> popis chyby); stahování zrušená
+        po získání max_articles článků nejsou chybou a v chybách nejsou
+    """
+    max_concurrency = max_concurrency or config.SCRAPE_MAX_CONCURRENCY
+    url_timeout = url_timeout or config.SCRAPE_URL_TIMEOUT
+    # Nulový zbytek rozpočtu ověření je platná hodnota, proto ne "or"
+    stage_deadline = config.SCRAPE_STAGE_DEADLINE if stage_deadline is None else stage_deadline
+    max_articles = max_articles or config.SCRAPE_MAX_ARTICLES
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _scrape_one(url):
+        # Limit pro článek hlídá až samotné stažení - čekání na slot zde ani u plánovače
+        # hostitele se nepočítá a nesmí se zapsat jako selhání domény
+        async with semaphore:
+            if stage_memo is not None:
+                return await stage_memo.run(f"scrape:{url}", lambda: scrape_article(url, timeout=url_timeout))
+            return await scrape_article(url, timeout=url_timeout)
+
+    scraped = {}
+    errors = {}
+    tasks = {asyncio.create_task(_scrape_one(url)): url for url in dict.fromkeys(article_urls)}
+    pending = set(tasks)
+    loop = asyncio.get_running_loop()
+    deadline_at = loop.time() + stage_deadline
+
+    try:
+        while pending and len(scraped) < max_articles:
+            remaining = deadline_at - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                url = tasks[task]
+                try:
+                    article_data = task.result()
+                except asyncio.TimeoutError:
+                    # Selhání už zapsal _fetch_and_parse_article
+                    errors[url] = f"Překročen časový limit {url_timeout}s"
+                except Exception as e:
+                    errors[url] = str(e)
+                else:
+                    if article_data and article_data.get('content'):
+                        scraped[url] = article_data
+                        if on_article is not None:
+                            on_article(url, article_data)
+                    else:
+                        errors[url] = "Článek neobsahuje žádný text"
+    finally:
+        # Zrušení stahování, která se nestihla dokončit
+        enough_articles = len(scraped) >= max_articles
+        for task in pending:
+            task.cancel()
+            if not enough_articles:
+                errors.setdefault(tasks[task], "Zrušeno po vypršení limitu etapy scrapingu")
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    skipped = f", {len(pending)} nepotřebných zrušeno" if enough_articles and pending else ""
+    logger.info(f"Scraping dokončen: {len(scraped)} článků získáno, {len(errors)} selhalo nebo zrušeno{skipped}")
+    return scraped, errors
@@ -0,0 +1,140 @@
+"""
+Zaměnitelní poskytovatelé vyhledávání.
+
+Ověření tvrzení volá jen funkci search(), která dotaz předá poskytovateli
+zvolenému v config.SEARCH_BACKEND:
+- google: Google Custom Search API (vyhledavani_googlem_module)
+- local: lokální index dříve stažených článků - bez sítě a zdarma
+- fanout: souběžně se dotáže poskytovatelů ze SEARCH_FANOUT_PROVIDERS
+  a výsledky sloučí; duplicity se poznají podle kanonické URL
+
+Všichni poskytovatelé vracejí seznam výsledků ve tvaru výsledků Googlu,
+případně None, pokud nic nenašli. Pokud vyhledávání nestihne časový limit,
+poskytne fallback_search výsledky bez volání sítě.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+from source.modules.config import config
+from source.modules.local_index_module import local_index
+from source.modules.utils import canonicalize_url
+from source.modules.vyhledavani_googlem_module import cached_search_results, google_search
+
+# Nastavení loggeru
+logger = logging.getLogger(__name__)
+
+
+class SearchProvider:
+    """Rozhraní poskytovatele vyhledávání"""
+
+    name = "base"
+
+    async def search(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """Vrátí výsledky vyhledávání, nebo None pokud nic nenašel"""
+        raise NotImplementedError
+
+
+class GoogleSearchProvider(SearchProvider):
+    """Vyhledávání přes Google Custom Search API"""
+
+    name = "google"
+
+    async def search(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        return await google_search(query)
+
+
+class LocalIndexSearchProvider(SearchProvider):
+    """Vyhledávání v lokálním indexu dříve stažených článků"""
+
+    name = "local"
+
+    def __init__(self, max_results: int):
+        self.max_results = max_results
+
+    async def search(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        await local_index.ensure_loaded()
+        return local_index.search(query, self.max_results) or None
+
+
+class FanOutSearchProvider(SearchProvider):
+    """Souběžný dotaz na více poskytovatelů se sloučením výsledků"""
+
+    name = "fanout"
+
+    def __init__(self, providers: Sequence[SearchProvider], max_results: int):
+        self.providers = list(providers)
+        self.max_results = max_results
+
+    async def search(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Sloučí výsledky v pořadí poskytovatelů a vynechá duplicitní URL.
+
+        Selhání jednoho poskytovatele nevadí, použijí se výsledky ostatních.
+        """
+        responses = await asyncio.gather(
+            *(provider.search(query) for provider in self.providers), return_exceptions=True
+        )
+        merged = []
+        seen = set()
+        for provider, results in zip(self.providers, responses):
+            if isinstance(results, Exception):
+                logger.error(f"Poskytovatel vyhledávání {provider.name} selhal: {results}")
+                continue
+            for item in results or []:
+                key = canonicalize_url(item["link"])
+                if key in seen:
+                    continue
+                seen.add(key)
+                merged.append(item)
+        logger.debug(f"Sloučené vyhledávání '{query}': {len(merged)} výsledků")
+        return merged[:self.max_results] or None
+
+
+def build_provider(name: str) -> SearchProvider:
+    """Vytvoří poskytovatele podle názvu z konfigurace"""
+    name = name.strip().lower()
+    if name == GoogleSearchProvider.name:
+        return GoogleSearchProvider()
+    if name == LocalIndexSearchProvider.name:
+        return LocalIndexSearchProvider(config.SEARCH_MAX_RESULTS)
+    if name == FanOutSearchProvider.name:
+        providers = [build_provider(provider) for provider in config.SEARCH_FANOUT_PROVIDERS.split(",") if provider.strip()]
+        return FanOutSearchProvider(providers, config.SEARCH_MAX_RESULTS)
+    raise ValueError(f"Neznámý poskytovatel vyhledávání: {name}")
+
+
+_provider: Optional[SearchProvider] = None
+
+
+def get_search_provider() -> SearchProvider:
+    """Vrátí poskytovatele vyhledávání zvoleného v konfiguraci"""
+    global _provider
+    if _provider is None:
+        _provider = build_provider(config.SEARCH_BACKEND)
+        logger.info(f"Použitý poskytovatel vyhledávání: {config.SEARCH_BACKEND}")
+    return _provider
+
+
+async def search(query: str) -> Optional[List[Dict[str, Any]]]:
+    """Vyhledá dotaz u zvoleného poskytovatele"""
+    return await get_search_provider().search(query)
+
+
+async def fallback_search(queries: Sequence[str]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Výsledky pro omezený režim, když vyhledávání nestihne časový limit.
+
+    Bez volání sítě zkusí pro dotazy v daném pořadí nejdřív cache vyhledávání
+    Googlu a pak články lokálního indexu, které už jsou načtené v paměti.
+    """
+    queries = [query for query in dict.fromkeys(queries) if query]
+    for query in queries:
+        results = await cached_search_results(query)
+        if results:
+            return results
+    for query in queries:
+        results = local_index.search(query, config.SEARCH_MAX_RESULTS)
+        if results:
+            return results
+    return None
@@ -0,0 +1,186 @@
+"""
+Slučování souběžných identických operací (single-flight).
+
+Pokud během běhu operace přijde další požadavek se stejným klíčem,
+nespouští se nový běh - požadavek počká na výsledek již běžící operace
+a sdílí ho. Po dokončení operace se klíč uvolní, takže další požadavek
+už spustí nový běh (případně ho obslouží cache).
+
+StageMemo naopak výsledky drží po celou dobu dávkového ověření, aby se
+etapy společné více tvrzením provedly jen jednou.
+"""
+import asyncio
+import copy
+import logging
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+# Nastavení loggeru
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """Jeden běh operace a počet požadavků, které na něj čekají"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Sdílení jednoho běhu operace mezi souběžnými požadavky se stejným klíčem"""
+
+    def __init__(self):
+        # Počet čekajících je uložený u běhu - čekající na starší, už zapomenutý
+        # běh tak nemůže ovlivnit (a zrušit) nový běh se stejným klíčem
+        self._calls: Dict[str, _Flight] = {}
+        self.coalesced = 0
+
+    def in_flight(self, key: str) -> bool:
+        """Vrátí True, pokud pro daný klíč právě běží operace"""
+        return key in self._calls
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Spustí operaci pro daný klíč, nebo se připojí k již běžící.
+
+        Parametry:
+            key: Klíč identifikující operaci
+            factory: Funkce bez parametrů vracející korutinu operace
+
+        Vrací:
+            Tuple (výsledek operace, True pokud byl výsledek sdílen z cizího běhu)
+
+        Zrušení čekajícího požadavku sdílený běh nezruší. Ten se zruší až ve
+        chvíli, kdy na jeho výsledek nečeká už žádný požadavek.
+        """
+        flight = self._calls.get(key)
+        shared = flight is not None
+        if shared:
+            self.coalesced += 1
+            logger.info(f"Požadavek se připojil k běžící operaci (klíč: {key[:50]})")
+        else:
+            flight = _Flight(asyncio.create_task(factory()))
+            self._calls[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+
+        flight.waiters += 1
+        try:
+            # shield: zrušení jednoho čekajícího nesmí zrušit běh sdílený s ostatními
+            return await asyncio.shield(flight.task), shared
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                logger.info(f"Na operaci už nikdo nečeká, ruší se (klíč: {key[:50]})")
+                flight.task.cancel()
+                # Nový požadavek se stejným klíčem už spustí nový běh
+                self._forget(key, flight)
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._calls.get(key) is flight:
+            del self._calls[key]
+
+
+class StageMemo:
+    """
+    Sdílení výsledků etap (vyhledávání, stažení článku) v rámci jedné dávky.
+
+    Na rozdíl od SingleFlight si výsledek pamatuje i po dokončení operace,
+    takže se stejná operace v rámci dávky provede nejvýše jednou. Zapamatuje
+    se i výjimka - selhané stažení se v dávce neopakuje. Volající dostává
+    vlastní kopii výsledku, aby úpravy jednoho tvrzení neovlivnily ostatní.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}  # klíč -> počet požadavků čekajících na výsledek
+        self.hits = 0
+        self.misses = 0
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Vrátí výsledek operace pro daný klíč, operaci spustí jen při prvním volání"""
+        task = self._tasks.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(factory())
+            self._tasks[key] = task
+        else:
+            self.hits += 1
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            # shield: časový limit jednoho tvrzení nesmí zrušit operaci sdílenou s ostatními
+            return copy.deepcopy(await asyncio.shield(task))
+        finally:
+            if key in self._waiters:
+                self._waiters[key] -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """Vrátí počet sdílených a skutečně provedených operací"""
+        return {"hits": self.hits, "misses": self.misses}
+
+    async def close(self) -> None:
+        """
+        Uvolní výsledky dávky a zruší operace, na které už nikdo nečeká.
+
+        Operaci, na kterou ještě čeká některý požadavek (např. ověření mimo
+        dávku sloučené s ověřením z dávky), nechá doběhnout - jen ji zapomene.
+        """
+        pending = [
+            task for key, task in self._tasks.items()
+            if not task.done() and not self._waiters.get(key)
+        ]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        # Výjimky operací už nikdo z dávky nevyzvedne
+        for task in self._tasks.values():
+            if task.done():
+                _retrieve_exception(task)
+            else:
+                task.add_done_callback(_retrieve_exception)
+        self._tasks.clear()
+        self._waiters.clear()
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+class ProgressChannel:
+    """
+    Rozesílání průběžných událostí jednoho běhu všem požadavkům, které ho sdílí.
+
+    Posluchač, který se připojí později, nejprve dostane všechny dosavadní
+    události, takže i požadavek sloučený s již běžícím ověřením uvidí celý průběh.
+    Posluchači jsou synchronní funkce (např. asyncio.Queue.put_nowait), aby
+    rozesílání nikdy nepřerušilo běh operace.
+    """
+
+    def __init__(self):
+        self.history = []
+        self._listeners = []
+
+    def emit(self, event: str, data: Any) -> None:
+        """Zaznamená událost a předá ji všem připojeným posluchačům"""
+        self.history.append((event, data))
+        for listener in list(self._listeners):
+            try:
+                listener(event, data)
+            except Exception as e:
+                logger.warning(f"Posluchač průběhu selhal při události {event}: {e}")
+
+    def subscribe(self, listener: Callable[[str, Any], None]) -> None:
+        """Připojí posluchače a přehraje mu dosavadní události"""
+        for event, data in self.history:
+            listener(event, data)
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, Any], None]) -> None:
+        """Odpojí posluchače"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
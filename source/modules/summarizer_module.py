@@ -1,50 +1,142 @@
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.summarizers.lsa import LsaSummarizer
-import nltk
+"""
+Rychlý lokální extraktivní sumarizátor.
+
+Věty textu se převedou na TF-IDF vektory v řídké matici (scipy.sparse)
+a ohodnotí se algoritmem TextRank nad maticí kosinových podobností vět.
+Pokud je zadané tvrzení, přičte se k hodnocení i podobnost věty s tvrzením,
+takže souhrn obsahuje hlavně věty, které se ověřovaného tvrzení týkají.
+Tokenizátor a seznam stop slov se sestaví jednou při načtení modulu.
+Souhrn dlouhého článku trvá jednotky milisekund, proto se hodí i ke zkrácení
+článků před odesláním placenému LLM.
+"""
 import re
 
-# Stažení požadovaných NLTK dat
-try:
-    nltk.download('punkt', quiet=True)
-except Exception as e:
-    print(f"Warning: Could not download NLTK data: {e}")
-
-class SimpleTokenizer:
-    """Jednoduchý tokenizátor, který funguje pro češtinu i angličtinu"""
-    def __init__(self):
-        self.sentence_pattern = re.compile(r'(?<=[.!?])\s+')
-        
-    def tokenize(self, text):
-        # Jednoduché rozdělení vět na základě interpunkce
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        return [s.strip() for s in sentences if s.strip()]
-    
-    def to_sentences(self, paragraph):
-        """Vyžadováno knihovnou Sumy: Rozdělení odstavců na věty"""
-        return self.tokenize(paragraph)
-    
-    def to_words(self, sentence):
-        """Vyžadováno knihovnou Sumy: Rozdělení vět na slova"""
-        return sentence.split()
+import numpy as np
+from scipy import sparse
+
+from .utils import STEM_LENGTH, tokenize
+
+# Česká a anglická stop slova (bez diakritiky, zkrácená stejně jako slova textu)
+STOP_WORDS = frozenset(word[:STEM_LENGTH] for word in (
+    "ale", "ani", "aby", "byl", "byla", "byli", "bylo", "bude", "budou", "coz", "jak", "jako", "jsem",
+    "jsme", "jste", "jsou", "jeho", "jeji", "jejich", "jen", "jeste", "jiz", "kde", "kdy", "kdyz",
+    "ktera", "ktere", "kteri", "ktery", "mezi", "muze", "mohou", "nad", "nebo", "neni", "nejsou",
+    "pak", "pod", "podle", "pri", "pro", "proto", "pred", "tak", "take", "tam", "tedy", "ten",
+    "tento", "tato", "toto", "tyto", "uz", "vsak", "svuj", "sve", "svou", "jej", "ona", "oni",
+    "ono", "the", "and", "for", "that", "with", "this", "are", "was", "were",
+))
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+# Parametry TextRanku
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+# Podíl podobnosti s tvrzením na výsledném hodnocení věty
+CLAIM_WEIGHT = 0.5
+
+
+def split_sentences(text):
+    """Rozdělí text na věty podle interpunkce"""
+    return [sentence.strip() for sentence in SENTENCE_PATTERN.split(text or '') if sentence.strip()]
+
+
+def sentence_tokens(sentence):
+    """Vrátí slova věty bez stop slov"""
+    return [token for token in tokenize(sentence) if token not in STOP_WORDS]
+
+
+def _tfidf_matrix(token_lists, vocabulary):
+    """Sestaví řídkou matici četností slov (řádek = věta, sloupec = slovo slovníku)"""
+    rows, cols, values = [], [], []
+    for row, tokens in enumerate(token_lists):
+        counts = {}
+        for token in tokens:
+            column = vocabulary.get(token)
+            if column is not None:
+                counts[column] = counts.get(column, 0) + 1
+        rows.extend([row] * len(counts))
+        cols.extend(counts.keys())
+        values.extend(counts.values())
+    return sparse.csr_matrix((values, (rows, cols)), shape=(len(token_lists), len(vocabulary)), dtype=np.float64)
+
+
+def _normalize_rows(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+def _textrank(similarity):
+    """Vrátí skóre vět algoritmem PageRank nad maticí podobností"""
+    n = similarity.shape[0]
+    out_weight = np.asarray(similarity.sum(axis=1)).ravel()
+    out_weight[out_weight == 0] = 1.0
+    transition = (sparse.diags(1.0 / out_weight) @ similarity).T.tocsr()
+    scores = np.full(n, 1.0 / n)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / n + DAMPING * (transition @ scores)
+        if np.abs(updated - scores).sum() < TOLERANCE:
+            return updated
+        scores = updated
+    return scores
 
-def get_summary(text, sentence_count=3):
+
+def rank_sentences(sentences, claim=None):
+    """
+    Vrátí skóre vět - TextRank, případně kombinovaný s podobností věty s tvrzením.
+
+    Argumenty:
+        sentences (list): Věty textu
+        claim (str, volitelný): Tvrzení, ke kterému se mají vybírat věty
+
+    Vrací:
+        numpy.ndarray: Skóre vět ve stejném pořadí
+    """
+    token_lists = [sentence_tokens(sentence) for sentence in sentences]
+    vocabulary = {}
+    for tokens in token_lists:
+        for token in tokens:
+            vocabulary.setdefault(token, len(vocabulary))
+    if not vocabulary:
+        return np.zeros(len(sentences))
+
+    counts = _tfidf_matrix(token_lists, vocabulary)
+    document_frequency = np.bincount(counts.indices, minlength=len(vocabulary))
+    idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1
+    vectors = _normalize_rows(counts @ sparse.diags(idf))
+
+    similarity = (vectors @ vectors.T).tocsr()
+    similarity = similarity - sparse.diags(similarity.diagonal())  # bez smyček věta -> tatáž věta
+    scores = _textrank(similarity)
+    scores = scores / scores.max() if scores.max() > 0 else scores
+
+    if claim:
+        claim_vector = _normalize_rows(_tfidf_matrix([sentence_tokens(claim)], vocabulary) @ sparse.diags(idf))
+        relevance = np.asarray((vectors @ claim_vector.T).todense()).ravel()
+        if relevance.max() > 0:
+            scores = (1 - CLAIM_WEIGHT) * scores + CLAIM_WEIGHT * relevance / relevance.max()
+    return scores
+
+
+def get_summary(text, sentence_count=3, claim=None):
     """
     Vygeneruje souhrn poskytnutého textu.
-    
+
     Argumenty:
         text (str): Text k sumarizaci
         sentence_count (int, volitelný): Počet vět v souhrnu. Výchozí hodnota je 3.
-        
+        claim (str, volitelný): Tvrzení, ke kterému se mají přednostně vybírat věty
+
     Vrací:
-        str: Sumarizovaný text
+        str: Sumarizovaný text (vybrané věty v původním pořadí)
     """
-    # Vytvoření parseru s vlastním tokenizátorem
-    parser = PlaintextParser.from_string(text, SimpleTokenizer())
-        
-    # Použití LSA sumarizátoru
-    summarizer = LsaSummarizer()
-    summary = summarizer(parser.document, sentence_count)
-    return " ".join(str(s) for s in summary)
+    sentences = split_sentences(text)
+    if len(sentences) <= sentence_count:
+        return " ".join(sentences)
+    scores = rank_sentences(sentences, claim)
+    # Stabilní řazení - při shodném skóre mají přednost dřívější věty
+    selected = sorted(np.argsort(-scores, kind="stable")[:sentence_count])
+    return " ".join(sentences[index] for index in selected)
 
 # Příklad použití
 '''if __name__ == "__main__":
@@ -5,15 +5,19 @@ import json
 import os
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Awaitable
 from pathlib import Path
 import random
 import uuid
 
 # Import komponentů SQLAlchemy pro asynchronní operace
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from .database import AsyncSessionLocal
+from .http_client_module import outbound_scheduler
+from .llm_gateway_module import response_cache_stats
+from .vyhledavani_googlem_module import search_cache
 from . import models
 
 # Konfigurace logování
@@ -23,6 +27,49 @@ logger = logging.getLogger('fake_news_telemetry')
 DB_PATH = Path("source")
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+# Počet pokusů o aktualizaci metrik, pokud souběžný požadavek založí stejný řádek dříve
+METRICS_UPDATE_ATTEMPTS = 3
+
+
+async def _update_metrics(apply: Callable[[AsyncSession], Awaitable[None]]) -> None:
+    """Provede aktualizaci metrik v nové session a potvrdí ji.
+
+    Řádky metrik se zakládají až při prvním použití. Když stejný řádek mezitím
+    založí souběžný požadavek, vložení skončí IntegrityError - aktualizace se
+    pak zopakuje v nové session, kde už se řádek najde.
+    """
+    for attempt in range(METRICS_UPDATE_ATTEMPTS):
+        try:
+            async with AsyncSessionLocal() as db:
+                await apply(db)
+                await db.commit()
+            return
+        except IntegrityError:
+            if attempt + 1 >= METRICS_UPDATE_ATTEMPTS:
+                raise
+            logger.debug("Řádek metrik založil souběžný požadavek, aktualizace se opakuje")
+
+
+async def _upsert_metrics_row(db: AsyncSession, model, key_column, key, values: Dict[Any, Any], defaults: Dict[str, Any]) -> None:
+    """Aktualizuje řádek metrik, případně ho založí s výchozími hodnotami.
+
+    Nové hodnoty jsou SQL výrazy nad stávajícími (např. count + 1), vyhodnotí je
+    databáze, takže se souběžné přírůstky navzájem nepřepíší.
+    """
+    result = await db.execute(update(model).where(key_column == key).values(values))
+    if result.rowcount == 0:
+        db.add(model(**{key_column.key: key}, **defaults))
+        await db.flush()
+
+
+async def _increment_error_metric(db: AsyncSession, error_key: str) -> None:
+    """Přičte výskyt chyby v tabulce ErrorMetrics (řádek případně založí)"""
+    await _upsert_metrics_row(
+        db, models.ErrorMetrics, models.ErrorMetrics.error_message, error_key,
+        {models.ErrorMetrics.count: func.coalesce(models.ErrorMetrics.count, 0) + 1}, {"count": 1},
+    )
+
+
 async def get_metrics():
     """Získání aktuálních telemetrických metrik z databáze
     
@@ -36,7 +83,10 @@ async def get_metrics():
         "average_processing_time": 0.0,
         "requests_by_hour": {},
         "error_counts": {},
-        "recent_requests": []
+        "recent_requests": [],
+        "outbound_hosts": get_outbound_metrics(),
+        "search_cache": search_cache.stats(),
+        "llm_cache": response_cache_stats()
     }
 
     try:
@@ -95,6 +145,15 @@ async def get_metrics():
     return metrics
 
 
+def get_outbound_metrics() -> Dict[str, Dict[str, Any]]:
+    """Vrátí statistiky odchozích požadavků podle hostitele
+    
+    Pro každého hostitele počet probíhajících a čekajících požadavků,
+    celkový počet požadavků a průměrnou i maximální dobu čekání ve frontě.
+    """
+    return outbound_scheduler.stats()
+
+
 async def log_request_start(prompt: str) -> Dict[str, Any]:
     """Zaprotokoluje začátek požadavku a vrátí metadata požadavku
     
@@ -110,33 +169,26 @@ async def log_request_start(prompt: str) -> Dict[str, Any]:
     logger.info(f"Request {request_id} started: prompt_length={len(prompt)}, prompt=\"{truncated_prompt}\"")
 
     # --- Pokus o aktualizaci agregovaných metrik ---
-    try:
-        async with AsyncSessionLocal() as db:
-            logger.info(f"Attempting to update start metrics in database for request_id: {request_id}")
-            # Zajištění existence hlavního záznamu metrik
-            result = await db.execute(select(models.Metrics).filter(models.Metrics.id == 1))
-            metrics_record = result.scalar_one_or_none()
-            
-            if not metrics_record:
-                metrics_record = models.Metrics(id=1, total_requests=0, successful_requests=0, failed_requests=0, average_processing_time=0.0)
-                db.add(metrics_record)
-                await db.flush() # Ensure it has an ID if new
-
-            # Přičtení k celkovému počtu požadavků
-            metrics_record.total_requests = (metrics_record.total_requests or 0) + 1
-
-            # Aktualizace hodinových metrik
-            hour_str = datetime.now().strftime("%Y-%m-%d-%H")
-            result_hourly = await db.execute(select(models.HourlyMetrics).filter(models.HourlyMetrics.hour == hour_str))
-            hourly_record = result_hourly.scalar_one_or_none()
-            
-            if hourly_record:
-                hourly_record.request_count = (hourly_record.request_count or 0) + 1
-            else:
-                db.add(models.HourlyMetrics(hour=hour_str, request_count=1))
+    async def update_start_metrics(db: AsyncSession) -> None:
+        logger.info(f"Attempting to update start metrics in database for request_id: {request_id}")
+        # Přičtení k celkovému počtu požadavků (hlavní záznam metrik se případně založí)
+        await _upsert_metrics_row(
+            db, models.Metrics, models.Metrics.id, 1,
+            {models.Metrics.total_requests: func.coalesce(models.Metrics.total_requests, 0) + 1},
+            {"total_requests": 1, "successful_requests": 0, "failed_requests": 0, "average_processing_time": 0.0},
+        )
+
+        # Aktualizace hodinových metrik
+        hour_str = datetime.now().strftime("%Y-%m-%d-%H")
+        await _upsert_metrics_row(
+            db, models.HourlyMetrics, models.HourlyMetrics.hour, hour_str,
+            {models.HourlyMetrics.request_count: func.coalesce(models.HourlyMetrics.request_count, 0) + 1},
+            {"request_count": 1},
+        )
 
-            await db.commit()
-            logger.info(f"Successfully updated start metrics in database for request_id: {request_id}")
+    try:
+        await _update_metrics(update_start_metrics)
+        logger.info(f"Successfully updated start metrics in database for request_id: {request_id}")
     except Exception as e:
         logger.error(f"Failed to update start metrics in database for request_id {request_id}: {e}", exc_info=True)
         # Nezvedáme výjimku dál, hlavní je vrátit request_context
@@ -224,64 +276,35 @@ async def log_request_end(request_context: Dict[str, Any], success: bool, result
 
     # Phase 2: Update aggregate metrics (only if main record was successfully saved and we have an ID)
     if record_id is not None:
-        try:
-            async with AsyncSessionLocal() as db: # New session for aggregate metrics
-                logger.info(f"Attempting to update aggregate metrics for TelemetryRecord id: {record_id}")
-                
-                # --- Aktualizace agregovaných metrik ---
-                db_result = await db.execute(select(models.Metrics).filter(models.Metrics.id == 1))
-                metrics_record = db_result.scalar_one_or_none()
-                
-                if not metrics_record:
-                    metrics_record = models.Metrics(id=1)
-                    db.add(metrics_record)
-                    # If metrics_record was just created, its total_requests might be 0.
-                    # The log_request_start should have incremented total_requests already.
-                    # We need to ensure consistency or rely on log_request_start for total_requests increment.
-                    # For now, let's assume log_request_start handles its part.
-                    await db.flush() # Ensure it exists before further updates if newly added
-
-                # Aktualizace počtu úspěšných/neúspěšných požadavků
-                if success:
-                    metrics_record.successful_requests = (metrics_record.successful_requests or 0) + 1
-                else:
-                    metrics_record.failed_requests = (metrics_record.failed_requests or 0) + 1
-
-                # Aktualizace průměrné doby zpracování
-                # total_req is based on the state from log_request_start.
-                # This logic might need re-evaluation if log_request_start fails or if this runs before log_request_start commits.
-                # However, log_request_start uses its own session and should commit before log_request_end is called.
-                total_req_from_metrics = metrics_record.total_requests or 0 # Get current total_requests
-                
-                if total_req_from_metrics > 0:
-                    current_avg_time = metrics_record.average_processing_time or 0.0
-                    if current_avg_time == 0.0 and total_req_from_metrics == 1: # First request contributing to average
-                        metrics_record.average_processing_time = total_duration
-                    else:
-                        # Ensure total_req_from_metrics is at least 1 to avoid division by zero if it was 0 and became 1.
-                        # This calculation assumes total_req_from_metrics reflects count *before* this request for avg calc, then add this one.
-                        # More robust: (current_sum_of_durations + new_duration) / new_total_requests
-                        # Simpler: ((old_avg * (N-1)) + new_value) / N
-                        # N here is total_req_from_metrics (which should include the current request from log_request_start)
-                        metrics_record.average_processing_time = ((current_avg_time * (total_req_from_metrics - 1)) + total_duration) / total_req_from_metrics \
-                                                                    if total_req_from_metrics > 1 else total_duration
-
-
-                if not success:
-                    error_message_str = result_data.get("message", "Unknown error")
-                    error_message_str = error_message_str[:255] if error_message_str else "Unknown error"
-
-                    db_error_result = await db.execute(select(models.ErrorMetrics).filter(models.ErrorMetrics.error_message == error_message_str))
-                    error_record = db_error_result.scalar_one_or_none()
-                    
-                    if error_record:
-                        error_record.count += 1
-                    else:
-                        db.add(models.ErrorMetrics(error_message=error_message_str, count=1))
-                # --- Konec aktualizace agregovaných metrik ---
+        async def update_end_metrics(db: AsyncSession) -> None:
+            logger.info(f"Attempting to update aggregate metrics for TelemetryRecord id: {record_id}")
+
+            # --- Aktualizace agregovaných metrik ---
+            # Průměrná doba zpracování se počítá přes dokončené požadavky:
+            # nový průměr = (průměr * dokončené + doba) / (dokončené + 1)
+            completed = func.coalesce(models.Metrics.successful_requests, 0) + func.coalesce(models.Metrics.failed_requests, 0)
+            values = {
+                models.Metrics.average_processing_time:
+                    (func.coalesce(models.Metrics.average_processing_time, 0.0) * completed + total_duration) / (completed + 1),
+            }
+            # Aktualizace počtu úspěšných/neúspěšných požadavků
+            counter = models.Metrics.successful_requests if success else models.Metrics.failed_requests
+            values[counter] = func.coalesce(counter, 0) + 1
+            await _upsert_metrics_row(
+                db, models.Metrics, models.Metrics.id, 1, values,
+                {"total_requests": 0, "successful_requests": int(success), "failed_requests": int(not success),
+                 "average_processing_time": total_duration},
+            )
 
-                await db.commit()
-                logger.info(f"Successfully updated aggregate metrics for TelemetryRecord id: {record_id}")
+            if not success:
+                error_message_str = result_data.get("message", "Unknown error")
+                error_message_str = error_message_str[:255] if error_message_str else "Unknown error"
+                await _increment_error_metric(db, error_message_str)
+            # --- Konec aktualizace agregovaných metrik ---
+
+        try:
+            await _update_metrics(update_end_metrics)
+            logger.info(f"Successfully updated aggregate metrics for TelemetryRecord id: {record_id}")
         except Exception as e:
             logger.error(f"Failed to update aggregate metrics for TelemetryRecord id {record_id}: {e}", exc_info=True)
             # Do not re-raise; main record is saved. This error means aggregate data might be less consistent.
@@ -317,23 +340,10 @@ async def log_error(request_context: Dict[str, Any], error: Exception, step: Opt
 
     # --- Aktualizace agregovaných metrik ---
     try:
-        async with AsyncSessionLocal() as db:
-            # Sledování typu chyby v tabulce ErrorMetrics
-            error_key = f"ProcessingError: {error_type}"
-            
-            result = await db.execute(select(models.ErrorMetrics).filter(models.ErrorMetrics.error_message == error_key))
-            error_record = result.scalar_one_or_none()
-            
-            if error_record:
-                error_record.count += 1
-            else:
-                db.add(models.ErrorMetrics(error_message=error_key, count=1))
-                
-            await db.commit()
-            
+        # Sledování typu chyby v tabulce ErrorMetrics
+        await _update_metrics(lambda db: _increment_error_metric(db, f"ProcessingError: {error_type}"))
     except Exception as e:
         logger.error(f"Failed to update error metrics in database: {e}")
-        await db.rollback()
     # --- Konec aktualizace agregovaných metrik ---
 
 
@@ -358,21 +368,8 @@ async def log_external_api_failure(request_context: Dict[str, Any], service_name
 
     # --- Aktualizace agregovaných metrik ---
     try:
-        async with AsyncSessionLocal() as db:
-            # Sledování typu API chyby v tabulce ErrorMetrics
-            error_key = f"{service_name}_api_error: {error_type}"
-            
-            result = await db.execute(select(models.ErrorMetrics).filter(models.ErrorMetrics.error_message == error_key))
-            error_record = result.scalar_one_or_none()
-            
-            if error_record:
-                error_record.count += 1
-            else:
-                db.add(models.ErrorMetrics(error_message=error_key, count=1))
-                
-            await db.commit()
-            
+        # Sledování typu API chyby v tabulce ErrorMetrics
+        await _update_metrics(lambda db: _increment_error_metric(db, f"{service_name}_api_error: {error_type}"))
     except Exception as e:
         logger.error(f"Failed to update API error metrics in database: {e}")
-        await db.rollback()
     # --- Konec aktualizace agregovaných metrik ---
\ No newline at end of file
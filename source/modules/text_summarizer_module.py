@@ -1,11 +1,30 @@
 """
 Modul pro sumarizaci textu pomocí LLM API (OpenRouter)
+
+summarize_articles() sumarizuje všechny články ověření souběžně (s omezením
+souběžnosti) a v časovém limitu etapy. Souhrny se cachují podle kanonické URL
+a normalizovaného tvrzení. Dlouhé články se před odesláním LLM lokálně zkrátí
+extraktivním sumarizátorem na věty nejvíce související s tvrzením. Články,
+jejichž souhrn nestihne doběhnout nebo selže, dostanou místo něj extraktivní
+souhrn spočítaný lokálně.
 """
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from openai import OpenAI
+from .cache_module import TTLCache
 from .config import config
+from .llm_gateway_module import OPENROUTER, chat_completion
+from .summarizer_module import get_summary
+from .utils import canonicalize_url, normalize_text
+
+# Nastavení loggeru
+logger = logging.getLogger(__name__)
+
+# Souhrny článků podle (URL, tvrzení) - extraktivní náhradní souhrny se neukládají
+summary_cache = TTLCache(ttl=config.SUMMARY_CACHE_TTL, max_entries=config.SUMMARY_CACHE_MAX_ENTRIES)
 
-def summarize_text(text: str, original_claim: str = "") -> str:
+async def summarize_text(text: str, original_claim: str = "") -> str:
     """
     Sumarizuje zadaný text pomocí LLM API.
     
@@ -20,17 +39,6 @@ def summarize_text(text: str, original_claim: str = "") -> str:
         Exception: Pokud dojde k chybě při komunikaci s API
     """
     
-    # Získání API klíče z konfigurace
-    api_key = config.OPENROUTER_API_KEY
-    if not api_key:
-        raise ValueError("OPENROUTER_API_KEY není nastavený v environment proměnných")
-    
-    # Nastavení klienta
-    client = OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=api_key,
-    )
-    
     # Příprava promptu
     prompt = f"""Jsi asistent pro fact-checking. Tvým úkolem je extrahovat nejdůležitější informace z následujícího článku. Soustřeď se POUZE na fakta a argumenty, které přímo souvisí s tvrzením: "{original_claim}".
 
@@ -45,13 +53,9 @@ def summarize_text(text: str, original_claim: str = "") -> str:
         """
     
     try:
-        # Volání API
-        completion = client.chat.completions.create(
-            extra_headers={
-                "HTTP-Referer": "https://bezfejku.cz",  # Site URL pro rankings
-                "X-Title": "Bezfejku.cz - fake news detection for Czech republic",  # Site title pro rankings
-            },
-            extra_body={},
+        # Volání API přes sdílenou LLM bránu (klient OpenRouter se vytváří jen jednou)
+        return await chat_completion(
+            OPENROUTER,
             model="google/gemma-3-27b-it",
             messages=[
                 {
@@ -62,15 +66,11 @@ def summarize_text(text: str, original_claim: str = "") -> str:
             max_tokens=500,  # Omezení délky odpovědi
             temperature=0.1  # Nízká temperature pro konzistentní výsledky
         )
-        
-        # Vrácení sumarizovaného textu
-        return completion.choices[0].message.content.strip()
-        
     except Exception as e:
         raise Exception(f"Chyba při sumarizaci textu: {str(e)}")
 
 
-def summarize_text_simple(text: str) -> str:
+async def summarize_text_simple(text: str) -> str:
     """
     Jednoduchá verze sumarizace bez specifikace původního tvrzení.
     
@@ -80,4 +80,68 @@ def summarize_text_simple(text: str) -> str:
     Returns:
         str: Sumarizovaný text
     """
-    return summarize_text(text, "obecné informace")
+    return await summarize_text(text, "obecné informace")
+
+
+def _summary_cache_key(url: str, claim: str) -> str:
+    return f"{canonicalize_url(url)}|{normalize_text(claim)}"
+
+
+async def summarize_articles(articles: Sequence[Dict[str, Any]], claim: str, timeout: float,
+                             max_concurrency: Optional[int] = None) -> Tuple[List[str], int]:
+    """
+    Souběžně sumarizuje články vzhledem k tvrzení.
+    
+    Args:
+        articles: Články s textem v "full_content" a URL v "link"
+        claim (str): Ověřované tvrzení
+        timeout (float): Časový limit celé etapy v sekundách
+        max_concurrency (int, optional): Max. počet souběžných volání LLM
+        
+    Returns:
+        tuple: (souhrny ve stejném pořadí jako články, počet extraktivních náhradních souhrnů)
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or config.SUMMARY_MAX_CONCURRENCY)
+    summaries: List[Optional[str]] = [None] * len(articles)
+
+    async def _summarize(article):
+        # Lokální předsumarizace - LLM dostane jen věty související s tvrzením
+        text = await asyncio.to_thread(get_summary, article["full_content"], config.SUMMARY_LLM_INPUT_SENTENCES, claim)
+        async with semaphore:
+            return await summarize_text(text, claim)
+
+    tasks = {}
+    for index, article in enumerate(articles):
+        cached = summary_cache.get(_summary_cache_key(article["link"], claim))
+        if cached is not None:
+            summaries[index] = cached
+        else:
+            tasks[asyncio.create_task(_summarize(article))] = index
+
+    if tasks:
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning(f"Sumarizace {len(pending)} článků nestihla limit {timeout:.1f}s")
+        for task in done:
+            index = tasks[task]
+            try:
+                summary = task.result()
+            except Exception as e:
+                logger.error(f"Sumarizace článku {articles[index]['link']} selhala: {e}")
+                continue
+            if summary:
+                summaries[index] = summary
+                summary_cache.set(_summary_cache_key(articles[index]["link"], claim), summary)
+
+    missing = [index for index, summary in enumerate(summaries) if summary is None]
+    if missing:
+        fallbacks = await asyncio.gather(*(
+            asyncio.to_thread(get_summary, articles[index]["full_content"], config.SUMMARY_FALLBACK_SENTENCES, claim)
+            for index in missing
+        ))
+        for index, fallback in zip(missing, fallbacks):
+            summaries[index] = fallback or articles[index]["full_content"]
+    return summaries, len(missing)
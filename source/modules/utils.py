@@ -1,5 +1,17 @@
 import random
+import re
 import string
+import unicodedata
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Parametry URL, které neovlivňují obsah stránky (měření kampaní apod.)
+TRACKING_QUERY_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid", "_ga", "ref", "rcm"}
+
+# Kratší slova (předložky, spojky) se při tokenizaci vynechávají
+MIN_TOKEN_LENGTH = 3
+# Slova se zkracují na tento počet znaků - hrubá náhrada stemmingu, díky které
+# se různé tvary českých slov (podvod, podvodu, podvodem) shodují
+STEM_LENGTH = 6
 
 def generate_registration_key(length=12):
     """
@@ -17,4 +29,69 @@ def generate_registration_key(length=12):
     # Vytvoření klíče rozdělením na skupiny po 4 znacích oddělené pomlčkami
     return '-'.join(
         ''.join(random.choices(charset, k=4)) for _ in range(length // 4)
-    )
\ No newline at end of file
+    )
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizuje text pro použití jako klíč cache.
+
+    Text je převeden na malá písmena (casefold), zbaven diakritiky
+    (NFKD rozklad a odstranění kombinujících znaků), vícenásobné mezery
+    jsou sloučeny a interpunkce na začátku a konci je odstraněna.
+    Texty lišící se jen velikostí písmen, mezerami nebo tím, zda je uživatel
+    psal s háčky a čárkami, tak dostanou stejný klíč.
+
+    Args:
+        text (str): Vstupní text
+
+    Returns:
+        str: Normalizovaný text
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    without_diacritics = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    collapsed = " ".join(without_diacritics.casefold().split())
+    return collapsed.strip(string.punctuation + " „“”\"'«»…")
+
+def canonicalize_url(url: str) -> str:
+    """
+    Převede URL na kanonický tvar pro použití jako klíč cache.
+
+    Schéma a hostitel jsou převedeny na malá písmena, odstraní se prefix www.,
+    výchozí port, fragment (#...), sledovací parametry (utm_*, fbclid, ...)
+    a koncové lomítko cesty. Zbylé parametry dotazu jsou seřazeny. Stejný
+    článek odkazovaný různými variantami URL tak dostane stejný klíč.
+
+    Args:
+        url (str): Vstupní URL
+
+    Returns:
+        str: Kanonická URL
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and not (scheme == "http" and parts.port == 80 or scheme == "https" and parts.port == 443):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_QUERY_PARAMS
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+def tokenize(text: str) -> list:
+    """
+    Rozdělí text na normalizovaná zkrácená slova pro fulltextové porovnávání.
+
+    Text se normalizuje (normalize_text), slova kratší než MIN_TOKEN_LENGTH
+    se vynechají a ostatní se zkrátí na STEM_LENGTH znaků.
+
+    Args:
+        text (str): Vstupní text
+
+    Returns:
+        list: Slova textu v původním pořadí
+    """
+    return [token[:STEM_LENGTH] for token in re.findall(r"\w+", normalize_text(text or "")) if len(token) >= MIN_TOKEN_LENGTH]
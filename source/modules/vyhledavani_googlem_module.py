@@ -1,5 +1,10 @@
-import requests
+import asyncio
+import httpx
 from source.modules.config import config
+from source.modules.http_client_module import get_http_client
+from source.modules.cache_module import TieredCache
+from source.modules.models import SearchCacheEntry
+from source.modules.utils import normalize_text
 import logging
 
 # Nastavení loggeru
@@ -12,9 +17,40 @@ logger = logging.getLogger(__name__)
 api_key = config.GOOGLE_API_KEY  # Použití API klíče z konfiguračního souboru
 search_engine_id = config.GOOGLE_SEARCH_ENGINE_ID  # Použití ID vyhledávače z konfiguračního souboru
 
-def google_search(query):
+# Cache výsledků vyhledávání - LLM pro stejné téma často vygeneruje stejný dotaz
+# a každé volání Custom Search API se platí a počítá do denní kvóty
+search_cache = TieredCache(
+    "search",
+    ttl=config.SEARCH_CACHE_TTL,
+    max_entries=config.SEARCH_CACHE_MAX_ENTRIES,
+    max_bytes=config.SEARCH_CACHE_MAX_BYTES,
+    model=SearchCacheEntry if config.SEARCH_CACHE_PERSISTENT else None,
+    persistent_max_entries=config.SEARCH_CACHE_PERSISTENT_MAX_ENTRIES,
+)
+
+
+# Jazykové a geografické omezení výsledků (součást klíče cache)
+SEARCH_LOCALE = {'lr': 'lang_cs', 'gl': 'cz'}
+
+
+def search_cache_key(query, params):
+    """Sestaví klíč cache z normalizovaného dotazu a parametrů ovlivňujících výsledky"""
+    return f"{params['lr']}|{params['gl']}|{normalize_text(query)}"
+
+
+async def cached_search_results(query):
+    """Vrátí výsledky dotazu z cache vyhledávání bez volání API, nebo None"""
+    if not config.SEARCH_CACHE_ENABLED:
+        return None
+    return await search_cache.get(search_cache_key(query, SEARCH_LOCALE))
+
+
+async def google_search(query):
     """
-    Provádí vyhledávání pomocí Google Custom Search API.
+    Asynchronně provádí vyhledávání pomocí Google Custom Search API.
+    
+    Neprázdné výsledky se ukládají do cache podle normalizovaného dotazu,
+    opakovaný dotaz na stejné téma se tak na Google vůbec neposílá.
     
     Args:
         query (str): Dotaz pro vyhledávání
@@ -31,14 +67,21 @@ def google_search(query):
         'cx': config.GOOGLE_SEARCH_ENGINE_ID,
         'q': query,
         'num': 10,  # Maximální počet výsledků
-        'lr': 'lang_cs',  # Omezení na české výsledky
-        'gl': 'cz',  # Geografické omezení na ČR
+        'lr': SEARCH_LOCALE['lr'],  # Omezení na české výsledky
+        'gl': SEARCH_LOCALE['gl'],  # Geografické omezení na ČR
         'safe': 'active'  # Bezpečné vyhledávání
     }
     
+    cache_key = search_cache_key(query, params)
+    if config.SEARCH_CACHE_ENABLED:
+        cached_results = await search_cache.get(cache_key)
+        if cached_results is not None:
+            logger.debug(f"Výsledky pro dotaz '{query}' nalezeny v cache")
+            return cached_results
+    
     try:
-        # Odeslání GET požadavku
-        response = requests.get(base_url, params=params, timeout=10)
+        # Odeslání GET požadavku přes sdílený HTTP klient (znovupoužití spojení)
+        response = await get_http_client().get(base_url, params=params, timeout=10)
         
         # Kontrola, zda byl požadavek úspěšný
         response.raise_for_status()
@@ -71,10 +114,12 @@ def google_search(query):
         if not simplified_results:
             logger.warning(f"Nenalezeny žádné výsledky pro dotaz: {query}")
             return None
-            
+        
+        if config.SEARCH_CACHE_ENABLED:
+            await search_cache.set(cache_key, simplified_results)
         return simplified_results
         
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Chyba při vyhledávání: {str(e)}")
         return None
     except Exception as e:
@@ -84,7 +129,7 @@ def google_search(query):
 # Ukázkové použití
 if __name__ == "__main__":
     query = "Anna K zpěvačka zemřela 2025"
-    results = google_search(query)
+    results = asyncio.run(google_search(query))
     
     if results:
         for item in results:
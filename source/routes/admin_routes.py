@@ -8,7 +8,7 @@ from source.modules.config import config
 from source.modules.utils import generate_registration_key
 from source.modules.auth import get_current_admin_user # Použití nové auth funkce
 from typing import Dict, List, Any, Optional # Přidán Optional
-from source.modules.telemetry_module import get_metrics
+from source.modules.telemetry_module import get_metrics, get_outbound_metrics
 from sqlalchemy import func, desc, update # Přidán update
 from datetime import datetime, timedelta
 
@@ -95,6 +95,15 @@ async def delete_registration_key(
     return {"detail": "Registration key deleted successfully."}
     return await get_metrics()  # Zajištění asynchronního volání telemetrie
 
+@router.get("/outbound-stats", dependencies=[Depends(get_current_admin_user)])
+async def get_outbound_statistics():
+    """
+    Vrátí statistiky odchozích požadavků na portály podle hostitele
+    (probíhající a čekající požadavky, průměrná doba čekání ve frontě).
+    Vyžaduje admin autentizaci.
+    """
+    return {"hosts": get_outbound_metrics()}
+
 @router.get("/rate-limit-stats", dependencies=[Depends(get_current_admin_user)]) # Použití nové dependency
 async def get_rate_limit_statistics(
     days: int = Query(7, ge=1, le=30, description="Počet dní historie"),
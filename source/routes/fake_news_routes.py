@@ -1,9 +1,14 @@
+import asyncio
+import contextlib
+import json
 import logging
 from fastapi import APIRouter, Query, Depends, Request
-from source.services.fake_news_service import process_fake_news
+from fastapi.responses import Response, StreamingResponse
+from source.services.fake_news_service import process_fake_news, process_fake_news_batch
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from source.modules.auth import get_current_active_user
+from source.modules.schemas import FakeNewsBatchRequest
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -15,9 +20,49 @@ limiter = Limiter(key_func=get_remote_address)
 def get_global_key(*args, **kwargs):
     return "global"
 
+def batch_claims(request: Request, batch: FakeNewsBatchRequest) -> FakeNewsBatchRequest:
+    """Zpřístupní počet tvrzení dávky pro rate limiting dávkového endpointu"""
+    request.state.claim_count = len(batch.claims)
+    return batch
+
+def batch_cost(request: Request) -> int:
+    """Dávka se do globálního limitu počítá po jednotlivých tvrzeních"""
+    return getattr(request.state, "claim_count", 1)
+
 # Vytvoření routeru pro endpointy spojené s detekcí fake news
 router = APIRouter()
 
+# Interval v sekundách, po kterém se kontroluje, zda je klient stále připojen
+DISCONNECT_POLL_INTERVAL = 0.5
+
+# Nestandardní stavový kód (nginx) pro požadavek uzavřený klientem
+CLIENT_CLOSED_REQUEST = 499
+
+async def run_until_disconnected(request: Request, coro):
+    """
+    Spustí zpracování požadavku a zruší ho, pokud se klient mezitím odpojí.
+
+    Zrušení se propaguje do všech rozpracovaných kroků (scraping, volání LLM),
+    takže se neplatí za odpověď, kterou už nikdo nepřečte.
+
+    Vrací:
+        Tuple (výsledek zpracování nebo None, True pokud se klient odpojil)
+    """
+    task = asyncio.create_task(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result(), False
+            if await request.is_disconnected():
+                logger.info("Klient se odpojil, zpracování požadavku se ruší")
+                break
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    return None, True
+
 @router.get("/fake_news_check/{prompt}")
 @limiter.limit("5/minute", error_message="Překročen limit 5 požadavků za minutu. Zkuste to znovu později.")
 @limiter.limit("20/minute", key_func=get_global_key, error_message="Aplikace je momentálně přetížena. Zkuste to znovu později.")
@@ -33,7 +78,9 @@ async def fake_news_check_path(request: Request, prompt: str, current_user: dict
     """
     try:
         try:
-            result = await process_fake_news(prompt)
+            result, disconnected = await run_until_disconnected(request, process_fake_news(prompt))
+            if disconnected:
+                return Response(status_code=CLIENT_CLOSED_REQUEST)
             return result
         except (ConnectionError, TimeoutError) as e:
             logger.error(f"Network error: {str(e)}")
@@ -77,7 +124,9 @@ async def check_fake_news(request: Request, prompt: str, current_user: dict = De
     """
     try:
         try:
-            result = await process_fake_news(prompt)
+            result, disconnected = await run_until_disconnected(request, process_fake_news(prompt))
+            if disconnected:
+                return Response(status_code=CLIENT_CLOSED_REQUEST)
             return result
         except (ConnectionError, TimeoutError) as e:
             logger.error(f"Network error: {str(e)}")
@@ -104,4 +153,104 @@ async def check_fake_news(request: Request, prompt: str, current_user: dict = De
             "error": "Internal Server Error",
             "message": "An unexpected error occurred while processing your request.",
             "details": str(e)
-        }, 500
\ No newline at end of file
+        }, 500
+
+
+def format_sse_event(event: str, data) -> str:
+    """Naformátuje událost do formátu Server-Sent Events"""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+@router.get("/fake_news_check_stream")
+@limiter.limit("5/minute", error_message="Překročen limit 5 požadavků za minutu. Zkuste to znovu později.")
+@limiter.limit("20/minute", key_func=get_global_key, error_message="Aplikace je momentálně přetížena. Zkuste to znovu později.")
+async def check_fake_news_stream(request: Request, prompt: str, current_user: dict = Depends(get_current_active_user)):
+    """
+    Endpoint pro kontrolu textu na fake news s průběžným streamováním výsledků (Server-Sent Events).
+    Vyžaduje přihlášeného uživatele.
+    
+    Parametry:
+    - prompt: Text, který má být analyzován na přítomnost fake news (jako query parametr ?prompt=...)
+    
+    Postupně posílá události:
+    - search_query: vygenerovaná vyhledávací fráze a klíčová slova
+    - search_results: nalezené výsledky vyhledávání
+    - article: každý stažený článek, jakmile je k dispozici
+    - result: finální výsledek ve stejném tvaru jako /fake_news_check
+    - error: neočekávaná chyba při zpracování
+
+    Po odpojení klienta se rozpracované ověření zruší.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def run_pipeline():
+        try:
+            result = await process_fake_news(prompt, on_progress=lambda event, data: queue.put_nowait((event, data)))
+            queue.put_nowait(("result", result))
+        except Exception as e:
+            logger.error(f"Unexpected error in stream: {str(e)}")
+            queue.put_nowait(("error", {
+                "error": "Internal Server Error",
+                "message": "An unexpected error occurred while processing your request.",
+                "details": str(e)
+            }))
+
+    async def event_stream():
+        pipeline_task = asyncio.create_task(run_pipeline())
+        try:
+            while True:
+                event, data = await queue.get()
+                yield format_sse_event(event, data)
+                if event in ("result", "error"):
+                    break
+        finally:
+            if not pipeline_task.done():
+                pipeline_task.cancel()
+                # Úklid zrušeného ověření (telemetrie, odhlášení z kanálu) doběhne před uzavřením odpovědi
+                with contextlib.suppress(asyncio.CancelledError):
+                    await pipeline_task
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/fake_news_check_batch")
+@limiter.limit("2/minute", error_message="Překročen limit 2 dávek za minutu. Zkuste to znovu později.")
+@limiter.limit("20/minute", key_func=get_global_key, cost=batch_cost, error_message="Aplikace je momentálně přetížena. Zkuste to znovu později.")
+async def check_fake_news_batch(request: Request, batch: FakeNewsBatchRequest = Depends(batch_claims), current_user: dict = Depends(get_current_active_user)):
+    """
+    Endpoint pro dávkové ověření více tvrzení v jednom požadavku.
+    Vyžaduje přihlášeného uživatele.
+
+    Parametry (JSON tělo):
+    - claims: Seznam tvrzení k ověření (nejvýše BATCH_MAX_CLAIMS)
+
+    Každé tvrzení se počítá do globálního limitu přetížení zvlášť,
+    jedna dávka tak nepropustí víc ověření než jednotlivé požadavky.
+
+    Vrací NDJSON - jeden řádek na tvrzení v pořadí dokončení ověření.
+    Každý řádek obsahuje index tvrzení v dávce, tvrzení a výsledek
+    ve stejném tvaru jako /fake_news_check. Po odpojení klienta se zbylá
+    ověření dávky zruší.
+    """
+    claims = batch.claims
+
+    async def ndjson_stream():
+        try:
+            async for index, result in process_fake_news_batch(claims):
+                yield json.dumps({"index": index, "prompt": claims[index], "result": result}, ensure_ascii=False, default=str) + "\n"
+        except Exception as e:
+            logger.error(f"Unexpected error in batch: {str(e)}")
+            yield json.dumps({
+                "error": "Internal Server Error",
+                "message": "An unexpected error occurred while processing your request.",
+                "details": str(e)
+            }, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(
+        ndjson_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
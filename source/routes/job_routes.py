@@ -0,0 +1,58 @@
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from source.modules.auth import get_current_active_user, ADMIN_ROLE
+from source.modules.schemas import VerificationJobCreate, VerificationJobOut
+from source.routes.fake_news_routes import limiter
+from source.services.job_service import job_manager, JobQueueFull
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Vytvoření routeru pro asynchronní úlohy ověření
+router = APIRouter()
+
+def _check_job_access(job: dict, current_user: dict) -> None:
+    """Úlohu smí zobrazit nebo zrušit jen její zadavatel nebo administrátor"""
+    if current_user.get("role") != ADMIN_ROLE and job.get("user_id") != current_user.get("user_id"):
+        raise HTTPException(status_code=404, detail="Úloha nebyla nalezena")
+
+@router.post("", response_model=VerificationJobOut, status_code=status.HTTP_202_ACCEPTED)
+@limiter.limit("10/minute", error_message="Překročen limit 10 úloh za minutu. Zkuste to znovu později.")
+async def create_job(request: Request, job: VerificationJobCreate, current_user: dict = Depends(get_current_active_user)):
+    """
+    Zařadí tvrzení k ověření do fronty a okamžitě vrátí ID úlohy.
+    Vyžaduje přihlášeného uživatele.
+
+    Stav a výsledek úlohy lze průběžně zjišťovat přes GET /jobs/{job_id}.
+    """
+    try:
+        return await job_manager.submit(job.prompt, user_id=current_user.get("user_id"))
+    except JobQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Fronta ověření je plná. Zkuste to znovu později."
+        )
+
+@router.get("/{job_id}", response_model=VerificationJobOut)
+async def get_job(job_id: str, current_user: dict = Depends(get_current_active_user)):
+    """
+    Vrátí stav úlohy, průběžné výsledky (vyhledávací fráze, výsledky hledání,
+    stažené články) a po dokončení i finální výsledek ověření.
+    """
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Úloha nebyla nalezena")
+    _check_job_access(job, current_user)
+    return job
+
+@router.delete("/{job_id}", response_model=VerificationJobOut)
+async def cancel_job(job_id: str, current_user: dict = Depends(get_current_active_user)):
+    """
+    Zruší čekající nebo právě zpracovávanou úlohu.
+    Dokončené úlohy zůstávají beze změny.
+    """
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Úloha nebyla nalezena")
+    _check_job_access(job, current_user)
+    return await job_manager.cancel(job_id)
@@ -4,16 +4,16 @@ import modules.api_call as oapi
 router = APIRouter()
 
 @router.get("/{prompt}")
-def read_item(prompt: str):
-    response = oapi.get_response(prompt)
+async def read_item(prompt: str):
+    response = await oapi.get_response(prompt)
     return {
         "response": response,
         "output_text": response.output_text
     }
 
 @router.get("")
-def read_item_query(prompt: str):
-    response = oapi.get_response(prompt)
+async def read_item_query(prompt: str):
+    response = await oapi.get_response(prompt)
     return {
         "response": response,
         "output_text": response.output_text
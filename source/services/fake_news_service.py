@@ -1,14 +1,39 @@
 from source.modules.generace_hledaci_vety_module import check_and_generate_search_phrase
-from source.modules.vyhledavani_googlem_module import google_search
+from source.modules.search_providers_module import fallback_search, search
 from source.modules.filtrace_clanku_module import filter_relevant_articles
 from source.modules.finalni_rozhodnuti_module import evaluate_claim
 from source.modules.telemetry_module import log_request_start, log_step_time, log_request_end, log_error, log_processing_data
-from source.modules.scraping_module import scrape_article, detect_portal
+from source.modules.scraping_module import scrape_articles
+from source.modules.cache_module import TieredCache
+from source.modules.config import config
+from source.modules.models import VerdictCacheEntry
+from source.modules.utils import normalize_text
+from source.modules.single_flight_module import SingleFlight, ProgressChannel, StageMemo
+from source.modules.deadline_module import Deadline, StageTimeout
+from source.modules.evidence_module import pack_evidence
+from source.modules.text_summarizer_module import summarize_articles
+import asyncio
 import logging # Add this import
 
 # Initialize logger for this module
 logger = logging.getLogger(__name__) # Add this line
 
+# Cache úspěšných výsledků ověření podle normalizovaného tvrzení
+verdict_cache = TieredCache(
+    "verdict",
+    ttl=config.VERDICT_CACHE_TTL,
+    max_entries=config.VERDICT_CACHE_MAX_ENTRIES,
+    max_bytes=config.VERDICT_CACHE_MAX_BYTES,
+    model=VerdictCacheEntry if config.VERDICT_CACHE_PERSISTENT else None,
+    persistent_max_entries=config.VERDICT_CACHE_PERSISTENT_MAX_ENTRIES,
+)
+
+# Souběžné požadavky na stejné tvrzení sdílí jeden běh ověření
+verification_flight = SingleFlight()
+
+# Kanály průběžných událostí běžících ověření podle klíče tvrzení (pro streamování)
+_progress_channels = {}
+
 """
 Servisní modul pro detekci fake news.
 
@@ -18,6 +43,10 @@ Tento modul poskytuje funkce pro:
   generování vyhledávací fráze, vyhledávání Googlem,
   filtrování relevantních článků, vyhodnocení tvrzení
   a záznam telemetry dat.
+
+Všechny kroky (volání LLM, HTTP požadavky i parsování HTML)
+běží neblokujícím způsobem, takže jeden worker zvládne
+obsluhovat více ověření současně.
 """
 
 def is_long_enough_words(text: str, min_words: int) -> bool:
@@ -48,28 +77,252 @@ def is_too_long_words(text: str, max_words: int) -> bool:
     words = text.strip().split()
     return len(words) > max_words
 
-async def process_fake_news(prompt: str):
+async def _verify_claim(prompt: str, claim_key: str, request_context: dict, emit=None, stage_memo=None, deadline=None):
+    """
+    Provede vlastní ověření tvrzení (kroky 3-8 z process_fake_news).
+
+    Průběh kroků se zaznamenává do request_context požadavku, který běh spustil.
+    Ukončení telemetrie je na volajícím, protože výsledek může sdílet více
+    souběžných požadavků. Funkce emit(událost, data) dostává průběžné výsledky
+    jednotlivých kroků (search_query, search_results, article). Předaný
+    stage_memo sdílí výsledky vyhledávání a stažené články s ostatními
+    tvrzeními stejné dávky.
+
+    Každá etapa má časový limit daný rozpočtem deadline. Při překročení limitu
+    se zpracování omezí místo selhání: bez vyhledávací fráze se hledá přímo
+    zadaný text, pomalé vyhledávání nahradí výsledky z cache nebo lokálního
+    indexu a bez stažených článků se vyhodnocuje z úryvků vyhledávání.
+
+    Vrací:
+        Tuple (úspěch, výsledek bez telemetry_id, request_id požadavku, který běh provedl).
+    """
+    if emit is None:
+        emit = lambda event, data: None
+    if deadline is None:
+        deadline = Deadline(config.PIPELINE_DEADLINE)
+    
+    # 3) Generování vyhledávací fráze a klíčových slov
+    try:
+        first_part = await deadline.run(
+            "search_phrase_generation", check_and_generate_search_phrase(prompt), config.STAGE_DEADLINE_SEARCH_PHRASE
+        )
+        search_query = first_part["search_query"]
+        valid = first_part["valid"]
+        keywords = first_part["keywords"]
+    except StageTimeout:
+        # Omezený režim: vyhledává se přímo zadaný text
+        deadline.degrade("search_phrase_generation")
+        search_query = prompt
+        valid = True
+        keywords = []
+    log_step_time(request_context, "search_phrase_generation")
+    
+    # Zaznamenej vyhledávací frázi, klíčová slova a validitu dotazu
+    log_processing_data(request_context, "search_query", search_query)
+    log_processing_data(request_context, "keywords", keywords)
+    log_processing_data(request_context, "is_valid_query", valid)
+    emit("search_query", {"search_query": search_query, "keywords": keywords, "valid": valid})
+    
+    if not valid:
+        result = {
+            "status": "error",
+            "message": "Zadaný text není validní pro ověření."
+        }
+        return False, result, request_context["request_id"]
+        
+    # 4) Vyhledávání u zvoleného poskytovatele (Google, lokální index nebo obojí)
+    try:
+        if stage_memo is not None:
+            search_call = stage_memo.run(f"search:{search_query}", lambda: search(search_query))
+        else:
+            search_call = search(search_query)
+        google_search_results = await deadline.run("google_search", search_call, config.STAGE_DEADLINE_SEARCH)
+    except StageTimeout:
+        # Omezený režim: výsledky z cache vyhledávání nebo z lokálního indexu článků
+        deadline.degrade("google_search")
+        google_search_results = await fallback_search([search_query, prompt])
+        if not google_search_results:
+            log_processing_data(request_context, "degraded_stages", deadline.degraded_stages)
+            result = {
+                "status": "error",
+                "message": "Vyhledávání nestihlo proběhnout v časovém limitu."
+            }
+            return False, result, request_context["request_id"]
+    log_step_time(request_context, "google_search")
+    
+    # Zaznamenání počtu výsledků hledání
+    log_processing_data(request_context, "search_results_count", len(google_search_results) if google_search_results else 0)
+    if google_search_results:
+        # Logování URL adres bez ukládání obsahu
+        search_urls = [item.get("link", "") for item in google_search_results]
+        log_processing_data(request_context, "search_result_urls", search_urls)
+        # Kopie - články se v kroku 6 doplňují o obsah, událost (a historie průběhu) má zůstat beze změny
+        emit("search_results", [dict(item) for item in google_search_results])
+    
+    if not google_search_results:
+        result = {
+            "status": "error",
+            "message": "Nenašli jsme žádné výsledky pro zadaný dotaz."
+        }
+        return False, result, request_context["request_id"]
+        
+    '''# 5) Filtrování relevantních článků podle klíčových slov
+    filtered_articles = filter_relevant_articles(google_search_results, keywords)
+    log_step_time(request_context, "article_filtering")
+    
+    # Záznam počtu filtrovaných článků
+    log_processing_data(request_context, "filtered_articles_count", len(filtered_articles) if filtered_articles else 0)
+    if filtered_articles:
+        # Logování názvů článků bez ukládání plného obsahu
+        filtered_titles = [article.get("title", "") for article in filtered_articles]
+        log_processing_data(request_context, "filtered_article_titles", filtered_titles)
+    
+    if not filtered_articles:
+        result = {
+            "status": "error",
+            "message": "Nenašli jsme žádné relevantní články pro ověření."
+        }
+        return False, result, request_context["request_id"]'''
+    
+    filtered_articles = google_search_results
+    
+    # 6) Souběžný scraping obsahu článků s časovým limitem etapy
+    article_links = [article["link"] for article in filtered_articles]
+    articles_by_link = {article["link"]: article for article in filtered_articles}
+    scraped_contents, scraping_errors = await scrape_articles(
+        article_links,
+        stage_deadline=deadline.budget(config.SCRAPE_STAGE_DEADLINE),
+        on_article=lambda url, content: emit("article", {**articles_by_link[url], **content}),
+        stage_memo=stage_memo,
+    )
+    
+    scraped_articles = []
+    for article in filtered_articles:
+        scraped_content = scraped_contents.get(article["link"])
+        if scraped_content:
+            article["full_content"] = scraped_content["content"]
+            article["source"] = scraped_content["source"]
+            article["published_date"] = scraped_content["published_date"]
+            article["author"] = scraped_content["author"]
+            scraped_articles.append(article)
+    
+    if scraping_errors:
+        log_processing_data(request_context, "scraping_errors", scraping_errors)
+    
+    if not scraped_articles:
+        # Omezený režim: vyhodnocení z úryvků a popisů z výsledků vyhledávání
+        for article in filtered_articles:
+            snippet = article.get("description") or article.get("snippet")
+            if snippet:
+                article["full_content"] = snippet
+                scraped_articles.append(article)
+        if scraped_articles:
+            deadline.degrade("article_scraping")
+    
+    log_step_time(request_context, "article_scraping")
+    
+    if not scraped_articles:
+        result = {
+            "status": "error",
+            "message": "Nepodařilo se získat obsah článků pro ověření.",
+            "filtered_articles": filtered_articles
+        }
+        return False, result, request_context["request_id"]
+    
+    # 7) Připrav obsah článků pro vyhodnocení tvrzení - souhrny, nebo pasáže související s tvrzením v rozpočtu tokenů
+    if config.SUMMARY_STAGE_ENABLED:
+        # Souběžná sumarizace článků LLM, při vypršení limitu extraktivní souhrny
+        summaries, fallback_count = await summarize_articles(
+            scraped_articles, prompt, timeout=deadline.budget(config.STAGE_DEADLINE_SUMMARY)
+        )
+        article_contents = [
+            f"[{article.get('source') or ''} | {article['link']}] {summary}"
+            for article, summary in zip(scraped_articles, summaries)
+        ]
+        log_processing_data(request_context, "summary_fallback_count", fallback_count)
+        if fallback_count:
+            deadline.degrade("article_summarization")
+        log_step_time(request_context, "article_summarization")
+    elif config.EVIDENCE_PACKING_ENABLED:
+        # Tokenizace desítek tisíc slov trvá desítky milisekund, proto mimo event loop
+        article_contents = await asyncio.to_thread(pack_evidence, prompt, keywords, scraped_articles)
+        log_processing_data(request_context, "evidence_passages_count", len(article_contents))
+        log_step_time(request_context, "evidence_packing")
+    else:
+        article_contents = [article["full_content"] for article in scraped_articles]
+    
+    # 8) Vyhodnocení tvrzení
+    try:
+        rozhodnuti = await deadline.run(
+            "claim_evaluation", evaluate_claim(prompt, article_contents), config.STAGE_DEADLINE_EVALUATION
+        )
+    except StageTimeout:
+        log_processing_data(request_context, "degraded_stages", deadline.degraded_stages + ["claim_evaluation"])
+        result = {
+            "status": "error",
+            "message": "Vyhodnocení tvrzení nestihlo proběhnout v časovém limitu.",
+            "filtered_articles": scraped_articles
+        }
+        return False, result, request_context["request_id"]
+    log_step_time(request_context, "claim_evaluation")
+    
+    # Zaznamenání výsledku vyhodnocení
+    log_processing_data(request_context, "evaluation_result", rozhodnuti)
+    
+    if deadline.degraded_stages:
+        log_processing_data(request_context, "degraded_stages", deadline.degraded_stages)
+    
+    if rozhodnuti:
+        result = {
+            "status": "success",
+            "message": "Ověření bylo úspěšné.",
+            "result": rozhodnuti,
+            "filtered_articles": scraped_articles
+        }
+        if deadline.degraded_stages:
+            # Výsledek z omezeného běhu se necachuje, příští dotaz může dopadnout lépe
+            result["degraded_stages"] = deadline.degraded_stages
+        elif config.VERDICT_CACHE_ENABLED:
+            await verdict_cache.set(claim_key, result)
+        return True, result, request_context["request_id"]
+    
+    # Chyba při vyhodnocování tvrzení
+    result = {
+        "status": "error",
+        "message": "Chyba při ověřování tvrzení.",
+        "filtered_articles": scraped_articles
+    }
+    return False, result, request_context["request_id"]
+
+async def process_fake_news(prompt: str, on_progress=None, stage_memo=None):
     """
     Asynchronně zpracuje detekci fake news pro zadaný text.
 
     Kroky:
-    1. Spuštění telemetry měření.
+    1. Spuštění telemetry měření a celkového časového rozpočtu (etapy, které
+       překročí svůj limit, pokračují v omezeném režimu - viz degraded_stages).
     2. Validace délky textu (min. 4 slova, max. 200 slov).
+       Pokud je stejné tvrzení v cache výsledků, vrátí se uložený výsledek.
+       Pokud se stejné tvrzení právě ověřuje, požadavek počká na jeho výsledek.
     3. Generování vyhledávací fráze a klíčových slov.
     4. Vyhledávání Googlem.
     5. Filtrování relevantních článků.
-    6. Scraping obsahu článků.
+    6. Souběžný scraping obsahu článků.
     7. Vyhodnocení tvrzení na základě plného obsahu článků.
     8. Zaznamenání výsledků a ukončení telemetry.
 
     Parametry:
         prompt: Text k ověření.
+        on_progress: Volitelná funkce volaná s (událost, data) po dokončení
+            jednotlivých kroků - používá ji streamovací endpoint.
+        stage_memo: Volitelné sdílení výsledků etap mezi tvrzeními jedné dávky.
 
     Vrací:
         Dict se stavem, zprávou, ID záznamu telemetrie a případně výsledkem nebo filtrovnými články.
     """
-    # 1) Start telemetry měření
+    # 1) Start telemetry měření a celkového časového rozpočtu
     request_context = await log_request_start(prompt)
+    deadline = Deadline(config.PIPELINE_DEADLINE)
     
     try:
         # 2a) Kontrola, zda je text dostatečně dlouhý
@@ -94,133 +347,60 @@ async def process_fake_news(prompt: str):
             await log_request_end(request_context, False, result) # Added call
             return result
         
-        # 3) Generování vyhledávací fráze a klíčových slov
-        first_part = check_and_generate_search_phrase(prompt)
-        log_step_time(request_context, "search_phrase_generation")
+        # 2c) Vyhledání dříve ověřeného tvrzení v cache výsledků
+        claim_key = normalize_text(prompt)
+        if config.VERDICT_CACHE_ENABLED:
+            cached_result = await verdict_cache.get(claim_key)
+            log_step_time(request_context, "verdict_cache_lookup")
+            log_processing_data(request_context, "cache_hit", cached_result is not None)
+            if cached_result is not None:
+                result = cached_result
+                result["cached"] = True
+                logger.info(f"Calling log_request_end (verdict cache hit) for request_id: {request_context['request_id']}")
+                await log_request_end(request_context, True, result)
+                result["telemetry_id"] = request_context["request_id"]
+                return result
         
-        search_query = first_part["search_query"]
-        valid = first_part["valid"]
-        keywords = first_part["keywords"]
-        
-        # Zaznamenej vyhledávací frázi, klíčová slova a validitu dotazu
-        log_processing_data(request_context, "search_query", search_query)
-        log_processing_data(request_context, "keywords", keywords)
-        log_processing_data(request_context, "is_valid_query", valid)
-        
-        if not valid:
-            result = {
-                "status": "error",
-                "message": "Zadaný text není validní pro ověření."
-            }
-            result["telemetry_id"] = request_context["request_id"] 
-            logger.info(f"Calling log_request_end (prompt not valid) for request_id: {request_context['request_id']}")
-            await log_request_end(request_context, False, result) # Added call
-            return result
-            
-        # 4) Vyhledávání pomocí Google API
-        google_search_results = google_search(search_query)
-        log_step_time(request_context, "google_search")
-        
-        # Zaznamenání počtu výsledků hledání
-        log_processing_data(request_context, "search_results_count", len(google_search_results) if google_search_results else 0)
-        if google_search_results:
-            # Logování URL adres bez ukládání obsahu
-            search_urls = [item.get("link", "") for item in google_search_results]
-            log_processing_data(request_context, "search_result_urls", search_urls)
-        
-        if not google_search_results:
-            result = {
-                "status": "error",
-                "message": "Nenašli jsme žádné výsledky pro zadaný dotaz."
-            }
-            result["telemetry_id"] = request_context["request_id"] 
-            logger.info(f"Calling log_request_end (no google results) for request_id: {request_context['request_id']}")
-            await log_request_end(request_context, False, result) # Added call
-            return result
-            
-        '''# 5) Filtrování relevantních článků podle klíčových slov
-        filtered_articles = filter_relevant_articles(google_search_results, keywords)
-        log_step_time(request_context, "article_filtering")
-        
-        # Záznam počtu filtrovaných článků
-        log_processing_data(request_context, "filtered_articles_count", len(filtered_articles) if filtered_articles else 0)
-        if filtered_articles:
-            # Logování názvů článků bez ukládání plného obsahu
-            filtered_titles = [article.get("title", "") for article in filtered_articles]
-            log_processing_data(request_context, "filtered_article_titles", filtered_titles)
-        
-        if not filtered_articles:
+        # 3-8) Ověření tvrzení - souběžné identické požadavky sdílí jeden běh i jeho průběžné události
+        channel = _progress_channels.get(claim_key)
+        if channel is None or not verification_flight.in_flight(claim_key):
+            channel = ProgressChannel()
+            _progress_channels[claim_key] = channel
+        if on_progress is not None:
+            channel.subscribe(on_progress)
+        try:
+            (success, shared_result, leader_request_id), coalesced = await verification_flight.do(
+                claim_key, lambda: _verify_claim(prompt, claim_key, request_context, channel.emit, stage_memo, deadline)
+            )
+        finally:
+            if on_progress is not None:
+                channel.unsubscribe(on_progress)
+            if not verification_flight.in_flight(claim_key) and _progress_channels.get(claim_key) is channel:
+                del _progress_channels[claim_key]
+        # Každý požadavek dostane vlastní kopii výsledku s vlastním telemetry_id
+        result = dict(shared_result)
+        if coalesced:
+            log_step_time(request_context, "coalesced_wait")
+            log_processing_data(request_context, "coalesced_with", leader_request_id)
+        logger.info(f"Calling log_request_end (success={success}, coalesced={coalesced}) for request_id: {request_context['request_id']}")
+        await log_request_end(request_context, success, result)
+        result["telemetry_id"] = request_context["request_id"]
+        return result
+
+    except asyncio.CancelledError:
+        # Požadavek zrušen (např. klient se odpojil) - zrušení se propaguje dál
+        logger.info(f"Request {request_context.get('request_id', 'UNKNOWN')} was cancelled")
+        if "request_id" in request_context:
+            log_processing_data(request_context, "cancelled", True)
             result = {
-                "status": "error",
-                "message": "Nenašli jsme žádné relevantní články pro ověření."
+                "status": "cancelled",
+                "message": "Požadavek byl zrušen před dokončením ověření."
             }
-            await log_request_end(request_context, False, result)
-            return result'''
-        
-        filtered_articles = google_search_results
-        
-        # 6) Scraping obsahu článků
-        scraped_articles = []
-        for article in filtered_articles:
             try:
-                portal = detect_portal(article["link"])
-                if portal != "unknown":
-                    scraped_content = scrape_article(article["link"], portal)
-                    if scraped_content and scraped_content.get("content"):
-                        article["full_content"] = scraped_content["content"]
-                        article["source"] = scraped_content["source"]
-                        article["published_date"] = scraped_content["published_date"]
-                        article["author"] = scraped_content["author"]
-                        scraped_articles.append(article)
+                await log_request_end(request_context, False, result)
             except Exception as e:
-                log_processing_data(request_context, "scraping_error", f"Error scraping {article['link']}: {str(e)}")
-                continue
-        
-        log_step_time(request_context, "article_scraping")
-        
-        if not scraped_articles:
-            result = {
-                "status": "error",
-                "message": "Nepodařilo se získat obsah článků pro ověření.",
-                "filtered_articles": filtered_articles
-            }
-            result["telemetry_id"] = request_context["request_id"] 
-            logger.info(f"Calling log_request_end (no scraped articles) for request_id: {request_context['request_id']}")
-            await log_request_end(request_context, False, result) # Added call
-            return result
-        
-        # 7) Připrav obsah článků pro vyhodnocení tvrzení
-        article_contents = [article["full_content"] for article in scraped_articles]
-        
-        # 8) Vyhodnocení tvrzení
-        rozhodnuti = evaluate_claim(prompt, article_contents)
-        log_step_time(request_context, "claim_evaluation")
-        
-        # Zaznamenání výsledku vyhodnocení
-        log_processing_data(request_context, "evaluation_result", rozhodnuti)
-        
-        if rozhodnuti:
-            result = {
-                "status": "success",
-                "message": "Ověření bylo úspěšné.",
-                "result": rozhodnuti,
-                "filtered_articles": scraped_articles
-            }
-            logger.info(f"Calling log_request_end from 'if rozhodnuti:' block for request_id: {request_context['request_id']}")
-            telemetry_id = await log_request_end(request_context, True, result)
-            result["telemetry_id"] = request_context["request_id"] 
-            return result
-        
-        # Chyba při vyhodnocování tvrzení
-        result = {
-            "status": "error",
-            "message": "Chyba při ověřování tvrzení.",
-            "filtered_articles": scraped_articles
-        }
-        logger.info(f"Calling log_request_end from 'else (rozhodnuti failed):' block for request_id: {request_context['request_id']}")
-        telemetry_id = await log_request_end(request_context, False, result)
-        result["telemetry_id"] = request_context["request_id"] 
-        return result
+                logger.error(f"Failed to record cancelled request: {str(e)}")
+        raise
 
     except Exception as e:
         # 9) Záznam neočekávaných chyb
@@ -241,4 +421,40 @@ async def process_fake_news(prompt: str):
             # This case should ideally not happen if log_request_start succeeded.
             logger.error("request_id missing in request_context during exception handling. Cannot call log_request_end.")
             # result already contains error message. We might not be able to add telemetry_id.
-        return result
\ No newline at end of file
+        return result
+
+async def process_fake_news_batch(prompts, max_concurrency=None):
+    """
+    Ověří dávku tvrzení a průběžně vrací výsledky v pořadí jejich dokončení.
+
+    Tvrzení se ověřují souběžně (nejvýše max_concurrency najednou) a každé
+    prochází stejným zpracováním jako v process_fake_news včetně cache výsledků
+    a slučování stejných tvrzení. Výsledky vyhledávání a stažené články se
+    sdílí v rámci celé dávky, takže se společné dotazy a URL stahují jen jednou.
+
+    Parametry:
+        prompts: Seznam textů k ověření.
+        max_concurrency: Max. počet souběžně ověřovaných tvrzení.
+
+    Vrací:
+        Asynchronní generátor dvojic (index tvrzení v dávce, výsledek).
+    """
+    max_concurrency = max_concurrency or config.BATCH_MAX_CONCURRENCY
+    semaphore = asyncio.Semaphore(max_concurrency)
+    stage_memo = StageMemo()
+
+    async def _process_one(index, prompt):
+        async with semaphore:
+            return index, await process_fake_news(prompt, stage_memo=stage_memo)
+
+    tasks = [asyncio.create_task(_process_one(index, prompt)) for index, prompt in enumerate(prompts)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Přerušená dávka (např. odpojený klient) nesmí nechat běžet zbylá ověření
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await stage_memo.close()
+        logger.info(f"Dávka {len(prompts)} tvrzení dokončena, sdílené etapy: {stage_memo.stats()}")
@@ -0,0 +1,308 @@
+"""
+Servisní modul pro asynchronní úlohy ověření tvrzení.
+
+Požadavek na ověření se uloží jako úloha do databáze a zařadí do fronty.
+Omezený počet workerů běžících v rámci aplikace frontu postupně zpracovává
+pomocí process_fake_news, takže souběh drahých volání externích API je
+řízen na jednom místě. Stav, průběžné i finální výsledky úloh se ukládají
+do databáze a přežijí restart aplikace - nedokončené úlohy se po startu
+znovu zařadí do fronty (ty, které se do ní nevejdou, se doplní, jakmile
+se ve frontě uvolní místo). Průběh úlohy se ukládá na pozadí a souběžné
+změny průběhu se slučují do jednoho zápisu.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import update
+from sqlalchemy.future import select
+
+from source.modules.config import config
+from source.modules.database import AsyncSessionLocal
+from source.modules.models import VerificationJob
+from source.services.fake_news_service import process_fake_news
+
+# Nastavení loggeru
+logger = logging.getLogger(__name__)
+
+# Stavy úlohy
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """Fronta úloh je plná, nová úloha nemůže být přijata"""
+
+
+def job_to_dict(job: VerificationJob) -> Dict[str, Any]:
+    """Převede záznam úlohy na slovník pro odpověď API"""
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "prompt": job.prompt,
+        "progress": json.loads(job.progress) if job.progress else {},
+        "result": json.loads(job.result) if job.result else None,
+        "error_message": job.error_message,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+class JobManager:
+    """Fronta úloh ověření a pool workerů, které ji zpracovávají"""
+
+    def __init__(self, workers: int, max_queue_size: int):
+        self.worker_count = workers
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._workers = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._finished: Dict[str, asyncio.Event] = {}
+        self._progress: Dict[str, Dict[str, Any]] = {}
+        self._cancel_requested = set()
+        # Obnovené úlohy, které se po startu nevešly do fronty
+        self._overflow: deque = deque()
+        # Místa ve frontě rezervovaná pro úlohy, které se právě ukládají do databáze
+        self._reserved = 0
+        # Ukládání průběhu: běžící zapisovač pro každou úlohu a úlohy s neuloženou změnou
+        self._progress_savers: Dict[str, asyncio.Task] = {}
+        self._progress_dirty = set()
+
+    async def start(self) -> None:
+        """Obnoví nedokončené úlohy z databáze a spustí workery"""
+        try:
+            async with AsyncSessionLocal() as db:
+                # Úlohy přerušené restartem se vrací do fronty
+                await db.execute(
+                    update(VerificationJob)
+                    .where(VerificationJob.status == JOB_RUNNING)
+                    .values(status=JOB_QUEUED, started_at=None)
+                )
+                await db.commit()
+                result = await db.execute(
+                    select(VerificationJob.id)
+                    .where(VerificationJob.status == JOB_QUEUED)
+                    .order_by(VerificationJob.created_at)
+                )
+                pending_ids = result.scalars().all()
+        except Exception as e:
+            logger.error(f"Nepodařilo se obnovit nedokončené úlohy: {e}", exc_info=True)
+            pending_ids = []
+
+        self._overflow.extend(pending_ids)
+        self._refill_queue()
+        if self._overflow:
+            logger.warning(f"Fronta je plná, {len(self._overflow)} úloh se do ní zařadí po uvolnění místa")
+
+        self._workers = [asyncio.create_task(self._worker(n)) for n in range(self.worker_count)]
+        logger.info(f"Spuštěno {self.worker_count} workerů úloh, obnoveno {len(pending_ids)} úloh")
+
+    async def stop(self) -> None:
+        """Zastaví workery; rozpracované úlohy zůstanou ve stavu queued"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        await asyncio.gather(*self._progress_savers.values(), return_exceptions=True)
+
+    async def submit(self, prompt: str, user_id: Optional[int] = None) -> Dict[str, Any]:
+        """Uloží novou úlohu a zařadí ji do fronty"""
+        # Místo ve frontě se rezervuje ještě před zápisem do databáze - během
+        # zápisu ho jinak může obsadit jiný požadavek nebo obnovená úloha
+        if not self._has_free_slot():
+            raise JobQueueFull()
+        self._reserved += 1
+        try:
+            job = VerificationJob(id=str(uuid.uuid4()), prompt=prompt, user_id=user_id, status=JOB_QUEUED)
+            async with AsyncSessionLocal() as db:
+                db.add(job)
+                await db.commit()
+                await db.refresh(job)
+        finally:
+            self._reserved -= 1
+
+        self._queue.put_nowait(job.id)
+        logger.info(f"Úloha {job.id} zařazena do fronty (délka fronty: {self._queue.qsize()})")
+        return job_to_dict(job)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Vrátí stav úlohy včetně průběžných výsledků"""
+        async with AsyncSessionLocal() as db:
+            job = await db.get(VerificationJob, job_id)
+            if job is None:
+                return None
+            job_data = job_to_dict(job)
+            job_data["user_id"] = job.user_id
+
+        # Běžící úloha má nejčerstvější průběh v paměti
+        if job_id in self._progress:
+            job_data["progress"] = self._progress[job_id]
+        if job_data["status"] == JOB_QUEUED:
+            job_data["queue_length"] = self._queue.qsize() + len(self._overflow)
+        return job_data
+
+    async def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Zruší čekající nebo běžící úlohu"""
+        async with AsyncSessionLocal() as db:
+            job = await db.get(VerificationJob, job_id)
+            if job is None:
+                return None
+            if job.status == JOB_QUEUED:
+                # Worker úlohu po vyzvednutí z fronty přeskočí
+                job.status = JOB_CANCELLED
+                job.finished_at = datetime.utcnow()
+                await db.commit()
+
+        task = self._running.get(job_id)
+        finished = self._finished.get(job_id)
+        if task is not None and not task.done():
+            self._cancel_requested.add(job_id)
+            task.cancel()
+            # Počká, než worker uloží stav cancelled
+            try:
+                await asyncio.wait_for(finished.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                logger.warning(f"Úloha {job_id} se nezastavila do 5 s od zrušení")
+
+        return await self.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Vrátí aktuální vytížení fronty a workerů"""
+        return {
+            "workers": self.worker_count,
+            "queued": self._queue.qsize() + len(self._overflow),
+            "running": len(self._running),
+        }
+
+    def _has_free_slot(self) -> bool:
+        """Vrátí True, pokud je ve frontě místo, které nikdo nemá rezervované"""
+        return self._queue.maxsize <= 0 or self._queue.qsize() + self._reserved < self._queue.maxsize
+
+    def _refill_queue(self) -> None:
+        """Přesune do fronty čekající obnovené úlohy, dokud je ve frontě místo"""
+        while self._overflow and self._has_free_slot():
+            self._queue.put_nowait(self._overflow.popleft())
+
+    async def _worker(self, worker_number: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            # Uvolněné místo hned obsadí obnovená úloha, nové úlohy ji nepředběhnou
+            self._refill_queue()
+            try:
+                await self._run_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Worker {worker_number} selhal při zpracování úlohy {job_id}: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: str) -> None:
+        async with AsyncSessionLocal() as db:
+            job = await db.get(VerificationJob, job_id)
+            if job is None or job.status != JOB_QUEUED:
+                return
+            job.status = JOB_RUNNING
+            job.started_at = datetime.utcnow()
+            prompt = job.prompt
+            await db.commit()
+
+        self._progress[job_id] = {}
+        task = asyncio.create_task(
+            process_fake_news(prompt, on_progress=lambda event, data: self._record_progress(job_id, event, data))
+        )
+        self._running[job_id] = task
+        self._finished[job_id] = asyncio.Event()
+        try:
+            result = await task
+            await self._finish(job_id, JOB_COMPLETED, result=result)
+        except asyncio.CancelledError:
+            if job_id in self._cancel_requested:
+                await self._finish(job_id, JOB_CANCELLED)
+            else:
+                # Vypínání aplikace - úloha se po dalším startu zpracuje znovu
+                task.cancel()
+                await self._finish(job_id, JOB_QUEUED)
+                raise
+        except Exception as e:
+            logger.error(f"Úloha {job_id} selhala: {e}", exc_info=True)
+            await self._finish(job_id, JOB_FAILED, error_message=str(e))
+        finally:
+            self._running.pop(job_id, None)
+            self._cancel_requested.discard(job_id)
+            self._finished.pop(job_id).set()
+
+    def _record_progress(self, job_id: str, event: str, data: Any) -> None:
+        progress = self._progress.setdefault(job_id, {})
+        if event == "article":
+            progress.setdefault("articles", []).append(data)
+        else:
+            progress[event] = data
+        self._progress_dirty.add(job_id)
+        saver = self._progress_savers.get(job_id)
+        if saver is None or saver.done():
+            # Na pozadí běží pro úlohu nejvýše jeden zapisovač, změny mezitím se uloží jedním zápisem.
+            # Odkaz na task drží slovník, dokud task neskončí (event loop drží tasky jen slabě).
+            saver = asyncio.create_task(self._progress_saver(job_id))
+            self._progress_savers[job_id] = saver
+            saver.add_done_callback(lambda task: self._forget_saver(job_id, task))
+
+    def _forget_saver(self, job_id: str, task: asyncio.Task) -> None:
+        if self._progress_savers.get(job_id) is task:
+            del self._progress_savers[job_id]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Ukládání průběhu úlohy {job_id} selhalo: {task.exception()}")
+
+    async def _progress_saver(self, job_id: str) -> None:
+        while job_id in self._progress_dirty:
+            self._progress_dirty.discard(job_id)
+            await self._save_progress(job_id)
+
+    async def _save_progress(self, job_id: str) -> None:
+        progress = self._progress.get(job_id)
+        if progress is None:
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(VerificationJob)
+                    .where(VerificationJob.id == job_id, VerificationJob.status == JOB_RUNNING)
+                    .values(progress=json.dumps(progress, ensure_ascii=False, default=str))
+                )
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Nepodařilo se uložit průběh úlohy {job_id}: {e}")
+
+    async def _finish(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None,
+                      error_message: Optional[str] = None) -> None:
+        progress = self._progress.pop(job_id, None)
+        self._progress_dirty.discard(job_id)
+        values = {
+            "status": status,
+            "finished_at": datetime.utcnow() if status in FINISHED_STATES else None,
+            "error_message": error_message,
+        }
+        if progress is not None:
+            values["progress"] = json.dumps(progress, ensure_ascii=False, default=str)
+        if result is not None:
+            values["result"] = json.dumps(result, ensure_ascii=False, default=str)
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(update(VerificationJob).where(VerificationJob.id == job_id).values(**values))
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Nepodařilo se uložit stav {status} úlohy {job_id}: {e}", exc_info=True)
+        logger.info(f"Úloha {job_id} skončila ve stavu {status}")
+
+
+# Sdílená instance pro celou aplikaci (spouští se při startu aplikace)
+job_manager = JobManager(workers=config.JOB_WORKERS, max_queue_size=config.JOB_QUEUE_MAX_SIZE)
@@ -2,12 +2,14 @@
 Test soubor pro text_summarizer_module
 """
 
+import asyncio
 import sys
 import os
 
 # Přidání parent directory do sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from source.modules.llm_gateway_module import close_llm_clients
 from source.modules.text_summarizer_module import summarize_text, summarize_text_simple
 
 def test_summarizer():
@@ -25,18 +27,24 @@ def test_summarizer():
     
     original_claim = "klimatické změny jsou největší hrozbou pro lidstvo"
     
+    async def main():
+        # Oba testy běží v jedné smyčce - sdílení klienti LLM jsou na ni vázaní
+        try:
+            # Test s původním tvrzením
+            result1 = await summarize_text(test_text, original_claim)
+            print("Sumarizace s původním tvrzením:")
+            print(result1)
+            print("\n" + "="*50 + "\n")
+            
+            # Test bez původního tvrzení
+            result2 = await summarize_text_simple(test_text)
+            print("Jednoduchá sumarizace:")
+            print(result2)
+        finally:
+            await close_llm_clients()
+    
     try:
-        # Test s původním tvrzením
-        result1 = summarize_text(test_text, original_claim)
-        print("Sumarizace s původním tvrzením:")
-        print(result1)
-        print("\n" + "="*50 + "\n")
-        
-        # Test bez původního tvrzení
-        result2 = summarize_text_simple(test_text)
-        print("Jednoduchá sumarizace:")
-        print(result2)
-        
+        asyncio.run(main())
     except Exception as e:
         print(f"Chyba při testování: {e}")
 
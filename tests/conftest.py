@@ -0,0 +1,38 @@
+"""
+Společné nastavení pro unit testy modulů v source/modules.
+
+Testy nepotřebují databázový server ani API klíče, konfigurace však při
+importu vyžaduje připojení k databázi - nastaví se proto dočasná SQLite,
+pokud prostředí žádné připojení neurčuje.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Přidání kořene repozitáře do sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Soubor, ne :memory: - paměťová SQLite sdílí jediné spojení mezi všemi sessions
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+
+
+@pytest.fixture
+def anyio_backend():
+    """Asynchronní testy (pytest.mark.anyio) běží nad asyncio"""
+    return "asyncio"
+
+
+@pytest.fixture
+async def database(anyio_backend):
+    """Prázdné tabulky v dočasné SQLite po dobu jednoho testu"""
+    from source.modules.database import Base, engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    # Spojení jsou vázaná na smyčku událostí testu
+    await engine.dispose()
@@ -0,0 +1,114 @@
+"""
+Testy pro cache_module
+"""
+import pytest
+
+from source.modules import cache_module
+from source.modules.cache_module import TieredCache, TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Ručně posouvaný čas pro testy expirace"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_returns_copy():
+    cache = TTLCache(ttl=60, max_entries=10)
+    cache.set("klic", {"seznam": [1, 2]})
+
+    value = cache.get("klic")
+    value["seznam"].append(3)
+
+    assert cache.get("klic") == {"seznam": [1, 2]}
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = TTLCache(ttl=10, max_entries=10)
+    cache.set("klic", "hodnota")
+
+    clock[0] += 9
+    assert cache.get("klic") == "hodnota"
+    clock[0] += 1
+    assert cache.get("klic") is None
+    assert len(cache) == 0
+    assert cache.stats()["bytes"] == 0
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    cache = TTLCache(ttl=10, max_entries=10)
+    cache.set("kratky", 1, ttl=1)
+    cache.set("dlouhy", 2)
+
+    clock[0] += 5
+
+    assert cache.get("kratky") is None
+    assert cache.get("dlouhy") == 2
+
+
+def test_evicts_least_recently_used_entry():
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" je teď nejdéle nepoužitý
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_evicts_by_size_limit():
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=20)
+    cache.set("a", "x" * 8)  # 10 B v JSON
+    cache.set("b", "y" * 8)
+    cache.set("c", "z" * 8)
+
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 20
+
+
+def test_value_over_size_limit_is_not_stored():
+    cache = TTLCache(ttl=60, max_entries=10, max_bytes=10)
+    cache.set("velky", "x" * 100)
+
+    assert cache.get("velky") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_overwrite_keeps_byte_count():
+    cache = TTLCache(ttl=60, max_entries=10)
+    cache.set("klic", "aaaa")
+    cache.set("klic", "bb")
+
+    assert cache.get("klic") == "bb"
+    assert cache.stats()["bytes"] == len('"bb"')
+
+
+def test_stats_hit_rate():
+    cache = TTLCache(ttl=60, max_entries=10)
+    cache.set("klic", 1)
+    cache.get("klic")
+    cache.get("chybi")
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+@pytest.mark.anyio
+async def test_tiered_cache_without_model_uses_memory_only():
+    cache = TieredCache("test", ttl=60, max_entries=2)
+    await cache.set("a", {"hodnota": 1})
+    await cache.set("b", 2)
+    await cache.set("c", 3)
+
+    assert await cache.get("a") is None
+    assert await cache.get("c") == 3
+    await cache.delete("c")
+    assert await cache.get("c") is None
+    assert cache.stats()["persistent"] is False
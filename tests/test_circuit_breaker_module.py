@@ -0,0 +1,100 @@
+"""
+Testy pro circuit_breaker_module
+"""
+import pytest
+
+from source.modules import circuit_breaker_module
+from source.modules.circuit_breaker_module import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Ručně posouvaný čas pro testy reset_timeout"""
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+
+
+def test_opens_after_consecutive_failures(breaker, clock):
+    for _ in range(2):
+        breaker.record_failure("example.cz")
+    assert breaker.state("example.cz") == CLOSED
+    assert breaker.allow("example.cz")
+
+    breaker.record_failure("example.cz")
+
+    assert breaker.state("example.cz") == OPEN
+    assert not breaker.allow("example.cz")
+    assert breaker.stats() == {"open": ["example.cz"], "half_open": [], "rejected": 1}
+
+
+def test_success_resets_failure_count(breaker, clock):
+    breaker.record_failure("example.cz")
+    breaker.record_failure("example.cz")
+    breaker.record_success("example.cz")
+    breaker.record_failure("example.cz")
+
+    assert breaker.state("example.cz") == CLOSED
+
+
+def test_keys_are_independent(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure("example.cz")
+
+    assert not breaker.allow("example.cz")
+    assert breaker.allow("jiny.cz")
+
+
+def test_half_open_allows_single_probe(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure("example.cz")
+    clock[0] += 30
+
+    assert breaker.state("example.cz") == HALF_OPEN
+    assert breaker.allow("example.cz")
+    assert not breaker.allow("example.cz")
+
+
+def test_successful_probe_closes_breaker(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure("example.cz")
+    clock[0] += 30
+    assert breaker.allow("example.cz")
+
+    breaker.record_success("example.cz")
+
+    assert breaker.state("example.cz") == CLOSED
+    assert breaker.allow("example.cz")
+    assert breaker.stats()["open"] == []
+
+
+def test_failed_probe_reopens_breaker(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure("example.cz")
+    clock[0] += 30
+    assert breaker.allow("example.cz")
+
+    breaker.record_failure("example.cz")
+
+    assert breaker.state("example.cz") == OPEN
+    clock[0] += 29
+    assert not breaker.allow("example.cz")
+    clock[0] += 1
+    assert breaker.allow("example.cz")
+
+
+def test_unfinished_probe_is_retried_after_timeout(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure("example.cz")
+    clock[0] += 30
+    assert breaker.allow("example.cz")
+
+    # Zkušební volání nezaznamenalo výsledek (např. bylo zrušeno)
+    clock[0] += 30
+
+    assert breaker.allow("example.cz")
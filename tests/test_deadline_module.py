@@ -0,0 +1,88 @@
+"""
+Testy pro deadline_module
+"""
+import asyncio
+
+import pytest
+
+from source.modules import deadline_module
+from source.modules.deadline_module import Deadline, StageTimeout
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Ručně posouvaný čas pro testy rozpočtu"""
+    now = [1000.0]
+    monkeypatch.setattr(deadline_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_remaining_never_negative(clock):
+    deadline = Deadline(5)
+    clock[0] += 3
+    assert deadline.remaining() == 2
+    assert not deadline.expired()
+
+    clock[0] += 10
+    assert deadline.remaining() == 0
+    assert deadline.expired()
+
+
+def test_stage_budget_capped_by_remaining(clock):
+    deadline = Deadline(10)
+    assert deadline.budget(4) == 4
+    assert deadline.budget() == 10
+
+    clock[0] += 8
+    assert deadline.budget(4) == 2
+
+
+@pytest.mark.anyio
+async def test_run_returns_stage_result():
+    deadline = Deadline(5)
+
+    async def stage():
+        return "vysledek"
+
+    assert await deadline.run("etapa", stage(), stage_budget=1) == "vysledek"
+
+
+@pytest.mark.anyio
+async def test_run_raises_stage_timeout():
+    deadline = Deadline(5)
+
+    with pytest.raises(StageTimeout) as info:
+        await deadline.run("google_search", asyncio.sleep(60), stage_budget=0.01)
+
+    assert info.value.stage == "google_search"
+    assert info.value.budget == 0.01
+
+
+@pytest.mark.anyio
+async def test_run_with_exhausted_budget_times_out_immediately():
+    deadline = Deadline(0)
+
+    with pytest.raises(StageTimeout) as info:
+        await deadline.run("evaluation", asyncio.sleep(60), stage_budget=10)
+
+    assert info.value.budget == 0
+
+
+@pytest.mark.anyio
+async def test_run_propagates_stage_errors():
+    deadline = Deadline(5)
+
+    async def stage():
+        raise ValueError("chyba etapy")
+
+    with pytest.raises(ValueError):
+        await deadline.run("etapa", stage())
+
+
+def test_degrade_records_each_stage_once():
+    deadline = Deadline(5)
+    deadline.degrade("google_search")
+    deadline.degrade("scraping")
+    deadline.degrade("google_search")
+
+    assert deadline.degraded_stages == ["google_search", "scraping"]
@@ -0,0 +1,123 @@
+"""
+Testy pro evidence_module
+"""
+import pytest
+
+from source.modules import evidence_module
+from source.modules.config import config
+from source.modules.evidence_module import count_tokens, pack_evidence, split_passages
+
+
+@pytest.fixture(autouse=True)
+def evidence_config(monkeypatch):
+    """Pevné limity nezávislé na proměnných prostředí"""
+    monkeypatch.setattr(config, "EVIDENCE_TOKEN_BUDGET", 3000)
+    monkeypatch.setattr(config, "EVIDENCE_PASSAGE_WORDS", 20)
+    monkeypatch.setattr(config, "EVIDENCE_MAX_PASSAGES_PER_ARTICLE", 4)
+
+
+def _article(source, link, paragraphs):
+    return {"source": source, "link": link, "full_content": "\n\n".join(paragraphs)}
+
+
+def test_split_passages_joins_short_paragraphs():
+    text = "Prvni odstavec.\n\nDruhy odstavec.\nTreti odstavec."
+
+    assert split_passages(text, max_words=10) == ["Prvni odstavec. Druhy odstavec. Treti odstavec."]
+
+
+def test_split_passages_respects_word_limit():
+    text = "jedna dva tri\n\nctyri pet sest\n\nsedm osm"
+
+    assert split_passages(text, max_words=6) == ["jedna dva tri ctyri pet sest", "sedm osm"]
+
+
+def test_split_passages_splits_long_paragraph_by_sentences():
+    text = "Prvni veta ma ctyri slova. Druha veta ma take pet. Treti veta."
+
+    passages = split_passages(text, max_words=6)
+
+    assert passages == ["Prvni veta ma ctyri slova.", "Druha veta ma take pet.", "Treti veta."]
+
+
+@pytest.mark.parametrize("text", ["", None, "\n\n  \n"])
+def test_split_passages_empty_text(text):
+    assert split_passages(text, max_words=10) == []
+
+
+def test_pack_evidence_without_articles():
+    assert pack_evidence("tvrzeni", ["klic"], []) == []
+    assert pack_evidence("tvrzeni", None, [{"link": "https://example.com"}]) == []
+
+
+def test_pack_evidence_formats_source_and_link():
+    article = _article("Novinky.cz", "https://www.novinky.cz/clanek", ["Vlada schvalila rozpocet na pristi rok."])
+
+    assert pack_evidence("vlada schvalila rozpocet", [], [article]) == [
+        "[Novinky.cz | https://www.novinky.cz/clanek] Vlada schvalila rozpocet na pristi rok."
+    ]
+
+
+def test_pack_evidence_falls_back_to_display_link():
+    article = {"display_link": "example.com", "link": "https://example.com/a", "full_content": "Text clanku."}
+
+    assert pack_evidence("text", [], [article]) == ["[example.com | https://example.com/a] Text clanku."]
+
+
+def test_pack_evidence_prefers_relevant_passages_within_budget(monkeypatch):
+    relevant = "Parlament schvalil zakon o zvyseni minimalni mzdy od ledna."
+    filler = [f"Pocasi bude v regionu {i} slunecne a teple bez srazek." for i in range(6)]
+    article = _article("Zdroj", "https://example.com/a", filler[:3] + [relevant] + filler[3:])
+    budget = count_tokens(evidence_module._format_passage(article, relevant))
+    # Každý odstavec má vlastní pasáž
+    monkeypatch.setattr(config, "EVIDENCE_PASSAGE_WORDS", 10)
+
+    passages = pack_evidence("parlament schvalil minimalni mzdu", ["zakon"], [article], token_budget=budget)
+
+    assert passages == [f"[Zdroj | https://example.com/a] {relevant}"]
+
+
+def test_pack_evidence_never_exceeds_budget(monkeypatch):
+    articles = [
+        _article(f"Zdroj {i}", f"https://example.com/{i}",
+                 [f"Vlada dnes projednala rozpocet a dane v bode {j}." for j in range(10)])
+        for i in range(3)
+    ]
+    monkeypatch.setattr(config, "EVIDENCE_PASSAGE_WORDS", 10)
+
+    passages = pack_evidence("vlada projednala rozpocet", ["dane"], articles, token_budget=100)
+
+    assert passages
+    assert sum(count_tokens(passage) for passage in passages) <= 100
+
+
+def test_pack_evidence_limits_passages_per_article_and_keeps_order(monkeypatch):
+    articles = [
+        _article("A", "https://a.cz", [f"Ministr financi predstavil rozpocet cast {j}." for j in range(6)]),
+        _article("B", "https://b.cz", [f"Ministr financi hajil rozpocet v debate {j}." for j in range(6)]),
+    ]
+    monkeypatch.setattr(config, "EVIDENCE_PASSAGE_WORDS", 6)
+    monkeypatch.setattr(config, "EVIDENCE_MAX_PASSAGES_PER_ARTICLE", 2)
+
+    passages = pack_evidence("ministr financi rozpocet", [], articles)
+
+    sources = [passage.split(" | ")[0] for passage in passages]
+    assert sources == ["[A", "[A", "[B", "[B"]
+    # Pasáže jednoho článku zůstávají v pořadí, v jakém jsou v textu
+    assert passages[0].endswith("cast 0.")
+    assert passages[1].endswith("cast 1.")
+
+
+def test_count_tokens_estimates_without_encoding(monkeypatch):
+    monkeypatch.setattr(evidence_module, "_get_encoding", lambda: None)
+
+    assert count_tokens("abcdefg") == 3
+    assert count_tokens("") == 0
+
+
+def test_encoding_is_loaded_on_first_use():
+    evidence_module._get_encoding.cache_clear()
+
+    assert evidence_module._get_encoding.cache_info().currsize == 0
+    count_tokens("text")
+    assert evidence_module._get_encoding.cache_info().currsize == 1
@@ -0,0 +1,58 @@
+"""
+Testy pro fake_news_routes (rate limiting dávkového endpointu)
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+
+from source.modules.auth import get_current_active_user
+from source.modules.config import config
+from source.routes import fake_news_routes
+from source.routes.fake_news_routes import limiter, router
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def fake_batch(claims):
+        for index in range(len(claims)):
+            yield index, {"status": "success"}
+
+    monkeypatch.setattr(fake_news_routes, "process_fake_news_batch", fake_batch)
+    app = FastAPI()
+    app.include_router(router)
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    app.dependency_overrides[get_current_active_user] = lambda: {"username": "test"}
+    limiter.reset()
+    yield TestClient(app)
+    limiter.reset()
+
+
+def _post_batch(client, count):
+    return client.post("/fake_news_check_batch", json={"claims": [f"Tvrzení {i}" for i in range(count)]})
+
+
+def test_batch_streams_one_line_per_claim(client):
+    response = _post_batch(client, 3)
+
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 3
+
+
+def test_batch_claims_count_against_global_limit(client, monkeypatch):
+    monkeypatch.setattr(config, "BATCH_MAX_CLAIMS", 20)
+
+    assert _post_batch(client, 20).status_code == 200
+
+    # Druhá dávka by prošla limitem 2 dávek za minutu, globální limit 20 tvrzení je ale vyčerpaný
+    response = _post_batch(client, 1)
+    assert response.status_code == 429
+    assert "přetížena" in response.text
+
+
+def test_batch_over_max_claims_is_rejected(client):
+    response = _post_batch(client, config.BATCH_MAX_CLAIMS + 1)
+
+    assert response.status_code == 422
@@ -0,0 +1,97 @@
+"""
+Testy pro http_client_module (plánovač odchozích požadavků)
+"""
+import asyncio
+import time
+
+import pytest
+
+from source.modules.http_client_module import HostLimiter, OutboundScheduler
+
+
+async def _hold(limiter, active, peak, duration=0.02):
+    async with limiter.slot():
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(duration)
+        active[0] -= 1
+
+
+@pytest.mark.anyio
+async def test_limits_concurrent_requests_per_host():
+    limiter = HostLimiter(max_concurrency=2, rate=0, burst=1)
+    active, peak = [0], [0]
+
+    await asyncio.gather(*(_hold(limiter, active, peak) for _ in range(6)))
+
+    assert peak[0] == 2
+    assert limiter.stats()["requests"] == 6
+    assert limiter.stats()["in_flight"] == 0
+    assert limiter.stats()["queued"] == 0
+
+
+@pytest.mark.anyio
+async def test_token_bucket_allows_burst_then_paces_requests():
+    limiter = HostLimiter(max_concurrency=10, rate=20, burst=2)
+    started = []
+
+    async def request():
+        async with limiter.slot():
+            started.append(time.monotonic())
+
+    begin = time.monotonic()
+    await asyncio.gather(*(request() for _ in range(4)))
+
+    offsets = sorted(at - begin for at in started)
+    # Dva požadavky hned (burst), další po 1/rate = 50 ms
+    assert offsets[1] < 0.04
+    assert offsets[2] >= 0.04
+    assert offsets[3] >= 0.09
+
+
+@pytest.mark.anyio
+async def test_cancelled_waiter_releases_its_place():
+    limiter = HostLimiter(max_concurrency=1, rate=0, burst=1)
+    release = asyncio.Event()
+
+    async def holder():
+        async with limiter.slot():
+            await release.wait()
+
+    first = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    waiting = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    assert limiter.stats()["queued"] == 1
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    release.set()
+    await first
+
+    assert limiter.stats()["queued"] == 0
+    # Slot se uvolnil - další požadavek nečeká
+    await asyncio.wait_for(holder(), timeout=1)
+
+
+@pytest.mark.anyio
+async def test_scheduler_keeps_separate_limits_per_host():
+    scheduler = OutboundScheduler(max_concurrency=1, rate=0, burst=1)
+    release = asyncio.Event()
+
+    async def hold(url):
+        async with scheduler.limiter(url).slot():
+            await release.wait()
+
+    blocked = asyncio.create_task(hold("https://www.novinky.cz/a"))
+    await asyncio.sleep(0)
+
+    # Obsazený slot jednoho hostitele neblokuje jiného hostitele
+    async with scheduler.limiter("https://www.idnes.cz/b").slot():
+        pass
+    assert scheduler.limiter("https://WWW.NOVINKY.CZ/c") is scheduler.limiter("https://www.novinky.cz/a")
+
+    release.set()
+    await blocked
+    assert set(scheduler.stats()) == {"www.novinky.cz", "www.idnes.cz"}
@@ -0,0 +1,104 @@
+"""
+Testy pro job_service
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from source.modules.database import AsyncSessionLocal
+from source.modules.models import VerificationJob
+from source.services import job_service
+from source.services.job_service import JOB_COMPLETED, JOB_QUEUED, JobManager, JobQueueFull
+
+
+async def _job_count(status=None):
+    async with AsyncSessionLocal() as db:
+        query = select(func.count()).select_from(VerificationJob)
+        if status is not None:
+            query = query.where(VerificationJob.status == status)
+        return (await db.execute(query)).scalar_one()
+
+
+async def _wait_for(condition, timeout=5):
+    async def poll():
+        while not await condition():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.anyio
+async def test_concurrent_submits_do_not_overfill_queue(database):
+    manager = JobManager(workers=0, max_queue_size=2)
+
+    results = await asyncio.gather(*(manager.submit(f"Tvrzení {i}") for i in range(5)), return_exceptions=True)
+
+    accepted = [result for result in results if isinstance(result, dict)]
+    rejected = [result for result in results if isinstance(result, JobQueueFull)]
+    assert len(accepted) == 2
+    assert len(rejected) == 3
+    # Odmítnutá úloha nezůstane v databázi bez místa ve frontě
+    assert await _job_count() == 2
+    assert manager.stats()["queued"] == 2
+
+
+@pytest.mark.anyio
+async def test_submit_does_not_take_slot_of_restored_job(database):
+    manager = JobManager(workers=0, max_queue_size=1)
+    manager._overflow.append("obnovena-uloha")
+
+    submit = asyncio.create_task(manager.submit("Tvrzení"))
+    await asyncio.sleep(0)
+    # Worker uvolnil místo během zápisu nové úlohy - obnovená úloha ho nesmí obsadit
+    manager._refill_queue()
+    job = await submit
+
+    assert manager._queue.get_nowait() == job["job_id"]
+    assert list(manager._overflow) == ["obnovena-uloha"]
+
+
+@pytest.mark.anyio
+async def test_failed_commit_releases_reserved_slot(database, monkeypatch):
+    manager = JobManager(workers=0, max_queue_size=1)
+
+    class FailingSession:
+        async def __aenter__(self):
+            raise RuntimeError("databáze nedostupná")
+
+        async def __aexit__(self, *args):
+            return False
+
+    monkeypatch.setattr(job_service, "AsyncSessionLocal", FailingSession)
+    with pytest.raises(RuntimeError):
+        await manager.submit("Tvrzení")
+    monkeypatch.undo()
+
+    assert (await manager.submit("Tvrzení"))["status"] == JOB_QUEUED
+
+
+@pytest.mark.anyio
+async def test_restored_jobs_overflow_into_queue_as_it_drains(database, monkeypatch):
+    async def fake_process(prompt, on_progress=None):
+        on_progress("search_query", {"search_query": prompt})
+        return {"status": "success", "prompt": prompt}
+
+    monkeypatch.setattr(job_service, "process_fake_news", fake_process)
+    async with AsyncSessionLocal() as db:
+        for i in range(5):
+            db.add(VerificationJob(id=f"uloha-{i}", prompt=f"Tvrzení {i}", status=JOB_QUEUED))
+        await db.commit()
+
+    manager = JobManager(workers=1, max_queue_size=2)
+    await manager.start()
+    try:
+        await _wait_for(lambda: _completed(5))
+    finally:
+        await manager.stop()
+
+    job = await manager.get("uloha-4")
+    assert job["result"] == {"status": "success", "prompt": "Tvrzení 4"}
+    assert job["progress"] == {"search_query": {"search_query": "Tvrzení 4"}}
+
+
+async def _completed(count):
+    return await _job_count(JOB_COMPLETED) == count
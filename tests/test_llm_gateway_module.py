@@ -0,0 +1,186 @@
+"""
+Testy pro llm_gateway_module
+"""
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from source.modules import llm_gateway_module as gateway
+from source.modules.cache_module import TieredCache
+from source.modules.config import config
+
+REQUEST = httpx.Request("POST", "https://api.example.com/v1/chat/completions")
+
+
+def _bad_request():
+    return openai.BadRequestError("chybný požadavek", response=httpx.Response(400, request=REQUEST), body=None)
+
+
+@pytest.fixture(autouse=True)
+def gateway_state(monkeypatch):
+    """Bez prodlev mezi pokusy a s vlastními semafory pro každý test"""
+    monkeypatch.setattr(config, "LLM_RETRY_BASE_DELAY", 0)
+    monkeypatch.setattr(config, "LLM_MAX_RETRIES", 2)
+    monkeypatch.setattr(gateway, "_semaphores", {})
+    monkeypatch.setattr(gateway, "get_llm_client", lambda provider: object())
+
+
+@pytest.mark.anyio
+async def test_transient_errors_are_retried():
+    errors = [openai.APIConnectionError(request=REQUEST), httpx.ReadTimeout("timeout")]
+
+    async def request(client):
+        if errors:
+            raise errors.pop(0)
+        return "odpověď"
+
+    assert await gateway.llm_call(gateway.OPENAI, request) == "odpověď"
+    assert errors == []
+
+
+@pytest.mark.anyio
+async def test_last_error_is_raised_after_retries():
+    calls = 0
+
+    async def request(client):
+        nonlocal calls
+        calls += 1
+        raise openai.APIConnectionError(request=REQUEST)
+
+    with pytest.raises(openai.APIConnectionError):
+        await gateway.llm_call(gateway.OPENAI, request)
+    assert calls == 3
+
+
+@pytest.mark.anyio
+async def test_permanent_errors_are_not_retried():
+    calls = 0
+
+    async def request(client):
+        nonlocal calls
+        calls += 1
+        raise _bad_request()
+
+    with pytest.raises(openai.BadRequestError):
+        await gateway.llm_call(gateway.OPENAI, request)
+    assert calls == 1
+
+
+@pytest.mark.anyio
+async def test_concurrency_is_limited_per_provider(monkeypatch):
+    monkeypatch.setattr(config, "LLM_OPENAI_MAX_CONCURRENCY", 2)
+    active = peak = 0
+
+    async def request(client):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    await asyncio.gather(*(gateway.llm_call(gateway.OPENAI, request) for _ in range(6)))
+
+    assert peak == 2
+
+
+def test_backoff_delay_is_capped(monkeypatch):
+    monkeypatch.setattr(config, "LLM_RETRY_BASE_DELAY", 1)
+    monkeypatch.setattr(config, "LLM_RETRY_MAX_DELAY", 4)
+
+    delays = [gateway._backoff_delay(attempt) for attempt in range(10) for _ in range(20)]
+
+    assert all(0 <= delay <= 4 for delay in delays)
+
+
+def test_retryable_errors():
+    assert gateway.is_retryable(openai.APIConnectionError(request=REQUEST))
+    assert gateway.is_retryable(asyncio.TimeoutError())
+    assert not gateway.is_retryable(_bad_request())
+    assert not gateway.is_retryable(ValueError("chyba"))
+
+
+class FakeCompletions:
+    """Náhrada chat.completions klienta OpenAI, počítá volání"""
+
+    def __init__(self, content="odpověď"):
+        self.content = content
+        self.calls = []
+
+    async def create(self, model, messages, **params):
+        self.calls.append(params)
+        message = SimpleNamespace(content=f" {self.content} ")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=SimpleNamespace(total_tokens=42))
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    completions = FakeCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr(gateway, "get_llm_client", lambda provider: client)
+    monkeypatch.setattr(gateway, "response_cache", TieredCache("llm-test", ttl=60, max_entries=100))
+    monkeypatch.setattr(gateway, "tokens_saved", 0)
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(config, "LLM_CACHE_MAX_TEMPERATURE", 0.3)
+    return completions
+
+
+MESSAGES = [{"role": "user", "content": "Ahoj"}]
+
+
+@pytest.mark.anyio
+async def test_low_temperature_response_is_cached(completions):
+    first = await gateway.chat_completion(gateway.OPENAI, "model", MESSAGES, temperature=0)
+    second = await gateway.chat_completion(gateway.OPENAI, "model", MESSAGES, temperature=0)
+
+    assert first == second == "odpověď"
+    assert len(completions.calls) == 1
+    assert gateway.response_cache_stats()["tokens_saved"] == 42
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("params", [{}, {"temperature": 0.9}])
+async def test_sampled_response_is_not_cached(completions, params):
+    await gateway.chat_completion(gateway.OPENAI, "model", MESSAGES, **params)
+    await gateway.chat_completion(gateway.OPENAI, "model", MESSAGES, **params)
+
+    assert len(completions.calls) == 2
+
+
+@pytest.mark.anyio
+async def test_explicit_cache_flag_wins(completions):
+    await gateway.chat_completion(gateway.OPENAI, "model", MESSAGES, cache=False, temperature=0)
+    await gateway.chat_completion(gateway.OPENAI, "model", MESSAGES, cache=False, temperature=0)
+    await gateway.chat_completion(gateway.OPENAI, "model", MESSAGES, cache=True)
+    await gateway.chat_completion(gateway.OPENAI, "model", MESSAGES, cache=True)
+
+    assert len(completions.calls) == 3
+
+
+@pytest.mark.anyio
+async def test_invalid_response_is_not_cached(completions):
+    await gateway.chat_completion(gateway.OPENAI, "model", MESSAGES, validate=lambda text: False, temperature=0)
+    await gateway.chat_completion(gateway.OPENAI, "model", MESSAGES, temperature=0)
+
+    assert len(completions.calls) == 2
+
+
+@pytest.mark.anyio
+async def test_cache_is_disabled_by_config(completions, monkeypatch):
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", False)
+
+    await gateway.chat_completion(gateway.OPENAI, "model", MESSAGES, temperature=0)
+    await gateway.chat_completion(gateway.OPENAI, "model", MESSAGES, temperature=0)
+
+    assert len(completions.calls) == 2
+
+
+def test_cache_key_depends_on_request():
+    key = gateway.response_cache_key(gateway.OPENAI, "model", MESSAGES, {"temperature": 0})
+
+    assert key == gateway.response_cache_key(gateway.OPENAI, "model", MESSAGES, {"temperature": 0})
+    assert key != gateway.response_cache_key(gateway.OPENAI, "model", MESSAGES, {"temperature": 0.1})
+    assert key != gateway.response_cache_key(gateway.OPENAI, "jiny-model", MESSAGES, {"temperature": 0})
+    assert key != gateway.response_cache_key(gateway.MISTRAL, "model", MESSAGES, {"temperature": 0})
@@ -0,0 +1,104 @@
+"""
+Testy pro local_index_module
+"""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from source.modules.config import config
+from source.modules.database import AsyncSessionLocal
+from source.modules.local_index_module import LocalArticleIndex, build_entry
+from source.modules.models import ScrapedArticleEntry
+
+
+def _article(title, content, url=None, summary=""):
+    return {"url": url, "title": title, "summary": summary, "content": content, "source": "Zdroj"}
+
+
+def test_build_entry_skips_article_without_content():
+    assert build_entry("https://example.com/a", _article("Titulek", "")) is None
+
+
+def test_build_entry_result_has_search_result_shape():
+    result, _, _ = build_entry("https://example.com/a", _article("Titulek", "Obsah článku", summary="Perex"))
+
+    assert result["link"] == "https://example.com/a"
+    assert result["display_link"] == "example.com"
+    assert result["snippet"] == "Perex"
+    assert result["source"] == "Zdroj"
+
+
+@pytest.mark.anyio
+async def test_search_ranks_title_matches_first():
+    index = LocalArticleIndex(max_entries=10)
+    await index.add("https://example.com/obsah", _article("Počasí o víkendu", "Vláda schválila rozpočet na příští rok."))
+    await index.add("https://example.com/titulek", _article("Vláda schválila rozpočet", "Ministři jednali celý den."))
+    await index.add("https://example.com/jine", _article("Sport", "Fotbalisté vyhráli zápas."))
+
+    results = index.search("vláda schválila rozpočet")
+
+    assert [result["link"] for result in results] == ["https://example.com/titulek", "https://example.com/obsah"]
+
+
+@pytest.mark.anyio
+async def test_search_requires_half_of_query_words():
+    index = LocalArticleIndex(max_entries=10)
+    await index.add("https://example.com/a", _article("Rozpočet", "Vláda jednala o rozpočtu."))
+
+    assert index.search("vláda rozpočet") != []
+    assert index.search("vláda prezident parlament senát") == []
+    assert index.search("a v") == []
+
+
+@pytest.mark.anyio
+async def test_readding_article_replaces_old_version():
+    index = LocalArticleIndex(max_entries=10)
+    await index.add("https://example.com/a", _article("Původní titulek", "Starý obsah o daních."))
+    await index.add("https://example.com/a", _article("Nový titulek", "Nový obsah o důchodech."))
+
+    assert len(index) == 1
+    assert index.search("starý obsah daních") == []
+    assert index.search("důchodech")[0]["title"] == "Nový titulek"
+
+
+@pytest.mark.anyio
+async def test_oldest_articles_are_evicted():
+    index = LocalArticleIndex(max_entries=2)
+    for name in ("prvni", "druhy", "treti"):
+        await index.add(f"https://example.com/{name}", _article(f"Článek {name}", f"Obsah článku {name}."))
+
+    assert len(index) == 2
+    assert index.search("prvni") == []
+    assert index.search("treti") != []
+
+
+@pytest.mark.anyio
+async def test_ensure_loaded_merges_database_articles(database, monkeypatch):
+    monkeypatch.setattr(config, "ARTICLE_STORE_PERSISTENT", True)
+    async with AsyncSessionLocal() as db:
+        for name, expires_in in (("ulozeny", 3600), ("expirovany", -3600)):
+            db.add(ScrapedArticleEntry(
+                cache_key=f"https://example.com/{name}",
+                value=json.dumps({"article": _article(f"Článek {name}", f"Obsah {name} o rozpočtu.")}),
+                expires_at=datetime.utcnow() + timedelta(seconds=expires_in),
+            ))
+        await db.commit()
+
+    index = LocalArticleIndex(max_entries=10)
+    await index.add("https://example.com/za-behu", _article("Článek za běhu", "Obsah o rozpočtu."))
+    await index.ensure_loaded()
+
+    links = {result["link"] for result in index.search("rozpočtu")}
+    assert links == {"https://example.com/ulozeny", "https://example.com/za-behu"}
+
+    # Načítá se jen jednou
+    async with AsyncSessionLocal() as db:
+        db.add(ScrapedArticleEntry(
+            cache_key="https://example.com/pozdejsi",
+            value=json.dumps({"article": _article("Pozdější", "Obsah o rozpočtu.")}),
+            expires_at=datetime.utcnow() + timedelta(seconds=3600),
+        ))
+        await db.commit()
+    await index.ensure_loaded()
+    assert len(index) == 2
@@ -0,0 +1,40 @@
+"""
+Testy pro portal_rules_module
+"""
+import pytest
+
+from source.modules.portal_rules_module import GENERIC_RULE, PORTAL_RULES, rule_for_url
+
+
+@pytest.mark.parametrize("url, portal", [
+    ("https://www.seznamzpravy.cz/clanek/domaci-123", "seznam"),
+    ("https://www.novinky.cz/clanek/domaci-456", "novinky"),
+    ("https://ct24.ceskatelevize.cz/clanek/domaci/789", "ct24"),
+    ("https://zpravy.idnes.cz/clanek.A250101_120000_domaci_abc", "idnes"),
+    ("https://www.idnes.cz/zpravy/domaci/clanek", "idnes"),
+    ("https://zpravy.aktualne.cz/domaci/clanek/r~123/", "aktualne"),
+    ("https://www.denik.cz/z_domova/clanek.html", "denik"),
+])
+def test_known_portals_match_by_domain_suffix(url, portal):
+    assert rule_for_url(url) is PORTAL_RULES[portal]
+
+
+def test_hostname_is_case_insensitive():
+    assert rule_for_url("https://WWW.Novinky.CZ/clanek") is PORTAL_RULES["novinky"]
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.com/clanek",
+    "https://novinky.cz.example.com/clanek",  # doména portálu jen uprostřed hostitele
+    "https://mojenovinky.cz/clanek",  # shoda jen části návěští
+    "https://cz/clanek",
+    "nejde-o-url",
+    "",
+])
+def test_unknown_hosts_fall_back_to_generic_rule(url):
+    assert rule_for_url(url) is GENERIC_RULE
+
+
+def test_every_domain_belongs_to_single_portal():
+    domains = [domain for rule in PORTAL_RULES.values() for domain in rule.domains]
+    assert len(domains) == len(set(domains))
@@ -0,0 +1,133 @@
+"""
+Testy pro scraping_module (souběžné stahování, časové limity a jistič domén)
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from source.modules import scraping_module
+from source.modules.cache_module import TTLCache
+from source.modules.circuit_breaker_module import CLOSED, OPEN, CircuitBreaker
+from source.modules.config import config
+from source.modules.http_client_module import OutboundScheduler
+
+ARTICLE_HTML = """
+<html><head><meta charset="utf-8"></head><body>
+<h1>Vláda schválila rozpočet</h1>
+<div class="article-content"><p>Vláda na dnešním jednání schválila návrh státního rozpočtu na příští rok.</p></div>
+</body></html>
+""".encode("utf-8")
+
+
+@pytest.fixture
+def portal(monkeypatch):
+    """Portál odpovídající se zadaným zpožděním, jeden souběžný požadavek na hostitele"""
+    server = {"delay": 0.2, "host_delays": {}, "requests": 0, "active": 0, "peak": 0}
+
+    async def handler(request):
+        server["requests"] += 1
+        server["active"] += 1
+        server["peak"] = max(server["peak"], server["active"])
+        await asyncio.sleep(server["host_delays"].get(request.url.host, server["delay"]))
+        server["active"] -= 1
+        return httpx.Response(200, headers={"Content-Type": "text/html; charset=utf-8"}, content=ARTICLE_HTML)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scheduler = OutboundScheduler(max_concurrency=1, rate=0, burst=1)
+    monkeypatch.setattr(scraping_module, "get_http_client", lambda: client)
+    monkeypatch.setattr(scraping_module, "host_slot", lambda url: scheduler.limiter(url).slot())
+    monkeypatch.setattr(scraping_module, "domain_breaker", CircuitBreaker("test", failure_threshold=3, reset_timeout=60))
+    monkeypatch.setattr(scraping_module, "failed_urls", TTLCache(ttl=60, max_entries=100))
+    monkeypatch.setattr(config, "ARTICLE_STORE_ENABLED", False)
+    monkeypatch.setattr(config, "PARSE_PROCESS_WORKERS", 0)
+    return server
+
+
+def _urls(count):
+    return [f"https://www.novinky.cz/clanek/domaci-{i}" for i in range(count)]
+
+
+@pytest.mark.anyio
+async def test_waiting_for_host_slot_is_not_a_domain_failure(portal):
+    # Každá odpověď stihne limit, všechny dohromady ale trvají déle než limit jednoho článku
+    scraped, errors = await scraping_module.scrape_articles(
+        _urls(8), max_concurrency=8, url_timeout=0.3, stage_deadline=10, max_articles=8
+    )
+
+    assert errors == {}
+    assert len(scraped) == 8
+    assert scraping_module.domain_breaker.state("www.novinky.cz") == CLOSED
+    assert len(scraping_module.failed_urls) == 0
+
+
+@pytest.mark.anyio
+async def test_slow_server_is_a_domain_failure(portal):
+    portal["delay"] = 0.5
+
+    scraped, errors = await scraping_module.scrape_articles(
+        _urls(3), max_concurrency=3, url_timeout=0.1, stage_deadline=10, max_articles=3
+    )
+
+    assert scraped == {}
+    assert set(errors.values()) == {"Překročen časový limit 0.1s"}
+    assert scraping_module.domain_breaker.state("www.novinky.cz") == OPEN
+    assert len(scraping_module.failed_urls) == 3
+
+
+@pytest.mark.anyio
+async def test_stage_deadline_cancellation_is_not_recorded(portal):
+    scraped, errors = await scraping_module.scrape_articles(
+        _urls(5), max_concurrency=5, url_timeout=1, stage_deadline=0.3, max_articles=5
+    )
+
+    assert 0 < len(scraped) < 5
+    assert set(errors.values()) == {"Zrušeno po vypršení limitu etapy scrapingu"}
+    assert scraping_module.domain_breaker.state("www.novinky.cz") == CLOSED
+    assert len(scraping_module.failed_urls) == 0
+
+
+def _hosts(count):
+    return [f"https://portal-{i}.cz/clanek" for i in range(count)]
+
+
+@pytest.mark.anyio
+async def test_concurrency_is_limited(portal):
+    portal["delay"] = 0.05
+
+    scraped, errors = await scraping_module.scrape_articles(
+        _hosts(6), max_concurrency=2, url_timeout=1, stage_deadline=10, max_articles=6
+    )
+
+    assert errors == {}
+    assert len(scraped) == 6
+    assert portal["peak"] == 2
+
+
+@pytest.mark.anyio
+async def test_duplicate_urls_are_fetched_once(portal):
+    portal["delay"] = 0
+
+    scraped, errors = await scraping_module.scrape_articles(
+        _hosts(2) * 3, max_concurrency=6, url_timeout=1, stage_deadline=10, max_articles=6
+    )
+
+    assert set(scraped) == set(_hosts(2))
+    assert portal["requests"] == 2
+
+
+@pytest.mark.anyio
+async def test_stops_after_max_articles_without_errors(portal):
+    # Dva portály odpoví hned, na ostatní by etapa čekala do konce svého limitu
+    portal["delay"] = 5
+    portal["host_delays"] = {"portal-0.cz": 0, "portal-1.cz": 0}
+    received = []
+
+    scraped, errors = await scraping_module.scrape_articles(
+        _hosts(6), max_concurrency=6, url_timeout=1, stage_deadline=10, max_articles=2,
+        on_article=lambda url, article: received.append(url),
+    )
+
+    assert set(scraped) == set(_hosts(2))
+    assert errors == {}
+    assert sorted(received) == sorted(scraped)
@@ -0,0 +1,118 @@
+"""
+Testy pro search_providers_module
+"""
+import pytest
+
+from source.modules import search_providers_module
+from source.modules.local_index_module import LocalArticleIndex
+from source.modules.search_providers_module import (
+    FanOutSearchProvider,
+    GoogleSearchProvider,
+    LocalIndexSearchProvider,
+    SearchProvider,
+    build_provider,
+)
+
+
+def _result(link, title="Titulek"):
+    return {"title": title, "link": link}
+
+
+class StaticProvider(SearchProvider):
+    """Poskytovatel s pevnými výsledky"""
+
+    def __init__(self, name, results):
+        self.name = name
+        self.results = results
+
+    async def search(self, query):
+        if isinstance(self.results, Exception):
+            raise self.results
+        return self.results
+
+
+@pytest.mark.anyio
+async def test_fanout_merges_results_in_provider_order_without_duplicates():
+    provider = FanOutSearchProvider([
+        StaticProvider("google", [_result("https://www.novinky.cz/a"), _result("https://idnes.cz/b")]),
+        StaticProvider("local", [_result("https://novinky.cz/a/?utm_source=x", "Duplicita"), _result("https://denik.cz/c")]),
+    ], max_results=10)
+
+    results = await provider.search("dotaz")
+
+    assert [result["link"] for result in results] == [
+        "https://www.novinky.cz/a", "https://idnes.cz/b", "https://denik.cz/c",
+    ]
+
+
+@pytest.mark.anyio
+async def test_fanout_tolerates_failed_and_empty_providers():
+    provider = FanOutSearchProvider([
+        StaticProvider("google", RuntimeError("kvóta vyčerpána")),
+        StaticProvider("prazdny", None),
+        StaticProvider("local", [_result("https://denik.cz/c")]),
+    ], max_results=10)
+
+    assert await provider.search("dotaz") == [_result("https://denik.cz/c")]
+
+
+@pytest.mark.anyio
+async def test_fanout_limits_results_and_returns_none_when_empty():
+    many = FanOutSearchProvider([StaticProvider("a", [_result(f"https://example.com/{i}") for i in range(5)])], max_results=3)
+    empty = FanOutSearchProvider([StaticProvider("a", None), StaticProvider("b", [])], max_results=3)
+
+    assert len(await many.search("dotaz")) == 3
+    assert await empty.search("dotaz") is None
+
+
+def test_build_provider_from_configuration(monkeypatch):
+    monkeypatch.setattr(search_providers_module.config, "SEARCH_FANOUT_PROVIDERS", "google, local")
+
+    provider = build_provider(" FanOut ")
+
+    assert isinstance(provider, FanOutSearchProvider)
+    assert [type(p) for p in provider.providers] == [GoogleSearchProvider, LocalIndexSearchProvider]
+    with pytest.raises(ValueError):
+        build_provider("bing")
+
+
+@pytest.fixture
+def local_index(monkeypatch):
+    index = LocalArticleIndex(max_entries=10)
+    monkeypatch.setattr(search_providers_module, "local_index", index)
+    return index
+
+
+@pytest.fixture
+def search_cache(monkeypatch):
+    cached = {}
+
+    async def cached_search_results(query):
+        return cached.get(query)
+
+    monkeypatch.setattr(search_providers_module, "cached_search_results", cached_search_results)
+    return cached
+
+
+@pytest.mark.anyio
+async def test_fallback_prefers_cached_search_results(local_index, search_cache):
+    await local_index.add("https://example.com/a", {"title": "Vláda schválila rozpočet", "content": "Obsah."})
+    search_cache["prompt"] = [_result("https://novinky.cz/z-cache")]
+
+    results = await search_providers_module.fallback_search(["vygenerovany dotaz", "prompt"])
+
+    assert results == [_result("https://novinky.cz/z-cache")]
+
+
+@pytest.mark.anyio
+async def test_fallback_uses_local_index_without_cached_results(local_index, search_cache):
+    await local_index.add("https://example.com/a", {"title": "Vláda schválila rozpočet", "content": "Obsah."})
+
+    results = await search_providers_module.fallback_search(["", "vláda rozpočet"])
+
+    assert [result["link"] for result in results] == ["https://example.com/a"]
+
+
+@pytest.mark.anyio
+async def test_fallback_without_any_results(local_index, search_cache):
+    assert await search_providers_module.fallback_search(["dotaz", "dotaz"]) is None
@@ -0,0 +1,194 @@
+"""
+Testy pro single_flight_module
+"""
+import asyncio
+
+import pytest
+
+from source.modules.single_flight_module import ProgressChannel, SingleFlight, StageMemo
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_share_one_run():
+    flight = SingleFlight()
+    runs = 0
+    release = asyncio.Event()
+
+    async def operation():
+        nonlocal runs
+        runs += 1
+        await release.wait()
+        return "vysledek"
+
+    first = asyncio.create_task(flight.do("klic", operation))
+    second = asyncio.create_task(flight.do("klic", operation))
+    await asyncio.sleep(0)
+    assert flight.in_flight("klic")
+    release.set()
+
+    assert await first == ("vysledek", False)
+    assert await second == ("vysledek", True)
+    assert runs == 1
+    assert flight.coalesced == 1
+    assert not flight.in_flight("klic")
+
+
+@pytest.mark.anyio
+async def test_cancelled_waiter_does_not_cancel_shared_run():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def operation():
+        await release.wait()
+        return 42
+
+    first = asyncio.create_task(flight.do("klic", operation))
+    second = asyncio.create_task(flight.do("klic", operation))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    release.set()
+
+    assert await second == (42, True)
+
+
+@pytest.mark.anyio
+async def test_last_cancelled_waiter_cancels_run():
+    flight = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def operation():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiter = asyncio.create_task(flight.do("klic", operation))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    assert not flight.in_flight("klic")
+
+
+@pytest.mark.anyio
+async def test_waiter_of_forgotten_run_does_not_cancel_new_run():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    started = []
+
+    async def operation(name):
+        started.append(name)
+        if name == "stary":
+            await asyncio.sleep(60)
+        await release.wait()
+        return name
+
+    # Dva čekající na starý běh, první se zruší (běh pokračuje pro druhého)
+    old_first = asyncio.create_task(flight.do("klic", lambda: operation("stary")))
+    old_second = asyncio.create_task(flight.do("klic", lambda: operation("stary")))
+    await asyncio.sleep(0)
+    old_first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await old_first
+
+    # Poslední čekající starého běhu ho zruší a klíč se uvolní
+    old_second.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await old_second
+    assert not flight.in_flight("klic")
+
+    # Nový běh se stejným klíčem nesmí ovlivnit stav starého běhu
+    new = asyncio.create_task(flight.do("klic", lambda: operation("novy")))
+    await asyncio.sleep(0)
+    assert flight.in_flight("klic")
+    release.set()
+
+    assert await new == ("novy", False)
+    assert started == ["stary", "novy"]
+
+
+@pytest.mark.anyio
+async def test_stage_memo_runs_once_and_returns_copies():
+    memo = StageMemo()
+    runs = 0
+
+    async def operation():
+        nonlocal runs
+        runs += 1
+        return {"clanky": []}
+
+    first = await memo.run("klic", operation)
+    first["clanky"].append("upraveno")
+    second = await memo.run("klic", operation)
+
+    assert second == {"clanky": []}
+    assert runs == 1
+    assert memo.stats() == {"hits": 1, "misses": 1}
+    await memo.close()
+
+
+@pytest.mark.anyio
+async def test_stage_memo_close_cancels_runs_without_waiters():
+    memo = StageMemo()
+    started = asyncio.Event()
+
+    async def operation():
+        started.set()
+        await asyncio.sleep(60)
+
+    waiter = asyncio.create_task(memo.run("klic", operation))
+    await started.wait()
+    operation_task = memo._tasks["klic"]
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    await memo.close()
+
+    assert operation_task.cancelled()
+
+
+@pytest.mark.anyio
+async def test_stage_memo_close_keeps_runs_with_external_waiters():
+    # Ověření mimo dávku se sloučilo s ověřením z dávky, které čeká na sdílenou etapu
+    memo = StageMemo()
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def search():
+        await release.wait()
+        return ["vysledek"]
+
+    async def verify():
+        return await memo.run("search:dotaz", search)
+
+    batch_claim = asyncio.create_task(flight.do("tvrzeni", verify))
+    await asyncio.sleep(0)
+    external = asyncio.create_task(flight.do("tvrzeni", verify))
+    await asyncio.sleep(0)
+
+    # Přerušení dávky: zrušení tvrzení z dávky a uzavření sdílených etap
+    batch_claim.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await batch_claim
+    await memo.close()
+    release.set()
+
+    assert await external == (["vysledek"], True)
+
+
+def test_progress_channel_replays_history_to_late_listener():
+    channel = ProgressChannel()
+    channel.emit("start", 1)
+    received = []
+
+    channel.subscribe(lambda event, data: received.append((event, data)))
+    channel.emit("hotovo", 2)
+
+    assert received == [("start", 1), ("hotovo", 2)]
@@ -0,0 +1,55 @@
+"""
+Testy pro summarizer_module (TextRank sumarizátor)
+"""
+import numpy as np
+
+from source.modules.summarizer_module import get_summary, rank_sentences, split_sentences
+
+ARTICLE = (
+    "Vláda dnes schválila návrh státního rozpočtu na příští rok. "
+    "Fotbalisté Sparty v neděli porazili Slavii dvěma góly. "
+    "Návrh rozpočtu počítá se schodkem dvě stě miliard korun. "
+    "V Praze bude o víkendu slunečno a teplo. "
+    "Schodek rozpočtu kritizuje opozice i Národní rozpočtová rada. "
+    "Zoologická zahrada pokřtila mládě žirafy."
+)
+
+
+def test_split_sentences():
+    assert split_sentences("První věta. Druhá věta! Třetí?  Čtvrtá") == ["První věta.", "Druhá věta!", "Třetí?", "Čtvrtá"]
+    assert split_sentences("") == []
+    assert split_sentences(None) == []
+
+
+def test_short_text_is_returned_whole():
+    text = "První věta. Druhá věta."
+
+    assert get_summary(text, sentence_count=3) == text
+
+
+def test_summary_prefers_central_sentences_in_original_order():
+    summary = get_summary(ARTICLE, sentence_count=3)
+
+    assert summary == (
+        "Vláda dnes schválila návrh státního rozpočtu na příští rok. "
+        "Návrh rozpočtu počítá se schodkem dvě stě miliard korun. "
+        "Schodek rozpočtu kritizuje opozice i Národní rozpočtová rada."
+    )
+
+
+def test_claim_steers_sentence_selection():
+    summary = get_summary(ARTICLE, sentence_count=1, claim="Sparta porazila Slavii")
+
+    assert summary == "Fotbalisté Sparty v neděli porazili Slavii dvěma góly."
+
+
+def test_ranking_is_deterministic():
+    sentences = split_sentences(ARTICLE)
+
+    assert np.array_equal(rank_sentences(sentences, "rozpočet"), rank_sentences(sentences, "rozpočet"))
+
+
+def test_sentences_without_content_words_score_zero():
+    scores = rank_sentences(["A je to.", "Ale pak ne."])
+
+    assert list(scores) == [0.0, 0.0]
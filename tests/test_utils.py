@@ -0,0 +1,45 @@
+"""
+Testy pro utils
+"""
+import pytest
+
+from source.modules.utils import canonicalize_url
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.novinky.cz/clanek/domaci-123",
+    "https://novinky.cz/clanek/domaci-123/",
+    "HTTPS://WWW.Novinky.CZ/clanek/domaci-123",
+    "https://www.novinky.cz:443/clanek/domaci-123",
+    "https://www.novinky.cz/clanek/domaci-123#diskuze",
+    "https://www.novinky.cz/clanek/domaci-123?utm_source=facebook&utm_medium=social",
+    "https://www.novinky.cz/clanek/domaci-123?fbclid=abc123",
+    "  https://www.novinky.cz/clanek/domaci-123  ",
+])
+def test_url_variants_share_canonical_form(url):
+    assert canonicalize_url(url) == "https://novinky.cz/clanek/domaci-123"
+
+
+def test_content_query_parameters_are_kept_and_sorted():
+    url = "https://www.idnes.cz/zpravy?strana=2&id=5&utm_campaign=x"
+
+    assert canonicalize_url(url) == "https://idnes.cz/zpravy?id=5&strana=2"
+
+
+def test_non_default_port_is_kept():
+    assert canonicalize_url("http://example.com:8080/a/") == "http://example.com:8080/a"
+    assert canonicalize_url("http://example.com:80/a") == "http://example.com/a"
+
+
+def test_path_case_is_preserved():
+    assert canonicalize_url("https://example.com/Clanek/ABC") == "https://example.com/Clanek/ABC"
+
+
+def test_root_path():
+    assert canonicalize_url("https://www.example.com") == "https://example.com/"
+    assert canonicalize_url("https://www.example.com/") == "https://example.com/"
+
+
+def test_different_articles_stay_different():
+    assert canonicalize_url("https://novinky.cz/clanek/1") != canonicalize_url("https://novinky.cz/clanek/2")
+    assert canonicalize_url("https://novinky.cz/a?id=1") != canonicalize_url("https://novinky.cz/a?id=2")
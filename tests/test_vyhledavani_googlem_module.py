@@ -0,0 +1,95 @@
+"""
+Testy pro vyhledavani_googlem_module (cache výsledků vyhledávání)
+"""
+import httpx
+import pytest
+
+from source.modules import vyhledavani_googlem_module as search_module
+from source.modules.cache_module import TieredCache
+from source.modules.config import config
+
+API_RESPONSE = {
+    "items": [
+        {
+            "title": "Vláda schválila rozpočet",
+            "link": "https://www.novinky.cz/clanek/rozpocet-1",
+            "snippet": "Vláda dnes schválila rozpočet.",
+            "displayLink": "www.novinky.cz",
+            "pagemap": {"metatags": [{"og:site_name": "Novinky.cz"}]},
+        },
+        {"title": "Bez odkazu"},
+    ]
+}
+
+
+@pytest.fixture
+def google(monkeypatch):
+    """Google Custom Search API vracející nastavenou odpověď"""
+    api = {"status": 200, "body": API_RESPONSE, "queries": []}
+
+    def handler(request):
+        api["queries"].append(request.url.params["q"])
+        return httpx.Response(api["status"], json=api["body"])
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(search_module, "get_http_client", lambda: client)
+    monkeypatch.setattr(search_module, "search_cache", TieredCache("test", ttl=60, max_entries=100))
+    monkeypatch.setattr(config, "SEARCH_CACHE_ENABLED", True)
+    return api
+
+
+@pytest.mark.anyio
+async def test_results_are_simplified(google):
+    results = await search_module.google_search("rozpočet vláda")
+
+    assert results == [{
+        "title": "Vláda schválila rozpočet",
+        "link": "https://www.novinky.cz/clanek/rozpocet-1",
+        "snippet": "Vláda dnes schválila rozpočet.",
+        "display_link": "www.novinky.cz",
+        "source": "Novinky.cz",
+        "published_date": None,
+        "author": None,
+        "description": None,
+    }]
+
+
+@pytest.mark.anyio
+async def test_normalized_query_variants_share_cached_results(google):
+    first = await search_module.google_search("Rozpočet vlády 2025")
+    second = await search_module.google_search("  rozpocet   VLÁDY 2025 ")
+
+    assert second == first
+    assert google["queries"] == ["Rozpočet vlády 2025"]
+    assert await search_module.cached_search_results("rozpočet vlády 2025") == first
+
+
+@pytest.mark.anyio
+async def test_empty_results_are_not_cached(google):
+    google["body"] = {"items": []}
+    assert await search_module.google_search("nic") is None
+
+    google["body"] = API_RESPONSE
+    assert await search_module.google_search("nic") is not None
+    assert len(google["queries"]) == 2
+
+
+@pytest.mark.anyio
+async def test_api_errors_are_not_cached(google):
+    google["status"] = 429
+    assert await search_module.google_search("dotaz") is None
+    assert await search_module.cached_search_results("dotaz") is None
+
+    google["status"] = 200
+    assert await search_module.google_search("dotaz") is not None
+
+
+@pytest.mark.anyio
+async def test_disabled_cache_always_calls_api(google, monkeypatch):
+    monkeypatch.setattr(config, "SEARCH_CACHE_ENABLED", False)
+
+    await search_module.google_search("dotaz")
+    await search_module.google_search("dotaz")
+
+    assert len(google["queries"]) == 2
+    assert await search_module.cached_search_results("dotaz") is None